@@ -0,0 +1,522 @@
+#######################
+### Import Packages ###
+#######################
+
+import random
+import re
+import tempfile
+import time as time
+from collections import defaultdict
+from pathlib import Path
+from typing import List, Optional, Dict, Callable
+
+import networkx as nx
+import pandas as pd
+
+# Custom functions
+from resources.regex_company_patterns import company_regex_dict
+from resources.filter_functions import (
+    filter_string,
+    match_location_filter_string,
+    search_for_company,
+)
+
+# Set seed
+SEED = 1704
+
+#################################
+### Reference Implementations ###
+#################################
+
+
+def legacy_match_location_filter_string(user_location: str) -> List[str]:
+    """
+    The previous `match_location_filter_string`, recompiling the pattern per call.
+    """
+    dk_locations = [
+        i.replace("location:", "") for i in filter_string.split(" ") if "location:" in i
+    ]
+    pattern = re.compile(
+        rf"\b({'|'.join(map(re.escape, dk_locations))})\b", re.IGNORECASE
+    )
+    return pattern.findall(user_location)
+
+
+def legacy_search_for_company(
+    bio_variables: List[str],
+) -> Optional[Dict[str, List[str]]]:
+    """
+    The previous `search_for_company`, compiling and scanning once per company.
+    """
+    matches = {}
+
+    for company, pattern in company_regex_dict.items():
+        regex = re.compile(pattern, re.IGNORECASE)
+        found = [bio for bio in bio_variables if regex.search(bio)]
+        if found:
+            matches[company] = found
+
+    return matches if matches else None
+
+
+def legacy_user_to_company(graph_constructor) -> dict:
+    """
+    The previous user -> company mapping of `GraphConstructor`, rebuilt per call.
+    """
+    user_to_company = {}
+    for _, row in graph_constructor.df_subset.iterrows():
+        user_to_company[row["src"]] = row["src_company"]
+        user_to_company[row["target"]] = row["target_company"]
+    return user_to_company
+
+
+def legacy_build_user_graph(graph_constructor) -> nx.DiGraph:
+    """
+    The previous `GraphConstructor.build_user_graph`, iterating over the edge rows.
+    """
+    all_actions = graph_constructor.all_actions
+    edge_action_counts = defaultdict(lambda: {action: 0 for action in all_actions})
+
+    for _, row in graph_constructor.df_subset.iterrows():
+        action = row["action"].lower()
+        if action not in all_actions:
+            continue
+        edge_action_counts[(row["src"], row["target"])][action] += 1
+
+    G = nx.DiGraph()
+    for (src, tgt), counts in edge_action_counts.items():
+        G.add_edge(src, tgt, weight=1, **counts)
+
+    user_to_company = legacy_user_to_company(graph_constructor)
+    for u, v, d in G.edges(data=True):
+        src_c = user_to_company.get(u)
+        tgt_c = user_to_company.get(v)
+        if src_c is None or tgt_c is None:
+            d["d_intra_level"] = 0
+            d["d_inter_level"] = 0
+            continue
+        d["d_intra_level"] = 1 if src_c == tgt_c else 0
+        d["d_inter_level"] = 1 if src_c != tgt_c else 0
+    return G
+
+
+def legacy_aggregate_to_company_graph(
+    graph_constructor, user_graph: nx.DiGraph, actions_to_include: list
+) -> nx.DiGraph:
+    """
+    The previous `GraphConstructor.aggregate_to_company_graph`, edge by edge.
+    """
+    user_to_company = legacy_user_to_company(graph_constructor)
+    company_edge_action_counts = defaultdict(
+        lambda: {action: 0 for action in graph_constructor.all_actions}
+    )
+    company_edge_weights = defaultdict(int)
+
+    for src_user, tgt_user, data in user_graph.edges(data=True):
+        src_c = user_to_company.get(src_user)
+        tgt_c = user_to_company.get(tgt_user)
+        if not src_c or not tgt_c:
+            continue
+        company_edge_weights[(src_c, tgt_c)] += 1
+        for action in actions_to_include:
+            company_edge_action_counts[(src_c, tgt_c)][action] += data.get(action, 0)
+
+    G_company = nx.DiGraph()
+    G_company.add_nodes_from(set(user_to_company.values()))
+    for (src_c, tgt_c), counts in company_edge_action_counts.items():
+        G_company.add_edge(
+            src_c,
+            tgt_c,
+            weight=company_edge_weights[(src_c, tgt_c)],
+            **{a: counts[a] for a in actions_to_include},
+        )
+    for u, v, d in G_company.edges(data=True):
+        d["d_intra_level"] = 1 if u == v else 0
+        d["d_inter_level"] = 1 if u != v else 0
+    for node in G_company.nodes:
+        info = graph_constructor.company_category_map.get(
+            node, {"category": "NA", "label": "NA"}
+        )
+        G_company.nodes[node]["category"] = info.get("category", "NA")
+        G_company.nodes[node]["label"] = info.get("label", "NA")
+    return G_company
+
+
+########################
+### Synthetic Corpus ###
+########################
+
+FILLER_WORDS = [
+    "software", "engineer", "developer", "backend", "frontend", "fullstack",
+    "python", "java", "rust", "cloud", "data", "student", "university", "at",
+    "working", "with", "open", "source", "lover", "coffee", "github", "ml",
+    "copenhague", "berlin", "stockholm", "remote", "consultant", "senior",
+    "lead", "cto", "founder", "freelance", "web", "apps", "mobile", "ios",
+]
+
+# Strings close to the patterns, including the cases the boundaries and lookbehinds exclude
+TRICKY_STRINGS = [
+    "h.c. ørsted", "hc ørsted", "orsted", "mu-st", "must", "eg a/s", "eg-a-s",
+    "egdw", "shapes", "nodes.js", "know-it", "knowit", "saxo bank", "tv2 play",
+    "sas institute", "pandi web", "house-of-code", "charlie_tango", "skat",
+    "skatteinfo", "oxygenation", "oxygen", "strømlin", "kmd-dev",
+]
+
+
+def synthetic_bios(
+    n_users: int = 50000, company_rate: float = 0.05, seed: int = SEED
+) -> List[List[str]]:
+    """
+    Generate a synthetic corpus of user bio fields.
+
+    Args:
+        n_users (int): The number of users.
+        company_rate (float): The share of bio fields mentioning a company.
+        seed (int): The random seed.
+
+    Returns:
+        List[List[str]]: The lowercased bio fields of each user.
+    """
+    rng = random.Random(seed)
+    companies = list(company_regex_dict)
+    locations = [
+        i.replace("location:", "") for i in filter_string.split(" ") if "location:" in i
+    ]
+
+    def field() -> str:
+        words = rng.choices(FILLER_WORDS, k=rng.randint(2, 12))
+        if rng.random() < company_rate:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(companies))
+        if rng.random() < company_rate:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(TRICKY_STRINGS))
+        if rng.random() < company_rate:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(locations))
+        return " ".join(words).lower()
+
+    return [[field() for _ in range(rng.randint(1, 5))] for _ in range(n_users)]
+
+
+##################
+### Benchmarks ###
+##################
+
+
+def time_function(func: Callable, inputs: List, repeat: int = 3) -> tuple:
+    """
+    Time a function over a list of inputs, keeping the best of several runs.
+
+    Args:
+        func (Callable): The function, taking one input.
+        inputs (List): The inputs.
+        repeat (int): The number of runs.
+
+    Returns:
+        tuple: The best time in seconds and the results of the last run.
+    """
+    best = float("inf")
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [func(item) for item in inputs]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def benchmark_matchers(
+    n_users: int = 50000, repeat: int = 3, seed: int = SEED
+) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark the compiled company and location matchers against the previous
+    implementations, and check that they return identical results.
+
+    Args:
+        n_users (int): The number of synthetic users.
+        repeat (int): The number of runs per implementation.
+        seed (int): The random seed.
+
+    Returns:
+        Dict[str, Dict[str, float]]: The timings (seconds) and speed-up per matcher.
+    """
+    corpus = synthetic_bios(n_users, seed=seed)
+    texts = [" ".join(fields) for fields in corpus]
+
+    results = {}
+    for name, legacy, current, inputs in [
+        ("company", legacy_search_for_company, search_for_company, corpus),
+        (
+            "location",
+            legacy_match_location_filter_string,
+            match_location_filter_string,
+            texts,
+        ),
+    ]:
+        legacy_time, legacy_results = time_function(legacy, inputs, repeat)
+        current_time, current_results = time_function(current, inputs, repeat)
+        if legacy_results != current_results:
+            raise AssertionError(f"The {name} matcher results differ.")
+        results[name] = {
+            "legacy": legacy_time,
+            "compiled": current_time,
+            "speedup": legacy_time / current_time,
+        }
+        print(
+            f"[INFO] {name}: {legacy_time:.2f}s -> {current_time:.2f}s "
+            f"({legacy_time / current_time:.1f}x) on {n_users} users"
+        )
+    return results
+
+
+def synthetic_edge_list(
+    n_edges: int, n_users: int | None = None, n_companies: int = 60, seed: int = SEED
+) -> pd.DataFrame:
+    """
+    Generate a synthetic user-level edge list, shaped like `get_edge_lists()`.
+
+    Args:
+        n_edges (int): The number of edges.
+        n_users (int | None): The number of users. Defaults to n_edges // 5.
+        n_companies (int): The number of companies.
+        seed (int): The random seed.
+
+    Returns:
+        pd.DataFrame: The edge list.
+    """
+    rng = random.Random(seed)
+    n_users = n_users or max(2, n_edges // 5)
+    companies = [f"company_{i}" for i in range(n_companies)]
+    user_company = {f"user_{i}": rng.choice(companies) for i in range(n_users)}
+    users = list(user_company)
+    actions = ["follows", "stars", "watches", "forks"]
+
+    src = rng.choices(users, k=n_edges)
+    target = rng.choices(users, k=n_edges)
+    return pd.DataFrame(
+        {
+            "src": src,
+            "target": target,
+            "src_company": [user_company[user] for user in src],
+            "target_company": [user_company[user] for user in target],
+            "src_company_category": 1,
+            "src_company_label": "NA",
+            "target_company_category": 1,
+            "target_company_label": "NA",
+            "action": rng.choices(actions, weights=[4, 3, 2, 1], k=n_edges),
+        }
+    )
+
+
+def synthetic_users(
+    n_users: int, n_companies: int = 60, max_connections: int = 8, seed: int = SEED
+) -> pd.DataFrame:
+    """
+    Generate a synthetic user DataFrame, shaped like the scraped output, with
+    connections between the users and to a few unknown logins.
+
+    Args:
+        n_users (int): The number of users.
+        n_companies (int): The number of companies.
+        max_connections (int): The maximum number of connections per relation.
+        seed (int): The random seed.
+
+    Returns:
+        pd.DataFrame: The users.
+    """
+    rng = random.Random(seed)
+    companies = [f"company_{i}" for i in range(n_companies)]
+    logins = [f"user_{i}" for i in range(n_users)]
+    # Counterparts outside the scraped users are dropped by the company join
+    counterparts = logins + [f"outsider_{i}" for i in range(n_users // 10 + 1)]
+
+    def connections(with_repo: bool) -> List[dict]:
+        return [
+            {
+                "owner_login": rng.choice(counterparts),
+                "repo_name": f"repo_{rng.randrange(50)}" if with_repo else None,
+                "created_at": f"20{rng.randrange(10, 25)}-0{rng.randrange(1, 10)}-1{rng.randrange(10)}",
+            }
+            for _ in range(rng.randrange(max_connections))
+        ]
+
+    rows = []
+    for login in logins:
+        row = {
+            "user_login": login,
+            "usertype": rng.choice(["User", "User", "Organization"]),
+            "inferred_company": rng.choice(companies),
+        }
+        for field in [
+            "follows_in",
+            "follows_out",
+            "watches_in",
+            "watches_out",
+            "stars_in",
+            "stars_out",
+            "forks_in",
+            "forks_out",
+        ]:
+            row[field] = connections(with_repo=not field.startswith("follows"))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def benchmark_graph_construction(
+    edge_counts: tuple = (1_000, 10_000, 100_000), seed: int = SEED
+) -> pd.DataFrame:
+    """
+    Benchmark `GraphConstructor` (user graph and company aggregation) against the
+    previous row-by-row implementation, and check that the graphs are identical.
+
+    Args:
+        edge_counts (tuple): The edge list sizes to benchmark.
+        seed (int): The random seed.
+
+    Returns:
+        pd.DataFrame: The timings (seconds) and speed-up per edge count.
+    """
+    # Imported here, as network_functions reads the company category map on import
+    from resources.network_functions import GraphConstructor
+
+    rows = []
+    for n_edges in edge_counts:
+        graph_constructor = GraphConstructor(synthetic_edge_list(n_edges, seed=seed))
+        actions = graph_constructor.attention_actions
+
+        start = time.perf_counter()
+        legacy_user_graph = legacy_build_user_graph(graph_constructor)
+        legacy_graph = legacy_aggregate_to_company_graph(
+            graph_constructor, legacy_user_graph, actions
+        )
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        graph_constructor = GraphConstructor(graph_constructor.df)
+        user_graph = graph_constructor.build_user_graph()
+        graph = graph_constructor.aggregate_to_company_graph(user_graph, actions)
+        current_time = time.perf_counter() - start
+
+        if list(user_graph.edges(data=True)) != list(
+            legacy_user_graph.edges(data=True)
+        ) or list(graph.edges(data=True)) != list(legacy_graph.edges(data=True)):
+            raise AssertionError(f"The graphs differ for {n_edges} edges.")
+
+        rows.append(
+            {
+                "edges": n_edges,
+                "legacy": legacy_time,
+                "vectorized": current_time,
+                "speedup": legacy_time / current_time,
+            }
+        )
+        print(
+            f"[INFO] {n_edges} edges: {legacy_time:.2f}s -> {current_time:.2f}s "
+            f"({legacy_time / current_time:.1f}x)"
+        )
+    return pd.DataFrame(rows)
+
+
+def benchmark_edge_table(n_users: int = 3_000, seed: int = SEED) -> Dict[str, float]:
+    """
+    Benchmark `get_edge_lists` from the flat edge table against the row-by-row
+    build from the connection columns, and check that the edge lists are identical.
+
+    Args:
+        n_users (int): The number of synthetic users.
+        seed (int): The random seed.
+
+    Returns:
+        Dict[str, float]: The timings (seconds) and speed-up.
+    """
+    # Imported here, as network_functions reads the company category map on import
+    from resources.edge_functions import build_edge_table, read_edge_table
+    from resources.network_functions import NetworkEdgeListConstructor
+
+    users = synthetic_users(n_users, seed=seed)
+    constructor = NetworkEdgeListConstructor(users, company_category_map={})
+
+    start = time.perf_counter()
+    row_edge_lists = constructor.get_edge_lists()
+    row_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_edge_table(users, Path(directory))
+        start = time.perf_counter()
+        edge_table = read_edge_table(Path(directory))
+        table_edge_lists = constructor.get_edge_lists(edge_table=edge_table)
+        table_time = time.perf_counter() - start
+
+    for row_edges, table_edges in zip(row_edge_lists, table_edge_lists):
+        if not row_edges.reset_index(drop=True).equals(
+            table_edges.reset_index(drop=True)
+        ):
+            raise AssertionError(f"The edge lists differ for {n_users} users.")
+
+    print(
+        f"[INFO] edge table: {row_time:.2f}s -> {table_time:.2f}s "
+        f"({row_time / table_time:.1f}x) on {n_users} users"
+    )
+    return {
+        "row-wise": row_time,
+        "edge table": table_time,
+        "speedup": row_time / table_time,
+    }
+
+
+def compare_graphql_with_rest(
+    scraper, user_login: str, company_label: str, company_filter: bool = True
+) -> None:
+    """
+    Fetch a user through both `get_user_info` (REST) and `get_user_info_graphql`
+    on a live GithubScraper, and check that the records are identical. The
+    relation fields are compared as multisets, as the APIs list them in different
+    orders.
+
+    Args:
+        scraper (GithubScraper): The scraper.
+        user_login (str): The login of a sample user.
+        company_label (str): The company label to use for searching.
+        company_filter (bool): Whether to filter on both DK location and company.
+
+    Returns:
+        None
+    """
+    from dataclasses import asdict
+
+    rest_user = scraper.get_user_info(
+        scraper.get_user(user_login), company_label, company_filter=company_filter
+    )
+    graphql_user = scraper.get_user_info_graphql(
+        user_login, company_label, company_filter=company_filter
+    )
+    if rest_user is None or graphql_user is None:
+        if rest_user is not graphql_user:
+            raise AssertionError(f"Only one path returned a record for {user_login}.")
+        return
+
+    def comparable(field: str, value):
+        if field.endswith(("_in", "_out")) and isinstance(value, list):
+            return sorted(
+                tuple(sorted(item.items())) if isinstance(item, dict) else (item,)
+                for item in value
+            )
+        if field == "repo_names" and isinstance(value, list):
+            return sorted(value)
+        return value
+
+    rest_record, graphql_record = asdict(rest_user), asdict(graphql_user)
+    differences = [
+        field
+        for field in rest_record
+        if comparable(field, rest_record[field])
+        != comparable(field, graphql_record[field])
+    ]
+    if differences:
+        raise AssertionError(
+            f"The records of {user_login} differ in: {', '.join(differences)}."
+        )
+    print(f"[INFO] {user_login}: the REST and GraphQL records are identical")
+
+
+if __name__ == "__main__":
+    benchmark_matchers()
+    benchmark_graph_construction()
+    benchmark_edge_table()
@@ -0,0 +1,332 @@
+#######################
+### Import Packages ###
+#######################
+
+import sqlite3
+import json
+import time as time
+import hashlib
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+from dataclasses import dataclass
+from typing import Optional, Dict, Iterable
+
+###########################
+### HTTP Response Cache ###
+###########################
+
+
+@dataclass
+class CachedResponse:
+    """
+    A cached GitHub API response with its validators.
+    """
+
+    etag: str | None
+    last_modified: str | None
+    headers: Dict[str, str]
+    body: bytes
+    fetched_at: float
+
+
+def endpoint_of(url: str) -> str:
+    """
+    Reduce a GitHub API URL to its endpoint, e.g. "/repos/*/*/stargazers".
+
+    Args:
+        url (str): The request URL.
+
+    Returns:
+        str: The endpoint, with user, organisation and repository names replaced by "*".
+    """
+    parts = urlparse(url).path.strip("/").split("/")
+    endpoint = []
+    identifiers = 0
+    for part in parts:
+        if identifiers:
+            endpoint.append("*")
+            identifiers -= 1
+            continue
+        endpoint.append(part)
+        if part in ("users", "orgs"):
+            identifiers = 1
+        elif part == "repos":
+            identifiers = 2
+    return "/" + "/".join(endpoint)
+
+
+class ResponseCache:
+    """
+    On-disk (SQLite) cache of GitHub API responses, used for conditional requests.
+
+    Responses are keyed by URL, token and Accept header (the same URL serves other
+    representations, e.g. stargazers with `application/vnd.github.star+json`),
+    stored with their ETag/Last-Modified validators, and served again when GitHub answers a conditional request with
+    304 Not Modified (which does not count against the primary rate limit).
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize the ResponseCache.
+
+        Args:
+            path (Path): The SQLite database file. Created if missing.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        columns = [
+            row[1]
+            for row in self._connection.execute("PRAGMA table_info(responses)")
+        ]
+        if columns and "accept_hash" not in columns:
+            # A cache from before responses were keyed by Accept header: start afresh
+            self._connection.execute("DROP TABLE responses")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT NOT NULL,
+                token_hash TEXT NOT NULL,
+                accept_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (url, token_hash, accept_hash)
+            )
+            """
+        )
+        self._connection.commit()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    @staticmethod
+    def _hash(header: Optional[str]) -> str:
+        # Never store the token itself
+        return hashlib.sha256((header or "").encode()).hexdigest()
+
+    def get(
+        self, url: str, authorization: Optional[str], accept: Optional[str] = None
+    ) -> Optional[CachedResponse]:
+        """
+        Get the cached response for a URL, token and Accept header.
+
+        Args:
+            url (str): The request URL.
+            authorization (Optional[str]): The Authorization header of the request.
+            accept (Optional[str]): The Accept header of the request.
+
+        Returns:
+            Optional[CachedResponse]: The cached response, or None.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified, headers, body, fetched_at FROM responses "
+                "WHERE url = ? AND token_hash = ? AND accept_hash = ?",
+                (url, self._hash(authorization), self._hash(accept)),
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, headers, body, fetched_at = row
+        return CachedResponse(etag, last_modified, json.loads(headers), body, fetched_at)
+
+    def put(
+        self,
+        url: str,
+        authorization: Optional[str],
+        headers: Dict[str, str],
+        body: bytes,
+        accept: Optional[str] = None,
+    ):
+        """
+        Store a response, if it carries an ETag or Last-Modified validator.
+
+        Args:
+            url (str): The request URL.
+            authorization (Optional[str]): The Authorization header of the request.
+            headers (Dict[str, str]): The response headers.
+            body (bytes): The response body.
+            accept (Optional[str]): The Accept header of the request.
+
+        Returns:
+            None
+        """
+        # The body is stored decoded, so encoding headers no longer apply
+        headers = {
+            key.lower(): value
+            for key, value in headers.items()
+            if key.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        }
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    self._hash(authorization),
+                    self._hash(accept),
+                    etag,
+                    last_modified,
+                    json.dumps(headers),
+                    body,
+                    time.time(),
+                ),
+            )
+            self._connection.commit()
+
+    def record(self, url: str, hit: bool):
+        """
+        Count a cache hit or miss for the endpoint of a URL.
+
+        Args:
+            url (str): The request URL.
+            hit (bool): Whether the response was served from the cache.
+
+        Returns:
+            None
+        """
+        endpoint = endpoint_of(url)
+        counts = self.hits if hit else self.misses
+        with self._lock:
+            counts[endpoint] = counts.get(endpoint, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the hit/miss statistics per endpoint.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Hits, misses and hit rate by endpoint.
+        """
+        endpoints = sorted(set(self.hits) | set(self.misses))
+        stats = {}
+        for endpoint in endpoints:
+            hits = self.hits.get(endpoint, 0)
+            misses = self.misses.get(endpoint, 0)
+            stats[endpoint] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses),
+            }
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+####################
+### Lookup Cache ###
+####################
+
+
+class LookupCache:
+    """
+    On-disk (SQLite) cache of boolean lookup results, e.g. GeoNames location lookups.
+
+    Results are keyed by normalized token and expire after a TTL. Negative results
+    are cached too, with their own (usually shorter) TTL.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float = 90 * 24 * 3600,
+        negative_ttl: float | None = None,
+    ):
+        """
+        Initialize the LookupCache.
+
+        Args:
+            path (Path): The SQLite database file. Created if missing.
+            ttl (float): Seconds before a positive result expires. Defaults to 90 days.
+            negative_ttl (float | None): Seconds before a negative result expires.
+                Defaults to the positive TTL.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS lookups (
+                token TEXT PRIMARY KEY,
+                result INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[bool]:
+        """
+        Get the cached result for a token, unless it has expired.
+
+        Args:
+            token (str): The normalized token.
+
+        Returns:
+            Optional[bool]: The cached result, or None if missing or expired.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT result, fetched_at FROM lookups WHERE token = ?", (token,)
+            ).fetchone()
+            if row is not None:
+                result, fetched_at = bool(row[0]), row[1]
+                ttl = self.ttl if result else self.negative_ttl
+                if time.time() - fetched_at < ttl:
+                    self.hits += 1
+                    return result
+            self.misses += 1
+        return None
+
+    def get_many(self, tokens: Iterable[str]) -> Dict[str, bool]:
+        """
+        Get the cached, unexpired results for several tokens.
+
+        Args:
+            tokens (Iterable[str]): The normalized tokens.
+
+        Returns:
+            Dict[str, bool]: The results of the tokens found in the cache.
+        """
+        results = {}
+        for token in tokens:
+            result = self.get(token)
+            if result is not None:
+                results[token] = result
+        return results
+
+    def put(self, token: str, result: bool):
+        """
+        Store the result for a token.
+
+        Args:
+            token (str): The normalized token.
+            result (bool): The lookup result.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?)",
+                (token, int(result), time.time()),
+            )
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
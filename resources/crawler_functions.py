@@ -0,0 +1,255 @@
+#######################
+### Import Packages ###
+#######################
+
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+# Custom functions
+from resources.filter_functions import filter_ties, match_location_filter_string
+from resources.github_functions import GithubScraper, GithubUser
+from resources.parquet_functions import RELATION_FIELDS
+from resources.state_functions import DEFAULT_FRONTIER_WEIGHTS
+
+#################
+### Variables ###
+#################
+
+# Output file names of the tiers, as in the notebooks
+TIER_FILE_NAMES = {1: "first_tier_userinfo", 2: "second_tier_userinfo"}
+
+###############
+### Crawler ###
+###############
+
+
+class FrontierCrawler:
+    """
+    Multi-tier crawl of GitHub users from a prioritized, disk-backed frontier.
+
+    Replaces the tier expansion of the notebooks (`filter_ties`, flattening the
+    ties per company, scraping every candidate in turn). The frontier is a table
+    of the scraper's CrawlState, so a crawl survives restarts and candidates are
+    deduplicated across companies and tiers. Every scraped user pushes its ties as
+    candidates of the next tier, up to `max_tier`. Candidates are scraped highest
+    expected yield first, scored on:
+    - ties: the number of scraped company members (users with an inferred
+      company) tied to the candidate,
+    - DK hint: whether the candidate's profile, if the scraper already fetched it
+      in a relation getter, has a Danish location (+1) or another location (-1),
+    - tier: deeper tiers score lower.
+    """
+
+    def __init__(
+        self,
+        scraper: GithubScraper,
+        max_tier: int = 2,
+        weights: Tuple[float, float, float] = DEFAULT_FRONTIER_WEIGHTS,
+        batch_size: int = 20,
+        concurrency: int = 4,
+        company_filter_tiers: Iterable[int] = (1,),
+        use_profile_hints: bool = True,
+    ):
+        """
+        Initialize the FrontierCrawler.
+
+        Args:
+            scraper (GithubScraper): The scraper, with a CrawlState.
+            max_tier (int): The deepest tier to crawl.
+            weights (Tuple[float, float, float]): The score weights per tie, DK hint
+                and tier, see `CrawlState.push_frontier`.
+            batch_size (int): The number of candidates claimed at a time. Scores are
+                updated with the ties of each batch before the next is claimed.
+            concurrency (int): The number of users scraped at the same time.
+            company_filter_tiers (Iterable[int]): The tiers whose users must match
+                both DK and a company (as the first tier); other tiers only DK.
+            use_profile_hints (bool): Whether to collect the locations of profiles
+                met in the relation getters for the DK hint. Costs no requests.
+        """
+        if scraper.state is None:
+            raise ValueError("The FrontierCrawler needs a GithubScraper with a state.")
+        self.scraper = scraper
+        self.state = scraper.state
+        self.max_tier = max_tier
+        self.weights = weights
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.company_filter_tiers = set(company_filter_tiers)
+        if use_profile_hints and scraper.profile_hints is None:
+            scraper.profile_hints = {}
+        self.stats = {"claimed": 0, "scraped": 0, "company_users": 0, "pushed": 0}
+
+    @staticmethod
+    def file_name(tier: int) -> str:
+        return TIER_FILE_NAMES.get(tier, f"tier_{tier}_userinfo")
+
+    def dk_hint(self, user_login: str) -> int:
+        """
+        Get the DK hint of a candidate from the profile hints of the scraper.
+
+        Args:
+            user_login (str): The login of the candidate.
+
+        Returns:
+            int: 1 for a Danish location, -1 for another location, 0 if unknown.
+        """
+        hints = self.scraper.profile_hints
+        if not hints or user_login not in hints:
+            return 0
+        location = hints.pop(user_login)
+        if not location:
+            return 0
+        return 1 if match_location_filter_string(location) else -1
+
+    def seed(
+        self,
+        users: Dict[str, str] | Iterable[str],
+        tier: int = 1,
+        company_label: Optional[str] = None,
+        ties: int = 1,
+    ) -> int:
+        """
+        Push seed users, e.g. the results of the company searches, to the frontier.
+
+        Args:
+            users (Dict[str, str] | Iterable[str]): Logins, or a mapping of login to
+                the company label it was found through.
+            tier (int): The tier of the seeds.
+            company_label (Optional[str]): The company label when `users` is not a
+                mapping.
+            ties (int): The ties the seeds are scored with.
+
+        Returns:
+            int: The number of pushed seeds.
+        """
+        if not isinstance(users, dict):
+            users = {user_login: company_label for user_login in users}
+        pushed = self.state.push_frontier(
+            (
+                (user_login, tier, label, ties, self.dk_hint(user_login))
+                for user_login, label in users.items()
+            ),
+            self.weights,
+        )
+        self.stats["pushed"] += pushed
+        return pushed
+
+    def push_ties(self, user: Any, tier: int) -> int:
+        """
+        Push the ties of a scraped user as candidates of the next tier.
+
+        Args:
+            user (Any): The GithubUser, or its dict.
+            tier (int): The tier of the user.
+
+        Returns:
+            int: The number of pushed candidates.
+        """
+        if tier >= self.max_tier:
+            return 0
+        row = asdict(user) if is_dataclass(user) else user
+        member = int(bool(row.get("inferred_company")))
+        company_label = row.get("search_with_company")
+        pushed = self.state.push_frontier(
+            (
+                (user_login, tier + 1, company_label, member, self.dk_hint(user_login))
+                for user_login in filter_ties(row, RELATION_FIELDS)
+            ),
+            self.weights,
+        )
+        self.stats["pushed"] += pushed
+        return pushed
+
+    def seed_from_users(
+        self, users: pd.DataFrame | Iterable[Any], tier: int = 1
+    ) -> int:
+        """
+        Push the ties of already scraped users, e.g. the first-tier dataset.
+
+        Args:
+            users (pd.DataFrame | Iterable[Any]): The users, as DataFrame or records.
+            tier (int): The tier of the users.
+
+        Returns:
+            int: The number of pushed candidates.
+        """
+        if isinstance(users, pd.DataFrame):
+            users = users.to_dict(orient="records")
+        return sum(self.push_ties(user, tier) for user in users)
+
+    def _save(self, user_row: GithubUser, tier: int, user_log_path: Optional[str]):
+        self.scraper.save_file(user_row, self.file_name(tier))
+        if user_log_path is not None:
+            self.scraper.log_user_w_match(
+                user_row.user_login,
+                user_row.inferred_company,
+                user_row.matched_company_strings,
+                user_row.matched_location,
+                user_log_path,
+            )
+        else:
+            GithubScraper.USERS_SCRAPED += 1
+            self.state.set_user_status(user_row.user_login, "scraped", tier=tier)
+        self.stats["scraped"] += 1
+        self.stats["company_users"] += int(bool(user_row.inferred_company))
+
+    def crawl(
+        self, max_users: Optional[int] = None, user_log_path: Optional[str] = None
+    ) -> Iterator[GithubUser]:
+        """
+        Scrape the frontier, highest score first, until it is empty or `max_users`
+        candidates have been claimed.
+
+        Each batch is scraped concurrently (`scrape_many`). The users found are saved
+        to the file of their tier and their ties pushed before the next batch is
+        claimed.
+
+        Args:
+            max_users (Optional[int]): The maximum number of candidates to claim.
+            user_log_path (Optional[str]): The user match log, see `log_user_w_match`.
+
+        Yields:
+            GithubUser: The scraped users.
+        """
+        claimed = 0
+        while max_users is None or claimed < max_users:
+            n = self.batch_size if max_users is None else min(
+                self.batch_size, max_users - claimed
+            )
+            batch = self.state.claim_frontier(n)
+            if not batch:
+                break
+            claimed += len(batch)
+            self.stats["claimed"] += len(batch)
+            for tier in sorted({candidate["tier"] for candidate in batch}):
+                user_rows = self.scraper.scrape_many(
+                    {
+                        candidate["login"]: candidate["company"]
+                        for candidate in batch
+                        if candidate["tier"] == tier
+                    },
+                    concurrency=self.concurrency,
+                    company_filter=tier in self.company_filter_tiers,
+                    skip_attempted=False,
+                )
+                for user_row in user_rows:
+                    self._save(user_row, tier, user_log_path)
+                    self.push_ties(user_row, tier)
+                    yield user_row
+
+    def summary(self) -> str:
+        """
+        Get the crawl progress and yield.
+
+        Returns:
+            str: The summary.
+        """
+        claimed = self.stats["claimed"]
+        yield_rate = self.stats["company_users"] / claimed if claimed else 0.0
+        return (
+            f"[INFO] Claimed {claimed}, scraped {self.stats['scraped']}, "
+            f"{self.stats['company_users']} with a company ({yield_rate:.1%} yield); "
+            f"{self.state.frontier_size()} candidates left on the frontier."
+        )
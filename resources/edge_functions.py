@@ -0,0 +1,286 @@
+#######################
+### Import Packages ###
+#######################
+
+import atexit
+import os
+import threading
+import time as time
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Optional, Dict, List, Iterable, Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Custom functions
+from resources.parquet_functions import RELATION_FIELDS, _to_date
+
+#################
+### Variables ###
+#################
+
+ACTIONS = ["follows", "watches", "stars", "forks"]
+
+# The columns of the edge table; "action" is the partition column (action=<action>/)
+EDGE_COLUMNS = [
+    "ego_login",
+    "direction",
+    "action",
+    "counterpart_login",
+    "repo_name",
+    "created_at",
+    "tier",
+]
+
+EDGE_FILE_SCHEMA = pa.schema(
+    [
+        ("ego_login", pa.string()),
+        ("direction", pa.string()),
+        ("counterpart_login", pa.string()),
+        ("repo_name", pa.string()),
+        ("created_at", pa.date32()),
+        ("tier", pa.int8()),
+    ]
+)
+
+#################
+### Functions ###
+#################
+
+
+def user_to_edges(user: Any, tier: Optional[int] = None) -> Dict[str, List[dict]]:
+    """
+    Flatten the relation fields of a GithubUser into edge rows, one per connection.
+
+    Connections without a counterpart login are dropped. The ego is the scraped
+    user; "in" edges point from the counterpart to the ego, "out" edges from the
+    ego to the counterpart.
+
+    Args:
+        user (Any): The GithubUser, or its dict.
+        tier (Optional[int]): The tier of the scraped user.
+
+    Returns:
+        Dict[str, List[dict]]: The edge rows (without the action column) by action.
+    """
+    user = asdict(user) if is_dataclass(user) else user
+    ego_login = user.get("user_login")
+    edges = {action: [] for action in ACTIONS}
+    for field in RELATION_FIELDS:
+        action, direction = field.split("_")
+        connections = user.get(field)
+        if connections is None:
+            continue
+        for connection in connections:
+            if not isinstance(connection, dict) or not connection.get("owner_login"):
+                continue
+            edges[action].append(
+                {
+                    "ego_login": ego_login,
+                    "direction": direction,
+                    "counterpart_login": connection["owner_login"],
+                    "repo_name": connection.get("repo_name"),
+                    "created_at": _to_date(connection.get("created_at")),
+                    "tier": tier,
+                }
+            )
+    return edges
+
+
+def read_edge_table(
+    directory: Path,
+    actions: Optional[List[str]] = None,
+    tiers: Optional[List[int]] = None,
+) -> pd.DataFrame:
+    """
+    Read the edge table, memory-mapped, with only the requested partitions.
+
+    Args:
+        directory (Path): The edge table directory.
+        actions (Optional[List[str]]): The actions to read. Defaults to all.
+        tiers (Optional[List[int]]): The tiers to read. Defaults to all.
+
+    Returns:
+        pd.DataFrame: The edges, with the columns of `EDGE_COLUMNS`.
+    """
+    directory = Path(directory)
+    if not any(directory.glob("action=*/*.parquet")):
+        return pd.DataFrame(columns=EDGE_COLUMNS)
+
+    dataset = ds.dataset(
+        directory,
+        format="parquet",
+        partitioning=ds.partitioning(
+            pa.schema([("action", pa.string())]), flavor="hive"
+        ),
+    )
+    expression = None
+    if actions is not None:
+        expression = ds.field("action").isin(actions)
+    if tiers is not None:
+        tier_expression = ds.field("tier").isin(tiers)
+        expression = (
+            tier_expression if expression is None else expression & tier_expression
+        )
+    table = dataset.to_table(columns=EDGE_COLUMNS, filter=expression)
+    return table.to_pandas()
+
+
+def ties_from_edge_table(
+    edges: pd.DataFrame, relations: Optional[List[str]] = None
+) -> pd.Series:
+    """
+    Get the unique tied users of every ego, as `filter_ties` does per user row.
+
+    Args:
+        edges (pd.DataFrame): The edge table, see `read_edge_table`.
+        relations (Optional[List[str]]): The relation fields to count as ties, e.g.
+            ["follows_in", "stars_out"]. Defaults to all eight.
+
+    Returns:
+        pd.Series: The list of tied logins, indexed by ego login.
+    """
+    relations = relations or RELATION_FIELDS
+    relation = edges["action"].astype(str) + "_" + edges["direction"].astype(str)
+    ties = edges[
+        relation.isin(relations) & (edges["counterpart_login"] != edges["ego_login"])
+    ]
+    return (
+        ties.groupby("ego_login", sort=False)["counterpart_login"]
+        .unique()
+        .map(list)
+        .rename("ties")
+    )
+
+
+#########################
+### Edge Table Writer ###
+#########################
+
+
+class EdgeTableWriter:
+    """
+    Append-only writer of the flat edge table, partitioned by action.
+
+    Edges are buffered per action and written as new Parquet files under
+    `<directory>/action=<action>/`. Existing files are never rewritten, and file
+    names carry the write time and process id, so several scraper processes can
+    append to the same table. Files are written under a hidden ".tmp" name and
+    renamed when complete, so readers skip partial files. Edges buffered since the
+    last `close()` are written out when the interpreter exits.
+    """
+
+    def __init__(
+        self, directory: Path, max_rows: int = 50_000, compression: str = "zstd"
+    ):
+        """
+        Initialize the EdgeTableWriter.
+
+        Args:
+            directory (Path): The edge table directory.
+            max_rows (int): The number of buffered edges of an action that triggers
+                a write.
+            compression (str): The Parquet compression codec.
+        """
+        self.directory = Path(directory)
+        self.max_rows = max_rows
+        self.compression = compression
+        self.edges_written = 0
+        self._buffers: Dict[str, List[dict]] = {action: [] for action in ACTIONS}
+        self._lock = threading.Lock()
+        self._closed = True
+
+    def write_user(self, user: Any, tier: Optional[int] = None):
+        """
+        Buffer the edges of a scraped user.
+
+        Args:
+            user (Any): The GithubUser, or its dict.
+            tier (Optional[int]): The tier of the user.
+
+        Returns:
+            None
+        """
+        edges = user_to_edges(user, tier)
+        with self._lock:
+            if self._closed:
+                # Registered once until closed, however many scrapers share the writer
+                atexit.register(self.close)
+                self._closed = False
+            for action, rows in edges.items():
+                self._buffers[action].extend(rows)
+                if len(self._buffers[action]) >= self.max_rows:
+                    self._write_partition(action)
+
+    def write_users(self, users: Iterable[Any], tier: Optional[int] = None):
+        for user in users:
+            self.write_user(user, tier)
+
+    def _write_partition(self, action: str):
+        rows = self._buffers[action]
+        if not rows:
+            return
+        partition = self.directory / f"action={action}"
+        partition.mkdir(parents=True, exist_ok=True)
+        file_name = f"part-{time.time_ns():020d}-{os.getpid()}.parquet"
+        tmp_path = partition / f".{file_name}.tmp"
+        pq.write_table(
+            pa.Table.from_pylist(rows, schema=EDGE_FILE_SCHEMA),
+            tmp_path,
+            compression=self.compression,
+        )
+        tmp_path.replace(partition / file_name)
+        self.edges_written += len(rows)
+        self._buffers[action] = []
+
+    def flush(self):
+        """
+        Write the buffered edges of every action.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for action in ACTIONS:
+                self._write_partition(action)
+
+    def close(self):
+        with self._lock:
+            atexit.unregister(self.close)
+            self._closed = True
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def build_edge_table(
+    users: pd.DataFrame | Iterable[Any],
+    directory: Path,
+    tier: Optional[int] = None,
+    **writer_options,
+) -> int:
+    """
+    Append the edges of already scraped users (e.g. a user DataFrame read from the
+    JSONL or Parquet output) to an edge table.
+
+    Args:
+        users (pd.DataFrame | Iterable[Any]): The users, as DataFrame or records.
+        directory (Path): The edge table directory.
+        tier (Optional[int]): The tier of the users.
+        **writer_options: Passed on to the EdgeTableWriter.
+
+    Returns:
+        int: The number of written edges.
+    """
+    if isinstance(users, pd.DataFrame):
+        users = users.to_dict(orient="records")
+    with EdgeTableWriter(directory, **writer_options) as writer:
+        writer.write_users(users, tier)
+    return writer.edges_written
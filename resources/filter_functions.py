@@ -3,17 +3,27 @@
 #######################
 
 import pandas as pd
+import numpy as np
 import re
 from pathlib import Path
 from bs4 import BeautifulSoup
 import requests
 from io import StringIO
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple, Iterable
 import json
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from IPython.display import clear_output
 
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
 # Load in regex patterns for company names
 from resources.regex_company_patterns import company_regex_dict
+from resources.cache_functions import LookupCache
+from resources.gazetteer_functions import DEFAULT_MIN_POPULATION, Gazetteer
 
 COMPANY_REGEX_DICT = company_regex_dict
 
@@ -34,6 +44,152 @@ filter_string = (
     "location:Herning"
 )
 
+# GeoNames lookups share one HTTP session, and are cached once `use_location_cache` is called
+geonames_session = requests.Session()
+location_cache: Optional[LookupCache] = None
+
+# Local gazetteer replacing the GeoNames lookups once `use_offline_gazetteer` is called
+offline_gazetteer: Optional[Gazetteer] = None
+
+#########################
+### Compiled Matchers ###
+#########################
+
+
+def literal_prefixes(parsed_pattern) -> List[str]:
+    """
+    Get literal prefixes of which every match of a parsed regex starts with one.
+
+    Zero-width assertions (word boundaries, lookbehinds) are skipped, groups are
+    followed, and alternations of literals branch out.
+
+    Args:
+        parsed_pattern: The pattern, as parsed by the `re` parser.
+
+    Returns:
+        List[str]: The literal prefixes ("" if the pattern has no literal prefix).
+    """
+
+    def is_literal(items) -> bool:
+        return all(
+            op in (sre_parse.LITERAL, sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT)
+            or (op is sre_parse.SUBPATTERN and is_literal(av[-1]))
+            or (op is sre_parse.BRANCH and all(is_literal(b) for b in av[1]))
+            for op, av in items
+        )
+
+    prefixes = [""]
+    for op, av in parsed_pattern:
+        if op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            continue
+        if op is sre_parse.LITERAL:
+            prefixes = [prefix + chr(av) for prefix in prefixes]
+            continue
+        if op is sre_parse.SUBPATTERN:
+            branches = [av[-1]]
+        elif op is sre_parse.BRANCH:
+            branches = av[1]
+        else:
+            break
+        prefixes = [
+            prefix + suffix
+            for prefix in prefixes
+            for branch in branches
+            for suffix in literal_prefixes(branch)
+        ]
+        if not all(is_literal(branch) for branch in branches):
+            break
+    return prefixes
+
+
+class CompanyMatcher:
+    """
+    Matches a set of company regex patterns, compiled once.
+
+    Each pattern gets a literal prefilter: the literal prefixes every match of it
+    starts with (e.g. "strømlin" or "stromlin"). A text is casefolded once and
+    only the patterns whose prefilter occurs in it are run, so most texts are
+    ruled out with plain substring checks. The results are the same as
+    searching every pattern separately.
+    """
+
+    def __init__(self, patterns: Dict[str, str], flags: int = re.IGNORECASE):
+        """
+        Initialize the CompanyMatcher.
+
+        Args:
+            patterns (Dict[str, str]): The regex pattern of each company.
+            flags (int): The regex flags.
+        """
+        self.companies = list(patterns)
+        self.regexes = [re.compile(pattern, flags) for pattern in patterns.values()]
+        # (prefix, company index) pairs, and the patterns without a prefilter
+        self.prefilters: List[Tuple[str, int]] = []
+        self.unfiltered: List[int] = []
+        for i, pattern in enumerate(patterns.values()):
+            prefixes = literal_prefixes(sre_parse.parse(pattern, flags))
+            if "" in prefixes or not flags & re.IGNORECASE:
+                # No literal to look for (or case-sensitive): always run the pattern
+                self.unfiltered.append(i)
+            else:
+                self.prefilters += [(p, i) for p in sorted({p.casefold() for p in prefixes})]
+
+    def company_indices(self, text: str) -> List[int]:
+        """
+        Find the companies matching a text.
+
+        Args:
+            text (str): The text to search.
+
+        Returns:
+            List[int]: The indices of the matching companies, in pattern order.
+        """
+        folded = text.casefold()
+        candidates = {i for prefix, i in self.prefilters if prefix in folded}
+        candidates.update(self.unfiltered)
+        return [i for i in sorted(candidates) if self.regexes[i].search(text)]
+
+    def search(self, texts: List[str]) -> Optional[Dict[str, List[str]]]:
+        """
+        Find the texts matching each company.
+
+        Args:
+            texts (List[str]): The texts to search (e.g. user bio fields).
+
+        Returns:
+            Optional[Dict[str, List[str]]]: Matching texts by company, in pattern
+                order, or None.
+        """
+        found: Dict[int, List[str]] = {}
+        for text in texts:
+            for i in self.company_indices(text):
+                found.setdefault(i, []).append(text)
+        if not found:
+            return None
+        return {self.companies[i]: found[i] for i in sorted(found)}
+
+
+@lru_cache(maxsize=None)
+def compile_location_pattern(filter_string: str) -> re.Pattern:
+    """
+    Compile the alternation of the DK locations in a search filter string, once.
+
+    Args:
+        filter_string (str): The GitHub search filter, with "location:" qualifiers.
+
+    Returns:
+        re.Pattern: The compiled location pattern.
+    """
+    dk_locations = [
+        i.replace("location:", "") for i in filter_string.split(" ") if "location:" in i
+    ]
+    return re.compile(
+        rf"\b({'|'.join(map(re.escape, dk_locations))})\b", re.IGNORECASE
+    )
+
+
+company_matcher = CompanyMatcher(company_regex_dict)
+
 #################
 ### FUNCTIONS ###
 #################
@@ -49,13 +205,7 @@ def match_location_filter_string(user_location: str) -> List[str]:
     Returns:
         List[str]: Matching DK location keywords.
     """
-    dk_locations = [
-        i.replace("location:", "") for i in filter_string.split(" ") if "location:" in i
-    ]
-    pattern = re.compile(
-        rf"\b({'|'.join(map(re.escape, dk_locations))})\b", re.IGNORECASE
-    )
-    return pattern.findall(user_location)
+    return compile_location_pattern(filter_string).findall(user_location)
 
 
 def check_if_unkwn_city_in_dk(geo_search: requests.Response) -> bool:
@@ -81,6 +231,152 @@ def check_if_unkwn_city_in_dk(geo_search: requests.Response) -> bool:
         return False
 
 
+def use_location_cache(
+    path: Path,
+    ttl: float = 90 * 24 * 3600,
+    negative_ttl: float | None = None,
+) -> LookupCache:
+    """
+    Cache the GeoNames location lookups on disk.
+
+    Args:
+        path (Path): The SQLite database file of the cache.
+        ttl (float): Seconds before a positive (in DK) result expires.
+        negative_ttl (float | None): Seconds before a negative result expires.
+
+    Returns:
+        LookupCache: The cache, also used by default in the lookup functions below.
+    """
+    global location_cache
+    location_cache = LookupCache(path, ttl=ttl, negative_ttl=negative_ttl)
+    return location_cache
+
+
+def use_offline_gazetteer(
+    dump_path: Optional[Path] = None,
+    alternate_names_path: Optional[Path] = None,
+    index_path: Optional[Path] = None,
+    min_population: int = DEFAULT_MIN_POPULATION,
+) -> Gazetteer:
+    """
+    Resolve location words against a local GeoNames dump instead of geonames.org.
+
+    A word then matches if it names a Danish administrative area or a Danish town
+    of some size, rather than if GeoNames' top search result for it is in Denmark
+    (see `Gazetteer`), so the two can disagree on names shared with places abroad.
+
+    The gazetteer is loaded on the first lookup, from `index_path` if it exists,
+    otherwise from the dump (and then saved to `index_path`).
+
+    Args:
+        dump_path (Optional[Path]): The GeoNames country dump, e.g. DK.txt.
+        alternate_names_path (Optional[Path]): The GeoNames alternate names dump for DK.
+        index_path (Optional[Path]): The pre-built index file.
+        min_population (int): The smallest population of an indexed town, unless
+            it is an administrative seat.
+
+    Returns:
+        Gazetteer: The gazetteer, used by the lookup functions below.
+    """
+    global offline_gazetteer
+    offline_gazetteer = Gazetteer(
+        dump_path=dump_path,
+        alternate_names_path=alternate_names_path,
+        index_path=index_path,
+        min_population=min_population,
+    )
+    return offline_gazetteer
+
+
+def split_location(location: str) -> List[str]:
+    """
+    Split a location string into the words looked up on GeoNames.
+
+    Args:
+        location (str): Free-text location string.
+
+    Returns:
+        List[str]: The words, without commas and numbers.
+    """
+    cities = [city.strip(",") for city in location.split()]
+    return [city for city in cities if city and not city.isnumeric()]
+
+
+def normalize_location_token(city: str) -> str:
+    """
+    Normalize a location word to its cache key (GeoNames search is case-insensitive).
+
+    Args:
+        city (str): The location word.
+
+    Returns:
+        str: The normalized token.
+    """
+    return city.casefold()
+
+
+def look_up_token_in_dk(token: str) -> Optional[bool]:
+    """
+    Look up a single location token on GeoNames.
+
+    Args:
+        token (str): The normalized location token.
+
+    Returns:
+        Optional[bool]: Whether the token is a place in Denmark, or None if the
+            request failed.
+    """
+    try:
+        response = geonames_session.get(
+            "https://www.geonames.org/search.html",
+            params={"q": token, "country": ""},
+            timeout=30,
+        )
+    except requests.RequestException:
+        return None
+    return check_if_unkwn_city_in_dk(response)
+
+
+def resolve_location_tokens(
+    tokens: Iterable[str],
+    cache: Optional[LookupCache] = None,
+    max_workers: int = 8,
+) -> Dict[str, bool]:
+    """
+    Resolve location tokens against the cache, and look up the rest concurrently.
+
+    Tokens are deduplicated first. With an offline gazetteer, every token is
+    resolved locally instead. Otherwise, failed requests are left out of the
+    result (and the cache), so they are retried on the next call.
+
+    Args:
+        tokens (Iterable[str]): The normalized location tokens.
+        cache (Optional[LookupCache]): The cache. Defaults to `location_cache`.
+        max_workers (int): The number of concurrent GeoNames requests.
+
+    Returns:
+        Dict[str, bool]: Whether each resolved token is a place in Denmark.
+    """
+    tokens = set(tokens)
+    if offline_gazetteer is not None:
+        return {token: token in offline_gazetteer for token in tokens}
+
+    cache = location_cache if cache is None else cache
+    results = cache.get_many(tokens) if cache is not None else {}
+
+    missing = [token for token in tokens if token not in results]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for token, in_dk in zip(missing, executor.map(look_up_token_in_dk, missing)):
+                if in_dk is None:
+                    continue
+                results[token] = in_dk
+                if cache is not None:
+                    cache.put(token, in_dk)
+
+    return results
+
+
 def look_up_if_location_in_dk(location: str) -> Optional[List[str]]:
     """
     Look up unknown location strings to check if any refer to Denmark.
@@ -91,23 +387,53 @@ def look_up_if_location_in_dk(location: str) -> Optional[List[str]]:
     Returns:
         Optional[List[str]]: List of matching DK tags, if any.
     """
-    cities = [city.strip(",") for city in location.split()]
-    geo_tags_in_dk = []
-
-    for city in cities:
-        if city and not city.isnumeric():
-            try:
-                response = requests.get(
-                    f"https://www.geonames.org/search.html?q={city}&country="
-                )
-                if check_if_unkwn_city_in_dk(response):
-                    geo_tags_in_dk.append(city)
-            except requests.RequestException:
-                continue
+    cities = split_location(location)
+    results = resolve_location_tokens(normalize_location_token(city) for city in cities)
+    geo_tags_in_dk = [
+        city for city in cities if results.get(normalize_location_token(city))
+    ]
 
     return geo_tags_in_dk if geo_tags_in_dk else None
 
 
+def look_up_locations_in_dk(
+    locations: Iterable[Optional[str]],
+    cache: Optional[LookupCache] = None,
+    max_workers: int = 8,
+) -> Dict[str, Optional[List[str]]]:
+    """
+    Look up a batch of location strings, with every distinct word requested once.
+
+    Args:
+        locations (Iterable[Optional[str]]): Free-text location strings (None is skipped).
+        cache (Optional[LookupCache]): The cache. Defaults to `location_cache`.
+        max_workers (int): The number of concurrent GeoNames requests.
+
+    Returns:
+        Dict[str, Optional[List[str]]]: The matching DK tags of each location, if any.
+    """
+    cities_by_location = {
+        location: split_location(location) for location in set(locations) if location
+    }
+    results = resolve_location_tokens(
+        (
+            normalize_location_token(city)
+            for cities in cities_by_location.values()
+            for city in cities
+        ),
+        cache=cache,
+        max_workers=max_workers,
+    )
+
+    geo_tags_by_location = {}
+    for location, cities in cities_by_location.items():
+        geo_tags_in_dk = [
+            city for city in cities if results.get(normalize_location_token(city))
+        ]
+        geo_tags_by_location[location] = geo_tags_in_dk if geo_tags_in_dk else None
+    return geo_tags_by_location
+
+
 def user_is_from_dk(
     bio_variables: List[str], user_location: Optional[str]
 ) -> Optional[List[str]]:
@@ -135,6 +461,39 @@ def user_is_from_dk(
     return None
 
 
+def users_are_from_dk(
+    users: List[Tuple[List[str], Optional[str]]],
+    max_workers: int = 8,
+) -> List[Optional[List[str]]]:
+    """
+    Batch version of `user_is_from_dk`, resolving the GeoNames lookups of all
+    users at once (deduplicated and concurrent).
+
+    Args:
+        users (List[Tuple[List[str], Optional[str]]]): The bio variables and location of each user.
+        max_workers (int): The number of concurrent GeoNames requests.
+
+    Returns:
+        List[Optional[List[str]]]: Matching DK location keywords or None, per user.
+    """
+    matches = []
+    unmatched_locations = []
+    for bio_variables, user_location in users:
+        safe_bio = [str(item) for item in bio_variables if item]
+        safe_location = str(user_location) if user_location else ""
+        match = match_location_filter_string(" ".join(safe_bio + [safe_location]))
+        matches.append((match, safe_location))
+        if not match and safe_location:
+            unmatched_locations.append(safe_location)
+
+    looked_up = look_up_locations_in_dk(unmatched_locations, max_workers=max_workers)
+
+    return [
+        match if match else (looked_up.get(location) if location else None)
+        for match, location in matches
+    ]
+
+
 def search_for_company(bio_variables: List[str]) -> Optional[Dict[str, List[str]]]:
     """
     Identify company names in a list of strings using predefined regex patterns.
@@ -145,15 +504,7 @@ def search_for_company(bio_variables: List[str]) -> Optional[Dict[str, List[str]
     Returns:
         Optional[Dict[str, List[str]]]: Matches by company, or None.
     """
-    matches = {}
-
-    for company, pattern in company_regex_dict.items():
-        regex = re.compile(pattern, re.IGNORECASE)
-        found = [bio for bio in bio_variables if regex.search(bio)]
-        if found:
-            matches[company] = found
-
-    return matches if matches else None
+    return company_matcher.search(bio_variables)
 
 
 def infer_if_dk_and_company(
@@ -196,6 +547,160 @@ def infer_if_dk_and_company(
     return location_result, matched_companies
 
 
+############################################
+### Batch inference over user DataFrames ###
+############################################
+
+# The bio columns, in the order `infer_if_dk_and_company` bundles them
+BIO_COLUMNS = ["user_login", "listed_company", "email", "bio", "blog"]
+
+
+def _clean_text(series: pd.Series, lowercase: bool = True) -> pd.Series:
+    """
+    Convert a column to strings, with missing and empty values as <NA>.
+    """
+    text = series.astype("string")
+    text = text.mask(text == "")
+    return text.str.lower() if lowercase else text
+
+
+def _match_chunk(bio_fields: pd.DataFrame, location: pd.Series) -> pd.DataFrame:
+    """
+    Find the location keyword and company matches of a chunk of users.
+
+    Args:
+        bio_fields (pd.DataFrame): The cleaned (lowercased) bio columns.
+        location (pd.Series): The cleaned location column.
+
+    Returns:
+        pd.DataFrame: The "location_keywords" and "matched_company_strings" of each
+            user, positionally aligned with the input.
+    """
+    n_rows = len(bio_fields)
+    columns = [bio_fields[column].reset_index(drop=True) for column in bio_fields]
+    location = location.reset_index(drop=True)
+
+    # Location keywords, searched in the bio fields and the location together
+    location_text = location.fillna("")
+    for column in reversed(columns):
+        location_text = column.fillna("") + " " + location_text
+    location_keywords = location_text.str.findall(compile_location_pattern(filter_string))
+
+    # Candidate companies, from the literal prefilters on all bio fields at once
+    joined = columns[0].fillna("")
+    for column in columns[1:]:
+        joined = joined + "\n" + column.fillna("")
+    joined = joined.str.casefold()
+    candidates: Dict[int, np.ndarray] = {}
+    for prefix, i in company_matcher.prefilters:
+        mask = joined.str.contains(prefix, regex=False).to_numpy(dtype=bool)
+        candidates[i] = candidates[i] | mask if i in candidates else mask
+    for i in company_matcher.unfiltered:
+        candidates[i] = np.ones(n_rows, dtype=bool)
+
+    # Company matches, checked field by field on the candidate rows only
+    matched_company_strings: List[Optional[Dict[str, List[str]]]] = [None] * n_rows
+    for i in sorted(candidates):
+        if not candidates[i].any():
+            continue
+        regex = company_matcher.regexes[i]
+        company = company_matcher.companies[i]
+        for column in columns:
+            texts = column[candidates[i]].dropna()
+            if texts.empty:
+                continue
+            hits = texts[texts.map(lambda text: regex.search(text) is not None)]
+            for row, text in hits.items():
+                if matched_company_strings[row] is None:
+                    matched_company_strings[row] = {}
+                matched_company_strings[row].setdefault(company, []).append(text)
+
+    return pd.DataFrame(
+        {
+            "location_keywords": location_keywords,
+            "matched_company_strings": matched_company_strings,
+        }
+    )
+
+
+def infer_dk_and_company_frame(
+    df: pd.DataFrame,
+    location_column: str | None = None,
+    look_up_locations: bool = True,
+    n_jobs: int = 1,
+    chunk_size: int = 250_000,
+) -> pd.DataFrame:
+    """
+    Batch version of `infer_if_dk_and_company` over a DataFrame of users.
+
+    The bio columns are lowercased and searched column-wise. Location keywords are
+    matched on the bio fields and location together; users without a keyword have
+    their location looked up (GeoNames or the offline gazetteer) in one deduplicated
+    batch. Company matches are found per bio field, as in `search_for_company`.
+
+    Args:
+        df (pd.DataFrame): The users, with the BIO_COLUMNS and a location column.
+        location_column (str | None): The location column. Defaults to "location",
+            or "github_location" if there is no "location" column.
+        look_up_locations (bool): Whether to look up locations without a keyword match.
+        n_jobs (int): The number of processes matching chunks in parallel.
+        chunk_size (int): The number of users per chunk when n_jobs > 1.
+
+    Returns:
+        pd.DataFrame: A copy of df with the columns "matched_location" (list or
+            None), "matched_company_strings" (dict or None) and "inferred_company"
+            (list of companies, empty if none).
+    """
+    if location_column is None:
+        location_column = "location" if "location" in df.columns else "github_location"
+
+    bio_fields = pd.DataFrame(
+        {
+            column: _clean_text(df[column]) if column in df.columns else pd.NA
+            for column in BIO_COLUMNS
+        },
+        index=df.index,
+    ).astype("string")
+    location = _clean_text(df[location_column], lowercase=False)
+
+    chunks = [
+        (bio_fields.iloc[start : start + chunk_size], location.iloc[start : start + chunk_size])
+        for start in range(0, len(df), chunk_size)
+    ]
+    if n_jobs > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            matched = list(executor.map(_match_chunk, *zip(*chunks)))
+    else:
+        matched = [_match_chunk(*chunk) for chunk in chunks]
+    matched = (
+        pd.concat(matched, ignore_index=True)
+        if matched
+        else pd.DataFrame(columns=["location_keywords", "matched_company_strings"])
+    )
+
+    # Locations without a keyword match, looked up once per distinct location
+    location_values = location.tolist()
+    looked_up = {}
+    if look_up_locations:
+        looked_up = look_up_locations_in_dk(
+            value
+            for value, keywords in zip(location_values, matched["location_keywords"])
+            if not keywords and value is not pd.NA
+        )
+    matched_location = [
+        keywords if keywords else looked_up.get(value) if value is not pd.NA else None
+        for value, keywords in zip(location_values, matched["location_keywords"])
+    ]
+
+    df = df.copy()
+    df["matched_location"] = matched_location
+    df["matched_company_strings"] = matched["matched_company_strings"].tolist()
+    df["inferred_company"] = [
+        list(companies) if companies else [] for companies in df["matched_company_strings"]
+    ]
+    return df
+
+
 ########################################################
 ### Function to filter unique ties for a GitHub user ###
 ########################################################
@@ -0,0 +1,318 @@
+#######################
+### Import Packages ###
+#######################
+
+import csv
+import gzip
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Optional, Set, Iterable, Iterator
+
+#################
+### Variables ###
+#################
+
+# GeoNames feature classes to index: administrative areas (A) and populated places (P)
+DEFAULT_FEATURE_CLASSES = ("A", "P")
+
+# Populated places below this population are left out (hamlets and villages whose
+# names are common words or places elsewhere, e.g. "Lund"), unless they are the
+# seat of an administrative area
+DEFAULT_MIN_POPULATION = 1000
+SEAT_FEATURE_CODES = {"PPLC", "PPLA", "PPLA2", "PPLA3"}
+
+# Bumped when the layout or the content rules of the pre-built index change
+INDEX_VERSION = 2
+
+# Danish letters, written out as in "Aarhus" / "Aeroe" / "Koege"
+DANISH_DIGRAPHS = str.maketrans({"å": "aa", "æ": "ae", "ø": "oe"})
+
+# Danish letters, reduced to a single letter as in "Arhus" / "Aero" / "Koge"
+DANISH_LETTERS = str.maketrans({"å": "a", "æ": "ae", "ø": "o"})
+
+#################
+### Functions ###
+#################
+
+
+def strip_accents(name: str) -> str:
+    """
+    Remove combining accents, e.g. "Tønder" stays, "Tórshavn" becomes "Torshavn".
+
+    Args:
+        name (str): The place name.
+
+    Returns:
+        str: The name without combining accents.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def name_variants(name: str) -> Set[str]:
+    """
+    Get the normalized spellings of a place name.
+
+    Names are casefolded, and Danish letters are also written out ("Århus" ->
+    "aarhus") and reduced ("Århus" -> "arhus"), so either spelling matches.
+
+    Args:
+        name (str): The place name.
+
+    Returns:
+        Set[str]: The normalized variants.
+    """
+    # Recompose first, so "å" written as "a" + ring is folded like "å"
+    name = unicodedata.normalize("NFC", name.strip()).casefold()
+    if not name:
+        return set()
+    variants = {name}
+    for table in (DANISH_DIGRAPHS, DANISH_LETTERS):
+        variants.add(strip_accents(name.translate(table)))
+    return variants
+
+
+def is_place_name(name: str) -> bool:
+    """
+    Check whether an alternate name is a name, rather than a link, a postal code or
+    an airport code.
+
+    Args:
+        name (str): The alternate name.
+
+    Returns:
+        bool: Whether the name is kept.
+    """
+    if not name or "://" in name or any(char.isdigit() for char in name):
+        return False
+    # IATA/ICAO codes such as "AAR" or "EKAH"
+    return not (len(name) <= 4 and name.isupper())
+
+
+def read_geonames_dump(
+    dump_path: Path,
+    feature_classes: Iterable[str] = DEFAULT_FEATURE_CLASSES,
+    min_population: int = DEFAULT_MIN_POPULATION,
+) -> Iterator[tuple]:
+    """
+    Read the places of a GeoNames country dump (e.g. DK.txt).
+
+    Args:
+        dump_path (Path): The tab-separated dump from download.geonames.org/export/dump.
+        feature_classes (Iterable[str]): The feature classes to keep.
+        min_population (int): The smallest population of a populated place (P) to
+            keep, unless it is an administrative seat.
+
+    Yields:
+        tuple: The geonameid and the names (name, ASCII name and alternate names).
+    """
+    feature_classes = set(feature_classes)
+    with open(dump_path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) < 15 or row[6] not in feature_classes:
+                continue
+            if (
+                row[6] == "P"
+                and row[7] not in SEAT_FEATURE_CODES
+                and int(row[14] or 0) < min_population
+            ):
+                continue
+            alternate_names = [name for name in row[3].split(",") if is_place_name(name)]
+            names = [row[1], row[2], *alternate_names]
+            yield row[0], [name for name in names if name]
+
+
+def read_alternate_names(alternate_names_path: Path, geonameids: Set[str]) -> Iterator[str]:
+    """
+    Read the alternate names of the given places from a GeoNames alternate names dump.
+
+    Links, postal codes, airport codes and abbreviations are skipped.
+
+    Args:
+        alternate_names_path (Path): The tab-separated dump (e.g. alternatenames/DK.txt).
+        geonameids (Set[str]): The places to read alternate names for.
+
+    Yields:
+        str: The alternate names.
+    """
+    skipped_languages = {"link", "post", "iata", "icao", "faac", "wkdt", "unlc", "abbr"}
+    with open(alternate_names_path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) < 4 or row[1] not in geonameids or row[2] in skipped_languages:
+                continue
+            if is_place_name(row[3]):
+                yield row[3]
+
+
+#################
+### Gazetteer ###
+#################
+
+
+class Gazetteer:
+    """
+    Offline index of place names, built from a GeoNames country dump.
+
+    A lookup asks whether a word is the name of an administrative area or of a
+    populated place of some size in the dump, which differs from the online lookup
+    (whether GeoNames' top search result for the word is in Denmark): a word that
+    is also a larger place abroad still matches if it names a Danish town. Small
+    places (see DEFAULT_MIN_POPULATION) and alternate names that are links, postal
+    or airport codes are left out, to keep such matches rare.
+
+    The index is a set of normalized name variants, so a lookup is a hash set
+    membership test. It is loaded lazily on the first lookup, from a pre-built
+    index file if one exists, otherwise from the dump (and then saved to the
+    index file, if given).
+    """
+
+    def __init__(
+        self,
+        dump_path: Optional[Path] = None,
+        alternate_names_path: Optional[Path] = None,
+        index_path: Optional[Path] = None,
+        feature_classes: Iterable[str] = DEFAULT_FEATURE_CLASSES,
+        min_population: int = DEFAULT_MIN_POPULATION,
+    ):
+        """
+        Initialize the Gazetteer.
+
+        Args:
+            dump_path (Optional[Path]): The GeoNames country dump, e.g. DK.txt.
+            alternate_names_path (Optional[Path]): The GeoNames alternate names dump.
+            index_path (Optional[Path]): The pre-built index file (gzipped text).
+            feature_classes (Iterable[str]): The GeoNames feature classes to index.
+            min_population (int): The smallest population of an indexed populated
+                place, unless it is an administrative seat.
+        """
+        if dump_path is None and index_path is None:
+            raise ValueError("Either a GeoNames dump or an index file is required.")
+        self.dump_path = Path(dump_path) if dump_path else None
+        self.alternate_names_path = (
+            Path(alternate_names_path) if alternate_names_path else None
+        )
+        self.index_path = Path(index_path) if index_path else None
+        self.feature_classes = tuple(feature_classes)
+        self.min_population = min_population
+        self._names: Optional[frozenset] = None
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> frozenset:
+        """
+        The normalized place names, loaded on first access.
+        """
+        if self._names is None:
+            with self._lock:
+                if self._names is None:
+                    self._names = self._load()
+        return self._names
+
+    def __contains__(self, token: str) -> bool:
+        return any(variant in self.names for variant in name_variants(token))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _load(self) -> frozenset:
+        header = self._index_header()
+        if self.index_path is not None and self.index_path.exists():
+            names = self.load_index(self.index_path, header)
+            if names is not None:
+                return names
+        if self.dump_path is None:
+            raise FileNotFoundError(f"No gazetteer index at {self.index_path}.")
+
+        names = self.build(
+            self.dump_path,
+            self.alternate_names_path,
+            self.feature_classes,
+            self.min_population,
+        )
+        if self.index_path is not None:
+            self.save_index(names, self.index_path, header)
+        return names
+
+    def _index_header(self) -> str:
+        # The index is only reused when built by this version with the same rules
+        return (
+            f"# gazetteer index v{INDEX_VERSION} "
+            f"classes={','.join(self.feature_classes)} "
+            f"min_population={self.min_population}"
+        )
+
+    @staticmethod
+    def build(
+        dump_path: Path,
+        alternate_names_path: Optional[Path] = None,
+        feature_classes: Iterable[str] = DEFAULT_FEATURE_CLASSES,
+        min_population: int = DEFAULT_MIN_POPULATION,
+    ) -> frozenset:
+        """
+        Build the index from the GeoNames dumps.
+
+        Args:
+            dump_path (Path): The GeoNames country dump.
+            alternate_names_path (Optional[Path]): The GeoNames alternate names dump.
+            feature_classes (Iterable[str]): The GeoNames feature classes to index.
+            min_population (int): The smallest population of an indexed populated
+                place, unless it is an administrative seat.
+
+        Returns:
+            frozenset: The normalized place names.
+        """
+        names = set()
+        geonameids = set()
+        for geonameid, place_names in read_geonames_dump(
+            dump_path, feature_classes, min_population
+        ):
+            geonameids.add(geonameid)
+            for name in place_names:
+                names |= name_variants(name)
+        if alternate_names_path is not None:
+            for name in read_alternate_names(alternate_names_path, geonameids):
+                names |= name_variants(name)
+        return frozenset(names)
+
+    @staticmethod
+    def save_index(names: frozenset, index_path: Path, header: str):
+        """
+        Save a built index as a gzipped text file: the header line, then one name
+        per line.
+
+        Args:
+            names (frozenset): The normalized place names.
+            index_path (Path): The index file.
+            header (str): The header line, identifying the build rules.
+
+        Returns:
+            None
+        """
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(index_path, "wt", encoding="utf-8") as f:
+            f.write(header + "\n")
+            f.writelines(name + "\n" for name in sorted(names))
+
+    @staticmethod
+    def load_index(index_path: Path, header: str) -> Optional[frozenset]:
+        """
+        Load a pre-built index file.
+
+        Args:
+            index_path (Path): The index file.
+            header (str): The expected header line.
+
+        Returns:
+            Optional[frozenset]: The normalized place names, or None if the file
+                was built by another version or with other rules.
+        """
+        try:
+            with gzip.open(index_path, "rt", encoding="utf-8") as f:
+                if f.readline().rstrip("\n") != header:
+                    raise ValueError(header)
+                names = frozenset(line.rstrip("\n") for line in f)
+        except (OSError, UnicodeDecodeError, ValueError):
+            print(f"[INFO] Rebuilding outdated gazetteer index: {index_path}")
+            return None
+        return names
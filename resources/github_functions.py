@@ -2,8 +2,9 @@
 ### Import Packages ###
 #######################
 
-from github import Github
+from github import Github, GithubException
 import json
+import requests
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, asdict
@@ -11,7 +12,12 @@ import time as time
 import configparser
 import math
 import logging
-from typing import List, Optional, Dict
+import asyncio
+import threading
+import copy
+import functools
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import List, Optional, Dict, Iterable, Iterator, Callable, Tuple
 
 # Import GitHub types
 from github.NamedUser import NamedUser
@@ -24,6 +30,36 @@ from resources.filter_functions import (
     user_is_from_dk,
     search_for_company,
 )
+from resources.ratelimit_functions import (
+    RateGovernor,
+    TokenPool,
+    rebind_github_objects,
+)
+from resources.cache_functions import ResponseCache
+from resources.http_functions import install_http_adapter
+from resources.writer_functions import OutputWriter
+from resources.state_functions import CrawlState
+from resources.parquet_functions import ParquetOutput
+from resources.edge_functions import EdgeTableWriter
+from resources.search_functions import (
+    SEARCH_RESULT_CAP,
+    SEARCH_RETRIES,
+    SEARCH_RETRY_BACKOFF,
+    SearchShard,
+)
+from resources.pipeline_functions import Pipeline
+from resources.graphql_functions import (
+    FetchCostReport,
+    PROFILE_QUERY,
+    RELATIONS_QUERY,
+    REPOSITORIES_PAGE_QUERY,
+    USER_CONNECTIONS,
+    REPOSITORY_CONNECTIONS,
+    user_connection_query,
+    repository_connection_query,
+    graphql_date,
+    estimate_rest_requests,
+)
 
 config = configparser.ConfigParser(inline_comment_prefixes=("#", ";"))
 config.read(Path(__file__).parent / "config.ini")
@@ -66,8 +102,40 @@ def collect_github_token(
     return github_token
 
 
+# Function to collect all GitHub access tokens from config
+def collect_github_tokens(
+    config: configparser.ConfigParser,
+    section="github",
+) -> List[str]:
+    """
+    Collects every GitHub access token from the config file.
+
+    Any option in the section starting with "access_token" is read as a token,
+    e.g. access_token, access_token_2, access_token_3.
+
+    Args:
+        config (configparser.ConfigParser): The config parser instance.
+        section (str): The section in the config file to read from.
+
+    Returns:
+        List[str]: The GitHub access tokens, in the order they are listed.
+    """
+    if not config.has_section(section):
+        return []
+    github_tokens = [
+        config.get(section, option)
+        for option in config.options(section)
+        if option.startswith("access_token")
+    ]
+    github_tokens = [token for token in github_tokens if token]
+    if len(github_tokens) > 1:
+        print(f"{len(github_tokens)} GitHub access tokens collected from config")
+    return github_tokens
+
+
 # Collect GitHub access tokens from the config file
 github_access_token = collect_github_token(config)
+github_access_tokens = collect_github_tokens(config)
 
 #######################################################
 ### Custom Made Functions For Scraping Github Users ###
@@ -81,18 +149,39 @@ def ratelimiter(func):
     """
     Decorator to limit the rate of GitHub API calls,
     dynamically adjusting threshold according to current max rate.
+    With several tokens, calls are dispatched on the token with the most
+    headroom, and the scraper only sleeps once every token is exhausted.
+
+    With a RateGovernor, the requests themselves are paced per rate limit bucket
+    at the transport, so the decorator only picks the token.
     """
 
     def wrapper(*args, **kwargs):
         github_scraper = args[0]  # 'self'
-
-        current_max_rate = github_scraper.github.rate_limiting[1]
+        token_pool = github_scraper.token_pool
+
+        if getattr(github_scraper, "rate_governor", None) is not None:
+            with github_scraper._rate_limit_lock:
+                current_token = token_pool.active_token
+                token_pool.record(current_token)
+                best_token = token_pool.best_token()
+                if best_token != current_token:
+                    print(
+                        f"[ROTATE] Switching to {token_pool.label(best_token)} ({token_pool.headroom(best_token)} requests left)."
+                    )
+                    token_pool.active_token = best_token
+            rebind_github_objects(
+                [*args[1:], *kwargs.values()], github_scraper.github
+            )
+            return func(*args, **kwargs)
 
         # Initialize attributes if missing
         if not hasattr(github_scraper, "github_max_rate"):
             github_scraper.github_max_rate = None
         if not hasattr(github_scraper, "rate_limit_threshold"):
             github_scraper.rate_limit_threshold = 0
+        if not hasattr(github_scraper, "_rate_limit_lock"):
+            github_scraper._rate_limit_lock = threading.Lock()
 
         # Helper to map max rate to threshold
         def get_threshold(max_rate):
@@ -103,34 +192,53 @@ def ratelimiter(func):
             else:
                 return 200  # fallback default
 
-        # Only print if threshold changes
-        new_threshold = get_threshold(current_max_rate)
-        if github_scraper.rate_limit_threshold != new_threshold:
-            github_scraper.rate_limit_threshold = new_threshold
-            print(
-                f"[NEW] GitHub ratelimit threshold set to {new_threshold} (max rate: {current_max_rate})"
-            )
-
-        github_scraper.github_max_rate = current_max_rate
-        remaining_requests = github_scraper.github.rate_limiting[0]
+        # Serialise the check so concurrent workers wait on a single sleep
+        with github_scraper._rate_limit_lock:
+            current_token = token_pool.active_token
+            _, current_max_rate, _ = token_pool.record(current_token)
 
-        if remaining_requests < github_scraper.rate_limit_threshold:
-            reset_timestamp = github_scraper.github.rate_limiting_resettime
-            time_before_reset = reset_timestamp - time.time()
-            wait_time = time_before_reset + 90  # 1.5 minutes buffer
-
-            if wait_time > 0:
-                wake_up_time = time.strftime(
-                    "%Y-%m-%d %H:%M:%S", time.localtime(time.time() + wait_time)
-                )
+            # Only print if threshold changes
+            new_threshold = get_threshold(current_max_rate)
+            if github_scraper.rate_limit_threshold != new_threshold:
+                github_scraper.rate_limit_threshold = new_threshold
                 print(
-                    f"[WAIT] Remaining requests: {remaining_requests}. Sleeping for {wait_time:.1f}s until {wake_up_time}"
+                    f"[NEW] GitHub ratelimit threshold set to {new_threshold} (max rate: {current_max_rate})"
                 )
-                time.sleep(wait_time)
-            else:
+
+            github_scraper.github_max_rate = current_max_rate
+
+            # Dispatch on the token with the most headroom
+            best_token = token_pool.best_token()
+            remaining_requests = token_pool.headroom(best_token)
+
+            # Only sleep once every token is below the threshold
+            if remaining_requests < github_scraper.rate_limit_threshold:
+                reset_timestamp = token_pool.earliest_reset()
+                time_before_reset = reset_timestamp - time.time()
+                wait_time = time_before_reset + 90  # 1.5 minutes buffer
+
+                if wait_time > 0:
+                    wake_up_time = time.strftime(
+                        "%Y-%m-%d %H:%M:%S", time.localtime(time.time() + wait_time)
+                    )
+                    print(
+                        f"[WAIT] Remaining requests: {remaining_requests} on all {len(token_pool)} token(s). Sleeping for {wait_time:.1f}s until {wake_up_time}"
+                    )
+                    time.sleep(wait_time)
+                else:
+                    print(
+                        f"[INFO] Reset time passed {abs(wait_time):.1f}s ago, skipping sleep."
+                    )
+                best_token = token_pool.best_token()
+
+            if best_token != current_token:
                 print(
-                    f"[INFO] Reset time passed {abs(wait_time):.1f}s ago, skipping sleep."
+                    f"[ROTATE] Switching to {token_pool.label(best_token)} ({token_pool.headroom(best_token)} requests left)."
                 )
+                token_pool.active_token = best_token
+
+        # Objects fetched with another token should continue on the active one
+        rebind_github_objects([*args[1:], *kwargs.values()], github_scraper.github)
 
         return func(*args, **kwargs)
 
@@ -166,14 +274,86 @@ class GithubUser:
     forks_out: list[Dict[str, str]] | list[None]
 
 
+@functools.total_ordering
+class ThreadSafeCounter:
+    """
+    Integer counter that can be incremented from several threads.
+
+    `counter += 1` increments in place under a lock, so the class-level counters of
+    GithubScraper stay exact when users or relations are scraped concurrently. The
+    counter formats, compares and adds like an int (`counter + 1` gives an int).
+    """
+
+    def __init__(self, value: int = 0):
+        self._value = value
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def set(self, value: int):
+        with self._lock:
+            self._value = value
+
+    def increment(self, n: int = 1) -> int:
+        with self._lock:
+            self._value += n
+            return self._value
+
+    def __iadd__(self, n: int) -> "ThreadSafeCounter":
+        self.increment(n)
+        return self
+
+    def __int__(self) -> int:
+        return self._value
+
+    def __index__(self) -> int:
+        return self._value
+
+    def __bool__(self) -> bool:
+        return bool(self._value)
+
+    def __add__(self, other) -> int:
+        return self._value + int(other)
+
+    def __radd__(self, other) -> int:
+        return int(other) + self._value
+
+    def __sub__(self, other) -> int:
+        return self._value - int(other)
+
+    def __rsub__(self, other) -> int:
+        return int(other) - self._value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (int, ThreadSafeCounter)):
+            return NotImplemented
+        return self._value == int(other)
+
+    def __lt__(self, other) -> bool:
+        if not isinstance(other, (int, ThreadSafeCounter)):
+            return NotImplemented
+        return self._value < int(other)
+
+    def __hash__(self) -> int:
+        return hash(self._value)
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self._value, format_spec)
+
+    def __repr__(self) -> str:
+        return str(self._value)
+
+
 class GithubScraper:
     """
     Scrapes GitHub user data.
     """
 
-    USERS_ATTEMPTED = 0
-    USERS_SCRAPED = 0
-    COMPANIES_SCRAPED = 0
+    USERS_ATTEMPTED = ThreadSafeCounter()
+    USERS_SCRAPED = ThreadSafeCounter()
+    COMPANIES_SCRAPED = ThreadSafeCounter()
 
     def __init__(
         self,
@@ -183,10 +363,47 @@ class GithubScraper:
         users_already_scraped: set[str] | None = None,
         companies_already_scraped: set[str] | None = None,
         output: Path = fp_main_output,
+        pool_size: int = 10,
+        access_tokens: List[str] | None = None,
+        no_hidden_requests: bool = False,
+        response_cache: ResponseCache | Path | None = None,
+        writer: OutputWriter | None = None,
+        state: CrawlState | Path | None = None,
+        parquet_output: ParquetOutput | None = None,
+        edge_table: EdgeTableWriter | None = None,
+        tier: int | None = None,
+        relation_workers: int = 1,
+        rate_governor: RateGovernor | bool | None = None,
     ):
+        self._rate_limit_lock = threading.Lock()
+        # Opt-in: True paces requests with a default RateGovernor; by default the
+        # threshold-and-sleep ratelimiter is used alone
+        self.rate_governor = (
+            RateGovernor() if rate_governor is True else rate_governor or None
+        )
+        self._stats_lock = threading.Lock()
+        self.relation_workers = relation_workers
+        self._relation_executor: Optional[ThreadPoolExecutor] = None
+        # Locations of the full profiles met in the relation getters, by login;
+        # collected only when set to a dict (see crawler_functions.FrontierCrawler)
+        self.profile_hints: Optional[Dict[str, Optional[str]]] = None
+        self.pool_size = pool_size
+        self.response_cache = (
+            ResponseCache(response_cache)
+            if isinstance(response_cache, Path)
+            else response_cache
+        )
         self.access_token = access_token
-        self.github = self._set_up_auth_github(self.access_token)
-        if not self.access_token:
+        if access_tokens is None:
+            # Use every token in config.ini, unless a single token was passed explicitly
+            access_tokens = (
+                github_access_tokens
+                if access_token == github_access_token
+                else [access_token]
+            )
+        self.access_tokens = access_tokens
+        self._set_up_auth_github(self.access_tokens)
+        if not self.token_pool.tokens:
             raise ValueError("GitHub access token is required.")
         self.github_max_rate = 0
         self.rate_limit_threshold = None  # Default rate limit
@@ -207,16 +424,42 @@ class GithubScraper:
         self.users_already_attempted = (
             users_already_attempted if users_already_attempted else set()
         )
+        self.state = CrawlState(state) if isinstance(state, Path) else state
+        if self.state is not None:
+            # The sets become views of the state store; passed sets are imported
+            # into it with their status
+            scraped = self.state.user_set(("scraped",))
+            scraped.update(self.users_already_scraped)
+            self.users_already_scraped = scraped
+            attempted = self.state.user_set()
+            attempted.update(self.users_already_attempted)
+            self.users_already_attempted = attempted
+            companies = self.state.company_set()
+            companies.update(self.companies_already_scraped)
+            self.companies_already_scraped = companies
         self.output = output
-        GithubScraper.USERS_SCRAPED = (
+        self.writer = writer
+        self.parquet_output = parquet_output
+        self.edge_table = edge_table
+        self.tier = tier
+        self.cost_reports: List[FetchCostReport] = []
+        self.no_hidden_requests = no_hidden_requests
+        self.hidden_request_counts: Dict[str, Dict[str, int]] = {}
+        self.prescreen_stats = {"screened": 0, "rejected": 0, "calls_saved": 0}
+        self.elided_calls: Dict[str, int] = {}
+        GithubScraper.USERS_SCRAPED.set(
             len(users_already_scraped) if users_already_scraped else 0
         )
-        GithubScraper.COMPANIES_SCRAPED = (
+        GithubScraper.COMPANIES_SCRAPED.set(
             len(companies_already_scraped) if companies_already_scraped else 0
         )
-        GithubScraper.USERS_ATTEMPTED = (
+        GithubScraper.USERS_ATTEMPTED.set(
             len(users_already_attempted) if users_already_attempted else 0
         )
+        if self.state is not None:
+            GithubScraper.USERS_SCRAPED.set(len(self.users_already_scraped))
+            GithubScraper.COMPANIES_SCRAPED.set(len(self.companies_already_scraped))
+            GithubScraper.USERS_ATTEMPTED.set(len(self.users_already_attempted))
         print(
             f"GithubScraper initialized with {len(self.companies_already_scraped)} companies and {len(self.users_already_scraped)} users already scraped."
         )
@@ -224,18 +467,49 @@ class GithubScraper:
         # Setup logging
         self.setup_logging()
 
-    def _set_up_auth_github(self, access_token) -> Github:
+    def _set_up_auth_github(self, access_tokens: List[str]) -> Optional[Github]:
+        """
+        Set up the GitHub authentication with the given tokens.
+
+        Args:
+            access_tokens (List[str]): The GitHub access tokens.
+
+        Returns:
+            Optional[Github]: The authenticated GitHub instance for the first token.
+        """
+        self.token_pool = TokenPool(
+            access_tokens,
+            pool_size=self.pool_size,
+            client_hook=self._set_up_client,
+            governor=self.rate_governor,
+        )
+        return self.github if self.token_pool.tokens else None
+
+    def _set_up_client(self, github: Github):
         """
-        Set up the GitHub authentication with the current token.
+        Set up a newly created GitHub client, e.g. with the response cache and the
+        rate governor.
 
         Args:
-            access_token (str): The GitHub access token.
+            github (Github): The authenticated GitHub instance.
 
         Returns:
-            Github: The authenticated GitHub instance.
+            None
+        """
+        if self.response_cache is not None or self.rate_governor is not None:
+            install_http_adapter(
+                github, cache=self.response_cache, governor=self.rate_governor
+            )
+
+    @property
+    def github(self) -> Github:
+        """
+        The GitHub client for the active token in the calling thread.
+
+        Worker threads started by `scrape_many` each get their own clients, since a
+        PyGithub connection must not be shared between threads.
         """
-        self.github = Github(access_token)
-        return self.github
+        return self.token_pool.client()
 
     def setup_logging(self):
         """
@@ -261,7 +535,7 @@ class GithubScraper:
 
     @ratelimiter
     def get_gh_users(
-        self, company_query: str, no_location_filter_bool: int
+        self, company_query: str, no_location_filter_bool: int, shard: bool = False
     ) -> List[tuple]:
         """
         Get GitHub users based on the company query and location filter.
@@ -269,28 +543,145 @@ class GithubScraper:
         Args:
             company_query (str): The company name to search for.
             no_location_filter_bool (int): Flag to indicate if location filtering is applied.
+            shard (bool): Whether to split queries that hit GitHub's 1,000 result cap,
+                see `discover_users`.
 
         Returns:
             List[tuple]: A list of tuples containing user information.
         """
-        filter_string = self.filter_string
-        if no_location_filter_bool == 1:
-            users = [
-                (user_gh, company_query)
-                for user_gh in [*self.github.search_users(company_query)]
-            ]
-        elif no_location_filter_bool == 0:
-            company_query = f"{company_query} {filter_string}"
+        if shard:
+            users = list(self.discover_users(company_query, no_location_filter_bool))
+        else:
+            if no_location_filter_bool == 0:
+                company_query = f"{company_query} {self.filter_string}"
             users = [
                 (user_gh, company_query)
-                for user_gh in [*self.github.search_users(company_query)]
+                for user_gh in self.github.search_users(company_query)
             ]
-        if len([*users]) > 0:
+        if users:
             return users
         else:
             print(no_location_filter_bool, "- no users found")
             return users
 
+    @ratelimiter
+    def _search_users(self, query: str):
+        """
+        Start a user search. The result is paginated lazily, so the pages are only
+        fetched as it is iterated.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            PaginatedList[NamedUser]: The search result.
+        """
+        return self.github.search_users(query)
+
+    @ratelimiter
+    def _search_shard(
+        self, shard: SearchShard, cap: int
+    ) -> Tuple[List[SearchShard], list]:
+        """
+        Run the search of one shard, or split it if it hits the result cap.
+
+        Transient errors (GitHub server errors and rate limits, dropped connections
+        and timeouts) are retried with a doubling backoff. Any other error, or a
+        transient one that persists, is raised, so a company is never taken as fully
+        searched with a shard missing.
+
+        Args:
+            shard (SearchShard): The shard.
+            cap (int): The result cap.
+
+        Returns:
+            Tuple[List[SearchShard], list]: The narrower shards to search instead, or
+                the users found.
+        """
+        for attempt in range(SEARCH_RETRIES + 1):
+            try:
+                results = self.github.search_users(shard.query)
+                total_count = results.totalCount
+                if total_count > cap:
+                    children = shard.split()
+                    if children:
+                        return children, []
+                    self.logger.warning(
+                        f"[discover_users] Query {shard.query} has {total_count} results and cannot be split, keeping the first {cap}."
+                    )
+                return [], list(results)
+            except (GithubException, requests.ConnectionError, requests.Timeout) as err:
+                # Connection errors, server errors and rate limits are transient
+                transient = not isinstance(err, GithubException) or (
+                    err.status is not None
+                    and (err.status >= 500 or err.status in (403, 429))
+                )
+                if not transient or attempt == SEARCH_RETRIES:
+                    self.logger.error(
+                        f"[discover_users] Search failed for {shard.query}: {err}"
+                    )
+                    raise
+                wait_seconds = SEARCH_RETRY_BACKOFF * 2**attempt
+                self.logger.warning(
+                    f"[discover_users] Search failed for {shard.query}: {err}, retrying in {wait_seconds:.0f}s."
+                )
+                time.sleep(wait_seconds)
+
+    def discover_users(
+        self,
+        company_query: str,
+        no_location_filter_bool: int,
+        workers: int = 3,
+        cap: int = SEARCH_RESULT_CAP,
+    ) -> Iterator[tuple]:
+        """
+        Search users for a company query, splitting queries that hit GitHub's result
+        cap into narrower ones: per location term, then per account creation date
+        range, then per followers range.
+
+        Shards are searched concurrently (each search passes the ratelimiter, so
+        they share the search budget), and the users are yielded as each shard
+        finishes, once per login. A shard that keeps failing raises its error, after
+        the users of the finished shards have been yielded.
+
+        Args:
+            company_query (str): The company name to search for.
+            no_location_filter_bool (int): Flag to indicate if location filtering is applied.
+            workers (int): The number of concurrent searches.
+            cap (int): The result cap.
+
+        Yields:
+            tuple: The user and the search query, as returned by `get_gh_users`.
+        """
+        if no_location_filter_bool == 0:
+            company_query = f"{company_query} {self.filter_string}"
+        seen = set()
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="github-search"
+        ) as executor:
+            pending = {
+                executor.submit(
+                    self._search_shard, SearchShard.from_query(company_query), cap
+                )
+            }
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        children, users = future.result()
+                        pending.update(
+                            executor.submit(self._search_shard, child, cap)
+                            for child in children
+                        )
+                        for user_gh in users:
+                            if user_gh.login not in seen:
+                                seen.add(user_gh.login)
+                                yield user_gh, company_query
+            finally:
+                # A failed shard (or the caller stopping) leaves the rest unsearched
+                for future in pending:
+                    future.cancel()
+
     @ratelimiter
     def get_user(self, user_login: str) -> Optional[NamedUser | AuthenticatedUser]:
         """
@@ -314,6 +705,119 @@ class GithubScraper:
             self.logger.error(f"[get_user] Error fetching user {user_login}: {err}")
             return None
 
+    def _needs_completion(self, github_object, attribute: str = "created_at") -> bool:
+        """
+        Check whether reading an attribute would make PyGithub fetch the full object.
+
+        Args:
+            github_object: A PyGithub object taken from a list response.
+            attribute (str): The attribute to read.
+
+        Returns:
+            bool: True if the attribute is missing from the data already fetched.
+        """
+        return attribute not in getattr(github_object, "_rawData", {})
+
+    def _created_at(self, github_object) -> Optional[str]:
+        """
+        Get the creation date of an object taken from a list response.
+
+        Reading `created_at` on a partial NamedUser makes PyGithub fetch the full
+        profile behind our back. With `no_hidden_requests` the date is only taken
+        from the list response, and left out (None) when it is not there.
+
+        Args:
+            github_object: A PyGithub object taken from a list response.
+
+        Returns:
+            Optional[str]: The creation date as an ISO string, or None.
+        """
+        if self.no_hidden_requests:
+            created_at = getattr(github_object, "_rawData", {}).get("created_at")
+            return created_at[:10] if created_at else None
+        created_at = github_object.created_at.date().isoformat()
+        if self.profile_hints is not None:
+            # The profile was completed for the date, so its location is known
+            raw_data = getattr(github_object, "_rawData", {})
+            if "location" in raw_data:
+                self.profile_hints[github_object.login] = raw_data["location"]
+        return created_at
+
+    def _parent_owner_login(self, repo: Repository) -> Optional[str]:
+        """
+        Get the owner of the repository a fork was made from.
+
+        The parent is not part of the repository listing, so reading `repo.parent`
+        fetches the full repository. With `no_hidden_requests` the parent is left
+        out (None) unless it is already there.
+
+        Args:
+            repo (Repository): The forked repository.
+
+        Returns:
+            Optional[str]: The login of the parent repository's owner, or None.
+        """
+        if self.no_hidden_requests:
+            parent = getattr(repo, "_rawData", {}).get("parent")
+            return parent["owner"]["login"] if parent else None
+        return repo.parent.owner.login
+
+    def _record_hidden_requests(
+        self,
+        user_login: str,
+        getter: str,
+        github_objects: list,
+        attribute: str = "created_at",
+    ):
+        """
+        Record how many completion requests a getter triggers under the old behavior.
+
+        Args:
+            user_login (str): The login of the user being scraped.
+            getter (str): The relation, e.g. "follows_in".
+            github_objects (list): The objects whose attribute is read.
+            attribute (str): The attribute read on each object.
+
+        Returns:
+            None
+        """
+        hidden_requests = sum(
+            self._needs_completion(github_object, attribute)
+            for github_object in github_objects
+        )
+        with self._stats_lock:
+            self.hidden_request_counts.setdefault(user_login, {})[getter] = (
+                hidden_requests
+            )
+
+    def _skip_empty_listing(
+        self, getter: str, github_object, counter: str, name: str
+    ) -> bool:
+        """
+        Check whether a listing can only return empty pages, using a counter that
+        was already fetched with the object (e.g. `stargazers_count` from the
+        repository listing, `followers` from the profile).
+
+        Skipped calls are counted in `elided_calls` and recorded in the scrape log.
+        Counters that were not fetched are never read, as that would trigger a
+        completion request.
+
+        Args:
+            getter (str): The name of the getter, e.g. "get_stars_in".
+            github_object: The user or repository the listing belongs to.
+            counter (str): The counter to check.
+            name (str): The user login or repository name, for the log.
+
+        Returns:
+            bool: True if the listing call should be skipped.
+        """
+        if getattr(github_object, "_rawData", {}).get(counter) != 0:
+            return False
+        with self._stats_lock:
+            self.elided_calls[getter] = self.elided_calls.get(getter, 0) + 1
+        self.logger.info(f"[{getter}] Skipped listing for {name}: {counter} is 0.")
+        return True
+
     @ratelimiter
     def get_follows_in(
         self, user: NamedUser | AuthenticatedUser
@@ -328,15 +832,19 @@ class GithubScraper:
             List[Dict[str, str]]: A list of dictionaries containing follower information.
         """
         follows_in = []
+        if self._skip_empty_listing("get_follows_in", user, "followers", user.login):
+            return follows_in
         try:
+            followers = list(user.get_followers())
+            self._record_hidden_requests(user.login, "follows_in", followers)
             follows_in.extend(
                 [
                     {
                         "repo_name": None,
                         "owner_login": follower.login,
-                        "created_at": follower.created_at.date().isoformat(),
+                        "created_at": self._created_at(follower),
                     }
-                    for follower in user.get_followers()
+                    for follower in followers
                 ]
             )
             return follows_in
@@ -360,15 +868,19 @@ class GithubScraper:
             List[Dict[str, str]]: A list of dictionaries containing following information.
         """
         follows_out = []
+        if self._skip_empty_listing("get_follows_out", user, "following", user.login):
+            return follows_out
         try:
+            following = list(user.get_following())
+            self._record_hidden_requests(user.login, "follows_out", following)
             follows_out.extend(
                 [
                     {
                         "repo_name": None,
                         "owner_login": follower.login,
-                        "created_at": follower.created_at.date().isoformat(),
+                        "created_at": self._created_at(follower),
                     }
-                    for follower in user.get_following()
+                    for follower in following
                 ]
             )
             return follows_out
@@ -406,7 +918,6 @@ class GithubScraper:
             )
             return []
 
-    @ratelimiter
     def get_repo_names(
         self, repos: List[Repository], user: NamedUser | AuthenticatedUser
     ) -> List[str]:
@@ -428,6 +939,29 @@ class GithubScraper:
             )
             return []
 
+    def _forks_in_for_repo(self, repo: Repository) -> List[Dict[str, str]]:
+        """
+        Get the forks of one repository, for `get_forks_in`.
+
+        Args:
+            repo (Repository): The repository.
+
+        Returns:
+            List[Dict[str, str]]: The forking information. Errors are raised.
+        """
+        if repo.fork or self._skip_empty_listing(
+            "get_forks_in", repo, "forks_count", repo.full_name
+        ):
+            return []
+        return [
+            {
+                "repo_name": repo.name,
+                "owner_login": fork.owner.login,
+                "created_at": fork.created_at.date().isoformat(),
+            }
+            for fork in repo.get_forks()
+        ]
+
     @ratelimiter
     def get_forks_in(
         self, repos: List[Repository]
@@ -444,17 +978,7 @@ class GithubScraper:
         forks_in_login = []
         try:
             for repo in repos:
-                if not repo.fork:
-                    forks_in_login.extend(
-                        [
-                            {
-                                "repo_name": repo.name,
-                                "owner_login": fork.owner.login,
-                                "created_at": fork.created_at.date().isoformat(),
-                            }
-                            for fork in repo.get_forks()
-                        ]
-                    )
+                forks_in_login.extend(self._forks_in_for_repo(repo))
             return forks_in_login
         except Exception as err:
             self.logger.error(f"[get_forks_in] Failed on repo {repo.full_name}: {err}")
@@ -476,15 +1000,18 @@ class GithubScraper:
         """
         forks_out_login = []
         try:
-            for repo in repos:
-                if repo.fork:
-                    forks_out_login.append(
-                        {
-                            "repo_name": repo.name,
-                            "owner_login": repo.parent.owner.login,
-                            "created_at": repo.created_at.date().isoformat(),
-                        }
-                    )
+            forked_repos = [repo for repo in repos if repo.fork]
+            self._record_hidden_requests(
+                user.login, "forks_out", forked_repos, attribute="parent"
+            )
+            for repo in forked_repos:
+                forks_out_login.append(
+                    {
+                        "repo_name": repo.name,
+                        "owner_login": self._parent_owner_login(repo),
+                        "created_at": repo.created_at.date().isoformat(),
+                    }
+                )
             return forks_out_login
         except Exception as err:
             self.logger.error(
@@ -492,6 +1019,49 @@ class GithubScraper:
             )
             return []
 
+    def _stars_in_for_repo(
+        self, repo: Repository, user: NamedUser | AuthenticatedUser
+    ) -> Tuple[List[Dict[str, str]], list]:
+        """
+        Get the stargazers of one repository, for `get_stars_in`.
+
+        Args:
+            repo (Repository): The repository.
+            user (NamedUser|AuthenticatedUser): The owner being scraped.
+
+        Returns:
+            Tuple[List[Dict[str, str]], list]: The starring information, and the
+                stargazer objects (for the hidden request count).
+        """
+        if repo.fork or self._skip_empty_listing(
+            "get_stars_in", repo, "stargazers_count", repo.full_name
+        ):
+            return [], []
+        try:
+            # The star+json media type carries starred_at in the list response
+            if self.no_hidden_requests:
+                stars = [
+                    (star.user, star.starred_at.date().isoformat())
+                    for star in repo.get_stargazers_with_dates()
+                ]
+            else:
+                stars = [(star, None) for star in repo.get_stargazers()]
+            stars_in_login = [
+                {
+                    "repo_name": repo.name,
+                    "owner_login": star.login,
+                    "created_at": starred_at or self._created_at(star),
+                }
+                for star, starred_at in stars
+                if star.login != user.login
+            ]
+            return stars_in_login, [star for star, _ in stars]
+        except Exception as err:
+            self.logger.error(
+                f"[get_stars_in] Failed for repo {repo.full_name}, user {user.login}: {err}"
+            )
+            return [], []
+
     @ratelimiter
     def get_stars_in(
         self, repos: List[Repository], user: NamedUser | AuthenticatedUser
@@ -507,25 +1077,12 @@ class GithubScraper:
             List[Dict[str, str]]: A list of dictionaries containing starring information.
         """
         stars_in_login = []
+        stargazers = []
         for repo in repos:
-            if not repo.fork:
-                try:
-                    stars = repo.get_stargazers()
-                    stars_in_login.extend(
-                        [
-                            {
-                                "repo_name": repo.name,
-                                "owner_login": star.login,
-                                "created_at": star.created_at.date().isoformat(),
-                            }
-                            for star in stars
-                            if star.login != user.login
-                        ]
-                    )
-                except Exception as err:
-                    self.logger.error(
-                        f"[get_stars_in] Failed for repo {repo.full_name}, user {user.login}: {err}"
-                    )
+            repo_stars, repo_stargazers = self._stars_in_for_repo(repo, user)
+            stars_in_login.extend(repo_stars)
+            stargazers.extend(repo_stargazers)
+        self._record_hidden_requests(user.login, "stars_in", stargazers)
         return stars_in_login
 
     @ratelimiter
@@ -554,6 +1111,43 @@ class GithubScraper:
             self.logger.error(f"[get_stars_out] Failed for user {user.login}: {err}")
             return []
 
+    def _watches_in_for_repo(
+        self, repo: Repository, user: NamedUser | AuthenticatedUser
+    ) -> Tuple[List[Dict[str, str]], list]:
+        """
+        Get the watchers of one repository, for `get_watches_in`.
+
+        Args:
+            repo (Repository): The repository.
+            user (NamedUser|AuthenticatedUser): The owner being scraped.
+
+        Returns:
+            Tuple[List[Dict[str, str]], list]: The watching information, and the
+                watcher objects (for the hidden request count).
+        """
+        # subscribers_count is only known if the full repository was fetched
+        if self._skip_empty_listing(
+            "get_watches_in", repo, "subscribers_count", repo.full_name
+        ):
+            return [], []
+        try:
+            watchers = list(repo.get_subscribers())
+            watch_in_login = [
+                {
+                    "repo_name": repo.name,
+                    "owner_login": watcher.login,
+                    "created_at": self._created_at(watcher),
+                }
+                for watcher in watchers
+                if watcher.login != user.login
+            ]
+            return watch_in_login, watchers
+        except Exception as err:
+            self.logger.error(
+                f"[get_watch_in] Failed for repo {repo.full_name}, user {user.login}: {err}"
+            )
+            return [], []
+
     @ratelimiter
     def get_watches_in(
         self, repos: List[Repository], user: NamedUser | AuthenticatedUser
@@ -569,22 +1163,12 @@ class GithubScraper:
             List[Dict[str, str]]: A list of dictionaries containing watching information.
         """
         watch_in_login = []
+        all_watchers = []
         for repo in repos:
-            try:
-                watchers = repo.get_subscribers()
-                watch_in_login.extend(
-                    {
-                        "repo_name": repo.name,
-                        "owner_login": watcher.login,
-                        "created_at": watcher.created_at.date().isoformat(),
-                    }
-                    for watcher in watchers
-                    if watcher.login != user.login
-                )
-            except Exception as err:
-                self.logger.error(
-                    f"[get_watch_in] Failed for repo {repo.full_name}, user {user.login}: {err}"
-                )
+            repo_watches, watchers = self._watches_in_for_repo(repo, user)
+            watch_in_login.extend(repo_watches)
+            all_watchers.extend(watchers)
+        self._record_hidden_requests(user.login, "watches_in", all_watchers)
         return watch_in_login
 
     @ratelimiter
@@ -641,44 +1225,33 @@ class GithubScraper:
             with open(log_file, "w") as f:
                 json.dump([{"username": user.login}], f)
 
-    @ratelimiter
-    def get_user_info(
+    def _infer_matches(
         self,
-        user: NamedUser | AuthenticatedUser,
-        company_label: str,
-        company_filter=True,
-    ) -> Optional[GithubUser]:
+        user_login: str,
+        company: str | None,
+        email: str | None,
+        bio: str | None,
+        blog: str | None,
+        location: str | None,
+        company_filter: bool = True,
+    ) -> Optional[tuple]:
         """
-        Get user information for the specified user.
+        Infer the DK location and company matches from the profile fields.
 
         Args:
-            user (NamedUser|AuthenticatedUser): The user to get information for.
-            company_label (str): The company label to use for searching.
+            user_login (str): The login name of the user.
+            company (str | None): The company name.
+            email (str | None): The email address.
+            bio (str | None): The user bio.
+            blog (str | None): The user blog URL.
+            location (str | None): The user location.
+            company_filter (bool): Whether to filter on both DK location and company,
+                or only on DK location.
 
         Returns:
-            GithubUser: An object containing the user's information.
+            Optional[tuple]: The location match and the matched company strings,
+                or None if the user is filtered out.
         """
-        # 1. Biography columns
-        search_with_company = company_label
-        user_login = user.login
-        usertype = user.type
-        company = user.company
-        email = user.email
-        location = user.location
-        bio = user.bio
-        blog = user.blog
-
-        # 2. Getting all user's repos
-        all_repos = self.get_all_repos(user)
-
-        if all_repos is None:
-            return None
-
-        # Check if the user has more than the allowed number of repos
-        if all_repos is not None:
-            repo_names = self.get_repo_names(all_repos, user)
-
-        # 3. Infer DK location and company match
         ## Filter both on Danish location and company
         if company_filter:
             match_result = infer_if_dk_and_company(
@@ -694,7 +1267,7 @@ class GithubScraper:
             location_match, matched_company_strings = match_result
 
         ## Filter only on Danish location
-        elif not company_filter:
+        else:
             bio_variables = [user_login, company, email, bio, blog]
             bio_variables_clean = [str(bio.lower()) for bio in bio_variables if bio]
             location_result = user_is_from_dk(
@@ -706,22 +1279,303 @@ class GithubScraper:
             location_match = location_result
             matched_company_strings = company_result
 
-        inferred_company = (
-            list(matched_company_strings.keys()) if matched_company_strings else None
-        )
+        return location_match, matched_company_strings
 
-        # 4. Connections
-        follows_in = self.get_follows_in(user)
-        follows_out = self.get_follows_out(user)
-        watches_in = self.get_watches_in(all_repos, user)
-        watches_out = self.get_watches_out(user)
-        stars_in = self.get_stars_in(all_repos, user)
-        stars_out = self.get_stars_out(user)
-        forks_in = self.get_forks_in(all_repos)
-        forks_out = self.get_forks_out(all_repos, user)
+    def _record_prescreen(
+        self, user: NamedUser | AuthenticatedUser | str, rejected: bool
+    ):
+        """
+        Count a pre-screened user and the API calls saved if they were rejected.
 
-        # 5. Return the data class
-        return GithubUser(
+        A rejected user would otherwise have had their repository listing paginated
+        (unless above the repository limit, which is checked without a call).
+
+        Args:
+            user (NamedUser|AuthenticatedUser|str): The pre-screened user, or their
+                login when the calls saved are not repository pages (GraphQL path).
+            rejected (bool): Whether the user was rejected.
+
+        Returns:
+            None
+        """
+        with self._stats_lock:
+            self.prescreen_stats["screened"] += 1
+        if not rejected:
+            return
+        if isinstance(user, str):
+            user_login, calls_saved = user, 1
+        else:
+            user_login = user.login
+            n_repos = user.public_repos
+            calls_saved = (
+                max(1, math.ceil(n_repos / self.github.per_page))
+                if n_repos <= self.repo_limit
+                else 0
+            )
+        with self._stats_lock:
+            self.prescreen_stats["rejected"] += 1
+            self.prescreen_stats["calls_saved"] += calls_saved
+        self.logger.info(
+            f"[prescreen] User {user_login} rejected on profile, {calls_saved} API calls saved."
+        )
+
+    def _record_user_status(self, user_login: str, status: str, **fields):
+        """
+        Record the status of a user in the state store, if the scraper has one.
+
+        Args:
+            user_login (str): The login of the user.
+            status (str): The user status.
+            **fields: The error, company or tier, passed on to the store.
+
+        Returns:
+            None
+        """
+        if self.state is not None:
+            self.state.set_user_status(user_login, status, **fields)
+
+    def _track_relation(self, user_login: str, relation: str, values: Optional[list]):
+        """
+        Record a fetched relation of a user in the state store, if the scraper has one.
+
+        Args:
+            user_login (str): The login of the user.
+            relation (str): The relation, e.g. "follows_in".
+            values (Optional[list]): The fetched relation.
+
+        Returns:
+            Optional[list]: The relation, unchanged.
+        """
+        if self.state is not None:
+            self.state.set_relation_progress(
+                user_login, relation, items=len(values) if values is not None else None
+            )
+        return values
+
+    def _relation_pool(self) -> ThreadPoolExecutor:
+        with self._stats_lock:
+            if self._relation_executor is None:
+                self._relation_executor = ThreadPoolExecutor(
+                    max_workers=self.relation_workers,
+                    thread_name_prefix="github-relations",
+                )
+            return self._relation_executor
+
+    @staticmethod
+    def _thread_copy(value):
+        """
+        Copy a PyGithub object (or a list of them) for use in a worker thread.
+
+        The ratelimiter rebinds the objects passed to a call to the calling thread's
+        client; on copies this does not move the objects of other threads.
+        """
+        if isinstance(value, list):
+            return [copy.copy(item) for item in value]
+        return copy.copy(value)
+
+    @ratelimiter
+    def _run_repo_task(self, task: Callable, repo: Repository, *args):
+        return task(repo, *args)
+
+    def _submit_relation(self, getter: Callable, *args) -> Future:
+        return self._relation_pool().submit(
+            getter, *[self._thread_copy(arg) for arg in args]
+        )
+
+    def _submit_repo_tasks(
+        self, task: Callable, repos: List[Repository], *args
+    ) -> List[Future]:
+        return [
+            self._relation_pool().submit(
+                self._run_repo_task,
+                task,
+                copy.copy(repo),
+                *[self._thread_copy(arg) for arg in args],
+            )
+            for repo in repos
+        ]
+
+    def _gather_repo_relation(
+        self, user_login: str, relation: str, futures: List[Future]
+    ) -> List[Dict[str, str]]:
+        """
+        Assemble a per-repository relation (stars_in or watches_in) in repo order,
+        as the sequential getter does.
+        """
+        entries, objects = [], []
+        for future in futures:
+            repo_entries, repo_objects = future.result()
+            entries.extend(repo_entries)
+            objects.extend(repo_objects)
+        self._record_hidden_requests(user_login, relation, objects)
+        return entries
+
+    def _gather_forks_in(
+        self, repos: List[Repository], futures: List[Future]
+    ) -> List[Dict[str, str]]:
+        forks_in_login = []
+        for repo, future in zip(repos, futures):
+            try:
+                forks_in_login.extend(future.result())
+            except Exception as err:
+                # As get_forks_in: one failing repository empties the relation
+                self.logger.error(
+                    f"[get_forks_in] Failed on repo {repo.full_name}: {err}"
+                )
+                return []
+        return forks_in_login
+
+    def _get_relations_concurrently(
+        self, user: NamedUser | AuthenticatedUser, all_repos: List[Repository]
+    ) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Fetch the eight relations of a user on the relation thread pool.
+
+        The whole-user getters and the per-repository listings of stars_in,
+        watches_in and forks_in run as separate tasks, each passing the ratelimiter,
+        so all tasks share the token pool's budget. Every task gets its own copies of
+        the user and repository objects, and the results are assembled in the same
+        order as the sequential getters.
+
+        Args:
+            user (NamedUser|AuthenticatedUser): The user.
+            all_repos (List[Repository]): The user's repositories.
+
+        Returns:
+            Dict[str, List[Dict[str, str]]]: The relations by field name.
+        """
+        futures = {
+            "follows_in": self._submit_relation(self.get_follows_in, user),
+            "follows_out": self._submit_relation(self.get_follows_out, user),
+            "watches_out": self._submit_relation(self.get_watches_out, user),
+            "stars_out": self._submit_relation(self.get_stars_out, user),
+            "forks_out": self._submit_relation(self.get_forks_out, all_repos, user),
+        }
+        watches_in = self._submit_repo_tasks(
+            self._watches_in_for_repo, all_repos, user
+        )
+        stars_in = self._submit_repo_tasks(self._stars_in_for_repo, all_repos, user)
+        forks_in = self._submit_repo_tasks(self._forks_in_for_repo, all_repos)
+
+        relations = {field: future.result() for field, future in futures.items()}
+        relations["watches_in"] = self._gather_repo_relation(
+            user.login, "watches_in", watches_in
+        )
+        relations["stars_in"] = self._gather_repo_relation(
+            user.login, "stars_in", stars_in
+        )
+        relations["forks_in"] = self._gather_forks_in(all_repos, forks_in)
+        return relations
+
+    def close_relation_pool(self):
+        """
+        Shut down the relation thread pool, if it was started.
+
+        Returns:
+            None
+        """
+        with self._stats_lock:
+            executor, self._relation_executor = self._relation_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @ratelimiter
+    def get_user_info(
+        self,
+        user: NamedUser | AuthenticatedUser,
+        company_label: str,
+        company_filter=True,
+    ) -> Optional[GithubUser]:
+        """
+        Get user information for the specified user.
+
+        The user is pre-screened on their profile fields first, so rejected users
+        cost no repository or relation requests (see `prescreen_stats`).
+
+        Args:
+            user (NamedUser|AuthenticatedUser): The user to get information for.
+            company_label (str): The company label to use for searching.
+
+        Returns:
+            GithubUser: An object containing the user's information.
+        """
+        # 1. Biography columns
+        search_with_company = company_label
+        user_login = user.login
+        usertype = user.type
+        company = user.company
+        email = user.email
+        location = user.location
+        bio = user.bio
+        blog = user.blog
+
+        # 2. Pre-screen: infer DK location and company match on the profile alone,
+        # before any repository or relation is fetched
+        match_result = self._infer_matches(
+            user_login, company, email, bio, blog, location, company_filter
+        )
+        if match_result is None:
+            self._record_prescreen(user, rejected=True)
+            self._record_user_status(user_login, "rejected", error="prescreen")
+            return None
+        self._record_prescreen(user, rejected=False)
+        location_match, matched_company_strings = match_result
+
+        inferred_company = (
+            list(matched_company_strings.keys()) if matched_company_strings else None
+        )
+
+        # 3. Getting all user's repos
+        all_repos = self.get_all_repos(user)
+
+        if all_repos is None:
+            self._record_user_status(user_login, "rejected", error="repo limit")
+            return None
+
+        # Check if the user has more than the allowed number of repos
+        if all_repos is not None:
+            repo_names = self.get_repo_names(all_repos, user)
+
+        # 4. Connections
+        track = self._track_relation
+        if self.relation_workers > 1:
+            relations = self._get_relations_concurrently(user, all_repos)
+            follows_in = track(user_login, "follows_in", relations["follows_in"])
+            follows_out = track(user_login, "follows_out", relations["follows_out"])
+            watches_in = track(user_login, "watches_in", relations["watches_in"])
+            watches_out = track(user_login, "watches_out", relations["watches_out"])
+            stars_in = track(user_login, "stars_in", relations["stars_in"])
+            stars_out = track(user_login, "stars_out", relations["stars_out"])
+            forks_in = track(user_login, "forks_in", relations["forks_in"])
+            forks_out = track(user_login, "forks_out", relations["forks_out"])
+        else:
+            follows_in = track(user_login, "follows_in", self.get_follows_in(user))
+            follows_out = track(
+                user_login, "follows_out", self.get_follows_out(user)
+            )
+            watches_in = track(
+                user_login, "watches_in", self.get_watches_in(all_repos, user)
+            )
+            watches_out = track(
+                user_login, "watches_out", self.get_watches_out(user)
+            )
+            stars_in = track(
+                user_login, "stars_in", self.get_stars_in(all_repos, user)
+            )
+            stars_out = track(user_login, "stars_out", self.get_stars_out(user))
+            forks_in = track(user_login, "forks_in", self.get_forks_in(all_repos))
+            forks_out = track(
+                user_login, "forks_out", self.get_forks_out(all_repos, user)
+            )
+
+        hidden_requests = sum(self.hidden_request_counts.get(user_login, {}).values())
+        self.logger.info(
+            f"[get_user_info] User {user_login}: {hidden_requests} completion requests "
+            f"{'avoided' if self.no_hidden_requests else 'made'} in the relation getters."
+        )
+
+        # 5. Return the data class
+        return GithubUser(
             user_login=user_login,
             search_with_company=search_with_company,
             listed_company=company,
@@ -744,26 +1598,609 @@ class GithubScraper:
             forks_out=forks_out,
         )
 
+    def _graphql_query(
+        self, query: str, variables: dict, report: FetchCostReport
+    ) -> dict:
+        """
+        Run a GraphQL query and add its cost to the report.
+
+        Args:
+            query (str): The GraphQL query.
+            variables (dict): The query variables.
+            report (FetchCostReport): The cost report of the user being fetched.
+
+        Returns:
+            dict: The "data" of the response.
+        """
+        _, response = self.github.requester.graphql_query(query, variables)
+        report.graphql_queries += 1
+        report.graphql_cost += response["data"]["rateLimit"]["cost"]
+        return response["data"]
+
+    def _graphql_paginate(
+        self,
+        connection: dict,
+        query: str,
+        variables: dict,
+        path: List[str],
+        report: FetchCostReport,
+    ) -> List[dict]:
+        """
+        Collect all nodes of a connection, following its cursor from the first page.
+
+        Args:
+            connection (dict): The first page of the connection.
+            query (str): The query for a further page, taking a `$cursor` variable.
+            variables (dict): The other query variables.
+            path (List[str]): The path from the response data to the connection.
+            report (FetchCostReport): The cost report of the user being fetched.
+
+        Returns:
+            List[dict]: The nodes of the connection (missing nodes such as deleted users left out).
+        """
+        nodes = list(connection["nodes"])
+        page_info = connection["pageInfo"]
+        while page_info["hasNextPage"]:
+            data = self._graphql_query(
+                query, {**variables, "cursor": page_info["endCursor"]}, report
+            )
+            for key in path:
+                data = data[key]
+            nodes.extend(data["nodes"])
+            page_info = data["pageInfo"]
+        return [node for node in nodes if node]
+
+    @ratelimiter
+    def get_user_info_graphql(
+        self,
+        user_login: str,
+        company_label: str,
+        company_filter=True,
+    ) -> Optional[GithubUser]:
+        """
+        Get user information for the specified user through the GraphQL API.
+
+        Fetches the profile first, and only for users passing the DK and company
+        inference the repositories (with their stargazers, watchers and forks),
+        followers, following and starred repositories, in a few cursor-paginated
+        queries. The watched repositories are listed through REST, as GraphQL's
+        `watching` leaves out third-party repositories. Produces the same record as
+        `get_user_info`, and appends a FetchCostReport to `self.cost_reports`.
+
+        Args:
+            user_login (str): The login of the GitHub user.
+            company_label (str): The company label to use for searching.
+            company_filter (bool): Whether to filter on both DK location and company.
+
+        Returns:
+            Optional[GithubUser]: An object containing the user's information.
+        """
+        report = FetchCostReport(user_login=user_login)
+        try:
+            # 1. Biography columns
+            owner = self._graphql_query(PROFILE_QUERY, {"login": user_login}, report)[
+                "repositoryOwner"
+            ]
+        except Exception as err:
+            self.logger.error(
+                f"[get_user_info_graphql] Error fetching user {user_login}: {err}"
+            )
+            self._record_user_status(user_login, "failed", error=str(err))
+            return None
+        if owner is None:
+            self.logger.error(f"[get_user_info_graphql] User {user_login} not found.")
+            self._record_user_status(user_login, "failed", error="user not found")
+            return None
+
+        user_login = owner["login"]
+        usertype = owner["__typename"]
+        company = owner.get("company")
+        email = owner.get("email") or None
+        location = owner.get("location")
+        bio = owner.get("bio", owner.get("description"))
+        blog = owner.get("websiteUrl") or ""
+
+        # IMPORTANT methodological choice: same repository limit as the REST path
+        if owner["repositories"]["totalCount"] > self.repo_limit:
+            self.logger.warning(
+                f"[get_user_info_graphql] User {user_login} has {owner['repositories']['totalCount']} public repos, skipping."
+            )
+            self._record_user_status(user_login, "rejected", error="repo limit")
+            return None
+
+        # 2. Infer DK location and company match
+        match_result = self._infer_matches(
+            user_login, company, email, bio, blog, location, company_filter
+        )
+        if match_result is None:
+            self._record_prescreen(user_login, rejected=True)
+            self._record_user_status(user_login, "rejected", error="prescreen")
+            return None
+        self._record_prescreen(user_login, rejected=False)
+        location_match, matched_company_strings = match_result
+        inferred_company = (
+            list(matched_company_strings.keys()) if matched_company_strings else None
+        )
+
+        # 3. Repositories and user connections
+        try:
+            owner = self._graphql_query(RELATIONS_QUERY, {"login": user_login}, report)[
+                "repositoryOwner"
+            ]
+            repositories = self._graphql_paginate(
+                owner["repositories"],
+                REPOSITORIES_PAGE_QUERY,
+                {"login": user_login},
+                ["repositoryOwner", "repositories"],
+                report,
+            )
+            user_connections = {
+                field: self._graphql_paginate(
+                    owner[field],
+                    user_connection_query(field),
+                    {"login": user_login},
+                    ["user", field],
+                    report,
+                )
+                if field in owner
+                else []
+                for field in USER_CONNECTIONS
+            }
+            user_totals = {
+                field: owner[field]["totalCount"]
+                for field in USER_CONNECTIONS
+                if field in owner
+            }
+            for repo in repositories:
+                owner_login, name = repo["nameWithOwner"].split("/", 1)
+                for field in REPOSITORY_CONNECTIONS:
+                    repo[field]["nodes"] = self._graphql_paginate(
+                        repo[field],
+                        repository_connection_query(field),
+                        {"owner": owner_login, "name": name},
+                        ["repository", field],
+                        report,
+                    )
+        except Exception as err:
+            self.logger.error(
+                f"[get_user_info_graphql] Failed to get relations for user {user_login}: {err}"
+            )
+            self._record_user_status(user_login, "failed", error=str(err))
+            return None
+
+        # 4. Connections, shaped as the REST getters shape them
+        def user_entry(node: dict, repo_name: Optional[str] = None) -> dict:
+            return {
+                "repo_name": repo_name,
+                "owner_login": node["login"],
+                "created_at": graphql_date(node["createdAt"]),
+            }
+
+        def repo_entry(node: dict, owner_login: Optional[str] = None) -> dict:
+            return {
+                "repo_name": node["name"],
+                "owner_login": owner_login or node["owner"]["login"],
+                "created_at": graphql_date(node["createdAt"]),
+            }
+
+        follows_in = [user_entry(node) for node in user_connections["followers"]]
+        follows_out = [user_entry(node) for node in user_connections["following"]]
+        stars_out = [
+            repo_entry(node) for node in user_connections["starredRepositories"]
+        ]
+        # Watched repositories through REST, see USER_CONNECTIONS
+        watches_out = self.get_watches_out(self.github.get_user(user_login, lazy=True))
+        watches_in = [
+            user_entry(node, repo["name"])
+            for repo in repositories
+            for node in repo["watchers"]["nodes"]
+            if node["login"] != user_login
+        ]
+        stars_in = [
+            user_entry(node, repo["name"])
+            for repo in repositories
+            if not repo["isFork"]
+            for node in repo["stargazers"]["nodes"]
+            if node["login"] != user_login
+        ]
+        forks_in = [
+            {
+                "repo_name": repo["name"],
+                "owner_login": node["owner"]["login"],
+                "created_at": graphql_date(node["createdAt"]),
+            }
+            for repo in repositories
+            if not repo["isFork"]
+            for node in repo["forks"]["nodes"]
+        ]
+        forks_out = [
+            repo_entry(repo, repo["parent"]["owner"]["login"])
+            for repo in repositories
+            if repo["isFork"] and repo["parent"]
+        ]
+
+        # 5. Cost report
+        report.rest_requests_estimate = estimate_rest_requests(
+            repositories, user_totals
+        )
+        self.cost_reports.append(report)
+        self.logger.info(
+            f"[get_user_info_graphql] User {user_login}: {report.graphql_queries} GraphQL queries "
+            f"(cost {report.graphql_cost}) vs. ~{report.rest_requests_estimate} REST requests."
+        )
+
+        # 6. Return the data class
+        return GithubUser(
+            user_login=user_login,
+            search_with_company=company_label,
+            listed_company=company,
+            inferred_company=inferred_company,
+            matched_company_strings=matched_company_strings,
+            usertype=usertype,
+            email=email,
+            github_location=location,
+            matched_location=location_match,
+            bio=bio,
+            blog=blog,
+            repo_names=[repo["nameWithOwner"] for repo in repositories],
+            follows_in=follows_in,
+            follows_out=follows_out,
+            watches_in=watches_in,
+            watches_out=watches_out,
+            stars_in=stars_in,
+            stars_out=stars_out,
+            forks_in=forks_in,
+            forks_out=forks_out,
+        )
+
+    def _scrape_user(
+        self, user_login: str, company_label: str | None, company_filter: bool
+    ) -> Optional[GithubUser]:
+        """
+        Fetch and build a single user record on a worker thread.
+
+        Args:
+            user_login (str): The login of the GitHub user.
+            company_label (str | None): The company label to use for searching.
+            company_filter (bool): Whether to filter on both DK location and company.
+
+        Returns:
+            Optional[GithubUser]: The user's information, or None if skipped.
+        """
+        named_user = self.get_user(user_login)
+        if named_user is None:
+            self._record_user_status(user_login, "failed", error="user not found")
+            return None
+        try:
+            return self.get_user_info(
+                named_user, company_label, company_filter=company_filter
+            )
+        except Exception as err:
+            self.logger.error(f"[scrape_many] Failed to scrape user {user_login}: {err}")
+            self._record_user_status(user_login, "failed", error=str(err))
+            return None
+
+    async def ascrape_many(
+        self,
+        users: Dict[str, str] | Iterable[str],
+        company_label: str | None = None,
+        concurrency: int = 8,
+        company_filter: bool = True,
+        on_result: Optional[Callable[[GithubUser], None]] = None,
+        skip_attempted: bool = True,
+    ) -> List[GithubUser]:
+        """
+        Scrape many users concurrently (awaitable version of `scrape_many`).
+
+        Each worker thread keeps its own authenticated clients, so requests are sent
+        over a pooled keep-alive connection per worker. All workers pass through the
+        `ratelimiter` check, which is serialised, so a sleep in one worker holds back
+        the others as well.
+
+        Args:
+            users (Dict[str, str] | Iterable[str]): Logins to scrape, or a mapping of
+                login to the company label it was found through.
+            company_label (str | None): The company label used when `users` is not a mapping.
+            concurrency (int): The maximum number of users scraped at the same time.
+            company_filter (bool): Whether to filter on both DK location and company.
+            on_result (Callable | None): Called with each user record as it completes,
+                e.g. to save it straight away.
+            skip_attempted (bool): Whether to skip users in `users_already_attempted`.
+                False for users claimed from the state, which are marked attempted.
+
+        Returns:
+            List[GithubUser]: The scraped users, in input order.
+        """
+        if isinstance(users, dict):
+            jobs = list(users.items())
+        else:
+            jobs = [(user_login, company_label) for user_login in users]
+        jobs = [
+            (user_login, label)
+            for user_login, label in dict(jobs).items()
+            if not skip_attempted or user_login not in self.users_already_attempted
+        ]
+
+        if concurrency > self.pool_size:
+            self.logger.warning(
+                f"[scrape_many] Concurrency {concurrency} exceeds pool size {self.pool_size}."
+            )
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="github-scraper"
+        ) as executor:
+
+            async def scrape(user_login: str, label: str | None):
+                async with semaphore:
+                    self.users_already_attempted.add(user_login)
+                    GithubScraper.USERS_ATTEMPTED += 1
+                    user_row = await loop.run_in_executor(
+                        executor, self._scrape_user, user_login, label, company_filter
+                    )
+                if user_row is not None and on_result is not None:
+                    on_result(user_row)
+                return user_row
+
+            results = await asyncio.gather(
+                *(scrape(user_login, label) for user_login, label in jobs)
+            )
+
+        return [user_row for user_row in results if user_row is not None]
+
+    def scrape_many(
+        self,
+        users: Dict[str, str] | Iterable[str],
+        company_label: str | None = None,
+        concurrency: int = 8,
+        company_filter: bool = True,
+        on_result: Optional[Callable[[GithubUser], None]] = None,
+        skip_attempted: bool = True,
+    ) -> List[GithubUser]:
+        """
+        Scrape many users concurrently with at most `concurrency` users in flight.
+
+        Runs `ascrape_many` to completion. When called from inside a running event
+        loop (e.g. a Jupyter kernel) the loop is run on a separate thread; there you
+        can also `await gs.ascrape_many(...)` directly.
+
+        Args:
+            users (Dict[str, str] | Iterable[str]): Logins to scrape, or a mapping of
+                login to the company label it was found through.
+            company_label (str | None): The company label used when `users` is not a mapping.
+            concurrency (int): The maximum number of users scraped at the same time.
+            company_filter (bool): Whether to filter on both DK location and company.
+            on_result (Callable | None): Called with each user record as it completes.
+            skip_attempted (bool): Whether to skip users in `users_already_attempted`.
+
+        Returns:
+            List[GithubUser]: The scraped users, in input order.
+        """
+        coroutine = self.ascrape_many(
+            users,
+            company_label=company_label,
+            concurrency=concurrency,
+            company_filter=company_filter,
+            on_result=on_result,
+            skip_attempted=skip_attempted,
+        )
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    def scrape_pipeline(
+        self,
+        jobs: Iterable[tuple],
+        file_name: str,
+        company_filter: bool = True,
+        shard: bool = False,
+        hydrate_workers: int = 4,
+        scrape_workers: int = 4,
+        queue_size: int = 100,
+        user_log_path: str | None = None,
+        company_log_path: str | None = None,
+    ) -> Pipeline:
+        """
+        Build the streaming scrape of a list of company searches, from search to
+        saved user.
+
+        The stages run concurrently, connected by bounded queues:
+        1. search: runs each company search and passes the logins on page by page
+           (companies in `companies_already_scraped` are skipped; a company whose
+           search fails is not logged, so it is searched again next run),
+        2. prefilter: drops users already scraped, attempted or seen in this run,
+        3. hydrate: fetches each user's full profile (`get_user`),
+        4. relations: builds the user record (`get_user_info`, with its pre-screen),
+        5. write: saves the record (`save_file`) and logs the match.
+
+        Iterate over the returned pipeline to run it; it yields the saved users,
+        and `pipeline.stats` holds the throughput of every stage. Once all jobs are
+        done, the searched companies are logged.
+
+        Args:
+            jobs (Iterable[tuple]): (search query, no location filter flag, company
+                label) per company, as looped over in the notebooks.
+            file_name (str): The output file name, see `save_file`.
+            company_filter (bool): Whether to filter on both DK location and company.
+            shard (bool): Whether to shard searches that hit the result cap.
+            hydrate_workers (int): The number of threads fetching profiles.
+            scrape_workers (int): The number of threads building user records.
+            queue_size (int): The capacity of the queues between stages.
+            user_log_path (str | None): The user match log, see `log_user_w_match`.
+            company_log_path (str | None): The company log, see `log_company`.
+
+        Returns:
+            Pipeline: The pipeline.
+        """
+        searched_companies = []
+        seen = set()
+        seen_lock = threading.Lock()
+
+        def search(job: tuple) -> Iterator[tuple]:
+            search_query, no_location_filter_bool, company_label = job
+            if company_label in self.companies_already_scraped:
+                print(f"[INFO] Company {company_label} already scraped. Skipping.")
+                return
+            print(f"[INFO] Scraping users for company: {company_label}")
+            try:
+                if shard:
+                    results = self.discover_users(search_query, no_location_filter_bool)
+                    for named_user, _ in results:
+                        yield named_user.login, company_label
+                else:
+                    if no_location_filter_bool == 0:
+                        search_query = f"{search_query} {self.filter_string}"
+                    for named_user in self._search_users(search_query):
+                        yield named_user.login, company_label
+            except Exception as err:
+                # Not logged as searched, so the company is searched again next run
+                self.logger.error(
+                    f"[scrape_pipeline] Search failed for company {company_label}: {err}"
+                )
+                if self.state is not None:
+                    self.state.set_company_status(company_label, "failed", str(err))
+                return
+            searched_companies.append(company_label)
+
+        def prefilter(item: tuple) -> Optional[List[tuple]]:
+            user_login, _ = item
+            with seen_lock:
+                if (
+                    user_login in seen
+                    or user_login in self.users_already_scraped
+                    or user_login in self.users_already_attempted
+                ):
+                    return None
+                seen.add(user_login)
+            self.users_already_attempted.add(user_login)
+            GithubScraper.USERS_ATTEMPTED += 1
+            return [item]
+
+        def hydrate(item: tuple) -> Optional[List[tuple]]:
+            user_login, company_label = item
+            named_user = self.get_user(user_login)
+            if named_user is None:
+                self._record_user_status(user_login, "failed", error="user not found")
+                return None
+            return [(named_user, company_label)]
+
+        def relations(item: tuple) -> Optional[List[GithubUser]]:
+            named_user, company_label = item
+            try:
+                user_row = self.get_user_info(
+                    named_user, company_label, company_filter=company_filter
+                )
+            except Exception as err:
+                self.logger.error(
+                    f"[scrape_pipeline] Failed to scrape user {named_user.login}: {err}"
+                )
+                self._record_user_status(named_user.login, "failed", error=str(err))
+                return None
+            return [user_row] if user_row is not None else None
+
+        def write(user_row: GithubUser) -> List[GithubUser]:
+            self.save_file(user_row, file_name)
+            self.users_already_scraped.add(user_row.user_login)
+            if user_log_path is not None:
+                self.log_user_w_match(
+                    user_row.user_login,
+                    user_row.inferred_company,
+                    user_row.matched_company_strings,
+                    user_row.matched_location,
+                    user_log_path,
+                )
+            else:
+                GithubScraper.USERS_SCRAPED += 1
+                self._record_user_status(user_row.user_login, "scraped")
+            return [user_row]
+
+        def log_companies():
+            for company_label in searched_companies:
+                if company_log_path is not None:
+                    self.log_company(company_label, company_log_path)
+                else:
+                    self.companies_already_scraped.add(company_label)
+
+        return (
+            Pipeline(jobs, queue_size=queue_size, on_finish=log_companies)
+            .stage("search", search)
+            .stage("prefilter", prefilter)
+            .stage("hydrate", hydrate, workers=hydrate_workers)
+            .stage("relations", relations, workers=scrape_workers)
+            .stage("write", write)
+        )
+
     def save_file(
         self, user_row: GithubUser, filename: str, remove_existing_file: bool = False
     ):
         """
-        Save user information to a JSONL file.
+        Save user information to a JSONL file (or to the scraper's Parquet output or
+        writer, if it has one). If the scraper has an edge table, the user's
+        relations are appended to it as well, with the scraper's tier.
 
         Args:
             user_row (GithubUser): The user information to save.
             filename (str): The name of the file to save to.
             remove_existing_file (bool): Whether to remove the existing file before saving.
+                Ignored when the scraper has a Parquet output or a writer, which never
+                remove output.
 
         Returns:
             None
         """
-        filepath = self.output / filename
+        if self.edge_table is not None:
+            self.edge_table.write_user(user_row, tier=self.tier)
+        if self.parquet_output is not None:
+            self.parquet_output.write(filename, user_row)
+            return
+        if self.writer is not None:
+            self.writer.write(filename, asdict(user_row))
+            return
+        filepath = self.output / f"{filename}.jsonl"
         if remove_existing_file and filepath.exists():
             filepath.unlink()  # Deletes the existing file
-        with open(f"{filepath}.jsonl", "a") as f:
+        with open(filepath, "a") as f:
             f.write(json.dumps(asdict(user_row)) + "\n")
 
+    def _append_record(self, record: dict, log_file_path: str):
+        """
+        Append a record to a JSONL log file, or to the stream of the same name
+        (the file name without suffix) if the scraper has a writer.
+
+        Args:
+            record (dict): The record to log.
+            log_file_path (str): The path to the log file.
+
+        Returns:
+            None
+        """
+        if self.writer is not None:
+            self.writer.write(Path(log_file_path).stem, record)
+            return
+        with open(log_file_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def close_writer(self):
+        """
+        Flush and close the scraper's writer, Parquet output and edge table, if it
+        has them.
+
+        Returns:
+            None
+        """
+        if self.writer is not None:
+            self.writer.close()
+        if self.parquet_output is not None:
+            self.parquet_output.close()
+        if self.edge_table is not None:
+            self.edge_table.close()
+
     def log_company(self, company: str, log_file_path: str):
         """
         Log company information to a JSONL file.
@@ -776,8 +2213,9 @@ class GithubScraper:
             None
         """
         company_dict = {"company_name": company}
-        with open(log_file_path, "a") as f:
-            f.write(json.dumps(company_dict) + "\n")
+        self._append_record(company_dict, log_file_path)
+        if self.state is not None:
+            self.state.set_company_status(company, "scraped")
         print(f"Company {company} logged.")
 
     def log_user_w_match(
@@ -810,12 +2248,19 @@ class GithubScraper:
             "location_match": location_match if location_match else None,
         }
         GithubScraper.USERS_SCRAPED += 1
-        with open(log_file_path, "a") as f:
-            f.write(json.dumps(user_match_dict) + "\n")
+        self._append_record(user_match_dict, log_file_path)
+        self._record_user_status(
+            user_login,
+            "scraped",
+            company=inferred_company
+            if isinstance(inferred_company, str) or not inferred_company
+            else ", ".join(inferred_company),
+        )
         print(f"User match {user_login} logged.")
 
     def log_user_scrape_attempt(self, user_login, log_file_path):
         user_dict = {"user_login": user_login}
-        with open(log_file_path, "a") as f:
-            f.write(json.dumps(user_dict) + "\n")
+        self._append_record(user_dict, log_file_path)
+        if self.state is not None:
+            self.state.mark_attempted(user_login)
         GithubScraper.USERS_ATTEMPTED += 1
@@ -0,0 +1,219 @@
+#######################
+### Import Packages ###
+#######################
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Dict
+
+##########################
+### GraphQL Selections ###
+##########################
+
+# Page sizes (GitHub's GraphQL API allows at most 100 nodes per connection)
+CONNECTION_PAGE_SIZE = 100
+REPOSITORY_PAGE_SIZE = 50
+
+PAGE_INFO = "totalCount pageInfo { hasNextPage endCursor }"
+
+# Node selections for the connections on a user. Watched repositories are not
+# among them: `watching` only lists repositories of owners the user is affiliated
+# with (ownerAffiliations defaults to [OWNER, COLLABORATOR] and has no "any" value),
+# whereas the REST subscriptions also hold third-party repositories, so they are
+# listed through REST in both paths
+USER_CONNECTIONS = {
+    "followers": "login createdAt",
+    "following": "login createdAt",
+    "starredRepositories": "name owner { login } createdAt",
+}
+
+# Node selections for the connections on a repository
+REPOSITORY_CONNECTIONS = {
+    "stargazers": "login createdAt",
+    "watchers": "login createdAt",
+    "forks": "owner { login } createdAt",
+}
+
+# Repositories as listed by `get_all_repos` (REST type="all" for another user)
+REPOSITORY_ARGUMENTS = "privacy: PUBLIC, ownerAffiliations: [OWNER, COLLABORATOR]"
+
+
+def connection_selection(field: str, nodes: str, paginated: bool = False) -> str:
+    """
+    Build the selection of one page of a connection.
+
+    Args:
+        field (str): The connection field, e.g. "followers".
+        nodes (str): The selection of each node.
+        paginated (bool): Whether to continue after the `$cursor` variable.
+
+    Returns:
+        str: The GraphQL selection.
+    """
+    after = ", after: $cursor" if paginated else ""
+    return f"{field}(first: {CONNECTION_PAGE_SIZE}{after}) {{ {PAGE_INFO} nodes {{ {nodes} }} }}"
+
+
+REPOSITORY_NODE = (
+    "name nameWithOwner isFork createdAt parent { owner { login } } "
+    + " ".join(
+        connection_selection(field, nodes)
+        for field, nodes in REPOSITORY_CONNECTIONS.items()
+    )
+)
+
+PROFILE_QUERY = """
+query Profile($login: String!) {
+  rateLimit { cost }
+  repositoryOwner(login: $login) {
+    __typename
+    login
+    repositories(privacy: PUBLIC, ownerAffiliations: [OWNER]) { totalCount }
+    ... on User { company email location bio websiteUrl }
+    ... on Organization { email location description websiteUrl }
+  }
+}
+"""
+
+# First query of the relations: first page of repositories and of every user connection
+RELATIONS_QUERY = f"""
+query Relations($login: String!) {{
+  rateLimit {{ cost }}
+  repositoryOwner(login: $login) {{
+    repositories(first: {REPOSITORY_PAGE_SIZE}, {REPOSITORY_ARGUMENTS}) {{
+      {PAGE_INFO} nodes {{ {REPOSITORY_NODE} }}
+    }}
+    ... on User {{
+      {" ".join(connection_selection(field, nodes) for field, nodes in USER_CONNECTIONS.items())}
+    }}
+  }}
+}}
+"""
+
+REPOSITORIES_PAGE_QUERY = f"""
+query Repositories($login: String!, $cursor: String) {{
+  rateLimit {{ cost }}
+  repositoryOwner(login: $login) {{
+    repositories(first: {REPOSITORY_PAGE_SIZE}, after: $cursor, {REPOSITORY_ARGUMENTS}) {{
+      {PAGE_INFO} nodes {{ {REPOSITORY_NODE} }}
+    }}
+  }}
+}}
+"""
+
+
+def user_connection_query(field: str) -> str:
+    """
+    Build the query for a further page of a user connection.
+
+    Args:
+        field (str): The connection field, one of USER_CONNECTIONS.
+
+    Returns:
+        str: The GraphQL query, taking `$login` and `$cursor`.
+    """
+    selection = connection_selection(field, USER_CONNECTIONS[field], paginated=True)
+    return f"""
+query UserConnection($login: String!, $cursor: String) {{
+  rateLimit {{ cost }}
+  user(login: $login) {{ {selection} }}
+}}
+"""
+
+
+def repository_connection_query(field: str) -> str:
+    """
+    Build the query for a further page of a repository connection.
+
+    Args:
+        field (str): The connection field, one of REPOSITORY_CONNECTIONS.
+
+    Returns:
+        str: The GraphQL query, taking `$owner`, `$name` and `$cursor`.
+    """
+    selection = connection_selection(
+        field, REPOSITORY_CONNECTIONS[field], paginated=True
+    )
+    return f"""
+query RepositoryConnection($owner: String!, $name: String!, $cursor: String) {{
+  rateLimit {{ cost }}
+  repository(owner: $owner, name: $name) {{ {selection} }}
+}}
+"""
+
+
+#################
+### Reporting ###
+#################
+
+
+@dataclass
+class FetchCostReport:
+    """
+    Compares the cost of fetching a user through GraphQL with the REST path.
+    """
+
+    user_login: str
+    graphql_queries: int = 0
+    graphql_cost: int = 0
+    rest_requests_estimate: int = 0
+
+
+def graphql_date(timestamp: Optional[str]) -> Optional[str]:
+    """
+    Convert a GraphQL DateTime (e.g. "2019-03-01T12:00:00Z") to an ISO date.
+
+    Args:
+        timestamp (Optional[str]): The GraphQL timestamp.
+
+    Returns:
+        Optional[str]: The date as "YYYY-MM-DD", matching the REST records.
+    """
+    return timestamp[:10] if timestamp else None
+
+
+def estimate_rest_requests(
+    repositories: List[dict], user_totals: Dict[str, int], per_page: int = 30
+) -> int:
+    """
+    Estimate the number of REST requests `get_user_info` makes for the same user.
+
+    Counts one request per page (PyGithub lists 30 items per page by default) and
+    the completion request PyGithub makes for every follower, followee, stargazer
+    and watcher when reading `created_at`, and for every fork when reading `parent`.
+
+    Args:
+        repositories (List[dict]): The repository nodes fetched through GraphQL.
+        user_totals (Dict[str, int]): The totalCount of each user connection.
+        per_page (int): The REST page size.
+
+    Returns:
+        int: The estimated number of REST requests.
+    """
+
+    def pages(n: int) -> int:
+        return max(1, math.ceil(n / per_page))
+
+    # Profile and repository listing
+    rest_requests = 1 + pages(len(repositories))
+
+    # Follows, with a completion request per user
+    for field in ["followers", "following"]:
+        total = user_totals.get(field, 0)
+        rest_requests += pages(total) + total
+
+    # Starred repositories (watched repositories are listed through REST either way)
+    rest_requests += pages(user_totals.get("starredRepositories", 0))
+
+    # Per-repository stargazers, watchers and forks
+    for repo in repositories:
+        watchers = repo["watchers"]["totalCount"]
+        rest_requests += pages(watchers) + watchers
+        if repo["isFork"]:
+            rest_requests += 1
+        else:
+            stargazers = repo["stargazers"]["totalCount"]
+            rest_requests += pages(stargazers) + stargazers
+            rest_requests += pages(repo["forks"]["totalCount"])
+
+    return rest_requests
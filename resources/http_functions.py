@@ -0,0 +1,184 @@
+#######################
+### Import Packages ###
+#######################
+
+import requests
+from importlib.metadata import version
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from github import Github
+from github.Requester import HTTPSRequestsConnectionClass
+from typing import Optional, Tuple
+
+# Custom functions
+from resources.cache_functions import ResponseCache
+from resources.ratelimit_functions import RateGovernor
+
+####################
+### HTTP Adapter ###
+####################
+
+
+class GithubHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter mounted on PyGithub's HTTP session.
+
+    With a ResponseCache, GET requests for cached URLs are sent as conditional
+    requests (If-None-Match / If-Modified-Since), and a 304 Not Modified answer is
+    served to PyGithub as the cached 200 response, with the fresh rate limit headers.
+
+    With a RateGovernor, every request waits for its rate limit bucket, every
+    response updates the bucket, and rate limited responses are retried after the
+    governor's backoff.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        governor: Optional[RateGovernor] = None,
+        **kwargs,
+    ):
+        """
+        Initialize the GithubHTTPAdapter.
+
+        Args:
+            cache (Optional[ResponseCache]): The response cache, if any.
+            governor (Optional[RateGovernor]): The rate governor, if any.
+            **kwargs: Passed on to requests' HTTPAdapter (retries, pool sizes).
+        """
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.governor = governor
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.governor is None:
+            return self._send(request, **kwargs)
+
+        token = self.governor.token_of(request.headers.get("Authorization"))
+        resource = self.governor.resource_of(request.url)
+        for attempt in range(self.governor.max_backoffs + 1):
+            self.governor.acquire(token, resource)
+            response = self._send(request, **kwargs)
+            self.governor.update(token, resource, response.headers)
+            if attempt == self.governor.max_backoffs or not (
+                self.governor.is_rate_limited(
+                    response.status_code,
+                    response.headers,
+                    b"" if kwargs.get("stream") else response.content,
+                )
+            ):
+                return response
+            self.governor.backoff(token, response.headers, attempt)
+            response.close()
+        return response
+
+    def _send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.cache is None or request.method != "GET":
+            return super().send(request, **kwargs)
+
+        authorization = request.headers.get("Authorization")
+        accept = request.headers.get("Accept")
+        cached = self.cache.get(request.url, authorization, accept)
+        if cached is not None:
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            self.cache.record(request.url, hit=True)
+            return self._cached_response(request, response, cached.headers, cached.body)
+
+        self.cache.record(request.url, hit=False)
+        if response.status_code == 200 and not kwargs.get("stream"):
+            self.cache.put(
+                request.url,
+                authorization,
+                dict(response.headers),
+                response.content,
+                accept,
+            )
+        return response
+
+    @staticmethod
+    def _cached_response(
+        request: requests.PreparedRequest,
+        not_modified: requests.Response,
+        headers: dict,
+        body: bytes,
+    ) -> requests.Response:
+        """
+        Build a 200 response from the cache, with the headers of the 304 response
+        (rate limits, validators) on top of the cached headers.
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict({**headers, **not_modified.headers})
+        response._content = body
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = getattr(not_modified, "connection", None)
+        response.elapsed = not_modified.elapsed
+        return response
+
+
+# PyGithub versions whose connection class install_http_adapter has been checked
+# against (major, minor), from the version pinned in pyproject.toml
+SUPPORTED_PYGITHUB_VERSIONS = ((2, 6), (2, 10))
+
+
+def pygithub_version() -> Tuple[int, int]:
+    """
+    Get the (major, minor) version of the installed PyGithub.
+    """
+    major, minor = version("PyGithub").split(".")[:2]
+    return int(major), int(minor)
+
+
+def install_http_adapter(github: Github, **adapter_kwargs) -> None:
+    """
+    Mount a GithubHTTPAdapter on the HTTP session of a PyGithub client.
+
+    PyGithub has no public hook for its transport, so the client's connection
+    class is swapped for one that mounts the adapter when it opens its session.
+    The adapter keeps the client's retry policy and pool size, so these are set
+    through `Github(retry=..., pool_size=...)`. As the connection class is private,
+    only the PyGithub versions in SUPPORTED_PYGITHUB_VERSIONS are accepted.
+
+    Args:
+        github (Github): The PyGithub client.
+        **adapter_kwargs: Passed on to GithubHTTPAdapter (e.g. cache, governor).
+
+    Returns:
+        None
+    """
+    lowest, highest = SUPPORTED_PYGITHUB_VERSIONS
+    if not lowest <= pygithub_version() <= highest:
+        raise RuntimeError(
+            f"install_http_adapter supports PyGithub {lowest[0]}.{lowest[1]} to "
+            f"{highest[0]}.{highest[1]}, found {version('PyGithub')}"
+        )
+    requester = github.requester
+    if not hasattr(requester, "_Requester__connectionClass"):
+        raise RuntimeError(
+            f"PyGithub {version('PyGithub')} has no Requester connection class "
+            "to mount the HTTP adapter on"
+        )
+
+    class AdapterConnection(HTTPSRequestsConnectionClass):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.adapter = GithubHTTPAdapter(
+                max_retries=self.retry,
+                pool_connections=self.pool_size,
+                pool_maxsize=self.pool_size,
+                **adapter_kwargs,
+            )
+            self.session.mount("https://", self.adapter)
+
+    requester.close()
+    requester._Requester__connectionClass = AdapterConnection
@@ -8,9 +8,12 @@ import pandas as pd
 from typing import Literal, Optional, List, Tuple
 from pathlib import Path
 import json
-from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
 
+# Custom functions
+from resources.sparse_functions import SparseNetwork
+
 # Paths
 fp_main = Path("/Volumes/SAM-SODAS-DISTRACT/Coding Distraction/github_as_market_device")
 fp_main_output = Path(fp_main / "output")
@@ -29,6 +32,19 @@ with open(fp_main_output / "company_category_map.jsonl", "r") as f:
 SEED = 1704
 
 
+def has_company(company: Optional[str]) -> bool:
+    """
+    Check whether a company value names a company (not None, NaN or empty).
+
+    Args:
+        company (Optional[str]): The company.
+
+    Returns:
+        bool: Whether the company is a node of the company graph.
+    """
+    return bool(pd.notna(company) and company)
+
+
 def calculate_weighted_density(directed_graph: nx.DiGraph) -> float:
     """
     Calculate the weighted density of a directed graph.
@@ -42,13 +58,15 @@ def calculate_weighted_density(directed_graph: nx.DiGraph) -> float:
     Returns:
         float: Weighted density of the graph.
     """
-    graph = directed_graph.copy()
-    graph.remove_edges_from(nx.selfloop_edges(graph))
-
-    number_of_nodes = graph.number_of_nodes()
+    number_of_nodes = directed_graph.number_of_nodes()
     possible_edges = number_of_nodes * (number_of_nodes - 1)
 
-    sum_of_weights = sum(data.get("weight", 1) for u, v, data in graph.edges(data=True))
+    # Skip self-loops instead of copying the graph to remove them
+    sum_of_weights = sum(
+        data.get("weight", 1)
+        for u, v, data in directed_graph.edges(data=True)
+        if u != v
+    )
     weighted_density = sum_of_weights / possible_edges if possible_edges != 0 else 0
 
     return weighted_density
@@ -75,11 +93,41 @@ class Lookup:
         - `self.df`: the provided DataFrame
         - `self.company_category`: the provided mapping
         - `self.users`: set of unique values from the "user_login" column
+        - `self.user_index`: index of the unique user logins (first row per login)
+        - `self.user_company` / `self.user_type`: login -> company / usertype
         """
         self.df = df
         self.company_category = company_category_map
         self.users = set(df["user_login"].unique())
 
+        # Index the first row of every login once, so lookups are O(1)
+        first_rows = df[df["user_login"].notna()].drop_duplicates(
+            subset="user_login", keep="first"
+        )
+        logins = first_rows["user_login"].tolist()
+        companies = (
+            first_rows["inferred_company"].tolist()
+            if "inferred_company" in first_rows
+            else [None] * len(logins)
+        )
+        usertypes = (
+            first_rows["usertype"].tolist()
+            if "usertype" in first_rows
+            else [None] * len(logins)
+        )
+        self.user_index = pd.Index(logins)
+        self.user_company = dict(zip(logins, companies))
+        self.user_type = dict(zip(logins, usertypes))
+
+        # Aligned arrays for `lookup_many`, with a trailing None for unknown logins
+        categories = [
+            self.company_category.get(company) if isinstance(company, str) else None
+            for company in companies
+        ]
+        self._companies = np.array(companies + [None], dtype=object)
+        self._usertypes = np.array(usertypes + [None], dtype=object)
+        self._categories = np.array(categories + [None], dtype=object)
+
     def get_user_company(self, user: Optional[str]) -> Optional[str]:
         """
         Get the company associated with a user. If the user is not found, return None.
@@ -90,10 +138,7 @@ class Lookup:
         Returns:
             Optional[str]: The company associated with the user, or None if not found.
         """
-        if user not in self.users:
-            return None
-        company = self.df.loc[self.df["user_login"] == user, "inferred_company"]
-        return company.values[0] if not company.empty else None
+        return self.user_company.get(user) if user is not None else None
 
     def get_company_category(self, company: Optional[str]) -> Optional[int]:
         """
@@ -117,12 +162,71 @@ class Lookup:
         Returns:
             Optional[str]: The type of user ("User" or "Organization"), or None if not found.
         """
-        if user not in self.users:
-            return None
-        user_type = self.df.loc[self.df["user_login"] == user, "usertype"]
-        if user_type.empty:
-            return None
-        return user_type.values[0] if not user_type.empty else None
+        return self.user_type.get(user) if user is not None else None
+
+    def lookup_many(
+        self, logins: List[Optional[str]] | pd.Series | np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Look up the company, usertype and company category of many users at once.
+
+        Args:
+            logins (List[Optional[str]] | pd.Series | np.ndarray): The user logins.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Object arrays of the companies,
+                usertypes and company categories, aligned with `logins` (None where
+                the user is not found).
+        """
+        positions = self.user_index.get_indexer(pd.Index(logins, dtype=object))
+        return (
+            self._companies[positions],
+            self._usertypes[positions],
+            self._categories[positions],
+        )
+
+
+@dataclass
+class EdgeListDelta:
+    """
+    The result of an incremental edge list update.
+
+    Attributes:
+        added (pd.DataFrame): The edges that were added.
+        removed (pd.DataFrame): The edges that were removed.
+        edge_lists (Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]): The updated
+            edge lists for all, attention and collaboration actions, as
+            `get_edge_lists()` (with the rebuilt edges at the end).
+    """
+
+    added: pd.DataFrame
+    removed: pd.DataFrame
+    edge_lists: Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]
+
+
+def _multiset_difference(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    """
+    Get the rows of `left` not in `right`, counting repeated rows.
+
+    Args:
+        left (pd.DataFrame): The rows to keep from.
+        right (pd.DataFrame): The rows to take away.
+
+    Returns:
+        pd.DataFrame: The remaining rows of `left`.
+    """
+    columns = list(left.columns)
+
+    def numbered(df: pd.DataFrame) -> pd.DataFrame:
+        df = df.reset_index(drop=True).astype(object)
+        df = df.where(df.notna(), None)
+        return df.assign(_n=df.groupby(columns, dropna=False, sort=False).cumcount())
+
+    merged = numbered(left).merge(
+        numbered(right), on=[*columns, "_n"], how="left", indicator=True
+    )
+    remaining = merged[merged["_merge"] == "left_only"]
+    return left.iloc[remaining.index.to_numpy()].reset_index(drop=True)
 
 
 class NetworkEdgeListConstructor:
@@ -158,7 +262,9 @@ class NetworkEdgeListConstructor:
         - `self.edge_types_in`: types of incoming edges
         """
         self.df = df
+        self.company_category_map = company_category_map
         self.lookup = Lookup(df, company_category_map)
+        self._connections: Optional[pd.DataFrame] = None
         self.company_label = self.CATEGORY_LABELS
         self.edge_types_in = ["forks_in", "stars_in", "watches_in", "follows_in"]
         self.edge_types_out = ["forks_out", "stars_out", "watches_out", "follows_out"]
@@ -279,21 +385,374 @@ class NetworkEdgeListConstructor:
 
         return edges
 
+    def _explode_connections(
+        self, direction: Literal["in", "out"], df: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Explode the connection columns of one direction into one row per connection.
+
+        Rows come in the order `_process_edges` visits them: by user, then by
+        edge type, then by position in the connection list.
+
+        Args:
+            direction (Literal["in", "out"]): The direction of the edges to process.
+            df (Optional[pd.DataFrame]): The user rows. Defaults to `self.df`.
+
+        Returns:
+            pd.DataFrame: The user login, action and connection of each connection.
+        """
+        df = self.df if df is None else df
+        edge_types = self.edge_types_in if direction == "in" else self.edge_types_out
+        user_logins = df["user_login"].to_numpy(dtype=object)
+        row_positions = np.arange(len(df))
+
+        frames = []
+        for col_rank, col in enumerate(edge_types):
+            if col not in df.columns:
+                continue
+            connections = pd.Series(
+                df[col].to_numpy(dtype=object), index=row_positions
+            ).explode()
+            connections = connections[connections.map(lambda item: isinstance(item, dict))]
+            positions = connections.index.to_numpy()
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "row": positions,
+                        "col_rank": col_rank,
+                        "user_login": user_logins[positions],
+                        "action": col.split("_")[0],
+                        "connection": connections.to_numpy(dtype=object),
+                    }
+                )
+            )
+
+        if not frames:
+            return pd.DataFrame(
+                columns=["row", "col_rank", "user_login", "action", "connection"]
+            )
+        exploded = pd.concat(frames, ignore_index=True)
+        # Stable sort, keeping the list order of connections within a row and type
+        order = np.lexsort(
+            (exploded["col_rank"].to_numpy(), exploded["row"].to_numpy())
+        )
+        return exploded.iloc[order].reset_index(drop=True)
+
+    def _build_edges_columnar(self) -> pd.DataFrame:
+        """
+        Build the user-level edge list column-wise, equal to the rows built by
+        `_process_edges` for both directions.
+
+        Returns:
+            pd.DataFrame: The user-level edges.
+        """
+        columns = {name: [] for name in ["src", "target", "action", "connection"]}
+        for direction in ["in", "out"]:
+            exploded = self._explode_connections(direction)
+            owners = [item.get("owner_login") for item in exploded["connection"]]
+            logins = exploded["user_login"].tolist()
+            columns["src"] += owners if direction == "in" else logins
+            columns["target"] += logins if direction == "in" else owners
+            columns["action"] += exploded["action"].tolist()
+            columns["connection"] += exploded["connection"].tolist()
+
+        # Drop connections without both users
+        keep = np.array(
+            [bool(src) and bool(target) for src, target in zip(columns["src"], columns["target"])],
+            dtype=bool,
+        )
+        connections = [
+            item for item, kept in zip(columns["connection"], keep) if kept
+        ]
+        return self._join_edge_attributes(
+            np.array(columns["src"], dtype=object)[keep],
+            np.array(columns["target"], dtype=object)[keep],
+            np.array(columns["action"], dtype=object)[keep],
+            np.array([item.get("repo_name") for item in connections], dtype=object),
+            np.array([item.get("created_at") for item in connections], dtype=object),
+        )
+
+    def _join_edge_attributes(
+        self,
+        src: np.ndarray,
+        target: np.ndarray,
+        action: np.ndarray,
+        repo_names: np.ndarray,
+        created_at: np.ndarray,
+    ) -> pd.DataFrame:
+        """
+        Join the usertypes, companies and company categories onto user-level edges,
+        dropping edges without a company at both ends.
+
+        Args:
+            src (np.ndarray): The source logins.
+            target (np.ndarray): The target logins.
+            action (np.ndarray): The actions.
+            repo_names (np.ndarray): The repository names (None for follows).
+            created_at (np.ndarray): The dates of the connections.
+
+        Returns:
+            pd.DataFrame: The user-level edges, with the columns of `_build_edge_dict`.
+        """
+        # Join company, usertype and category through the login index
+        src_company, src_usertype, src_category = self.lookup.lookup_many(src)
+        target_company, target_usertype, target_category = self.lookup.lookup_many(
+            target
+        )
+
+        # Drop edges without a company at both ends
+        keep = np.array(
+            [bool(s) and bool(t) for s, t in zip(src_company, target_company)],
+            dtype=bool,
+        )
+        src, target, action, repo_names, created_at = (
+            src[keep],
+            target[keep],
+            action[keep],
+            repo_names[keep],
+            created_at[keep],
+        )
+        src_company, src_usertype, src_category = (
+            src_company[keep],
+            src_usertype[keep],
+            src_category[keep],
+        )
+        target_company, target_usertype, target_category = (
+            target_company[keep],
+            target_usertype[keep],
+            target_category[keep],
+        )
+
+        d_intra = [int(s == t) for s, t in zip(src_company, target_company)]
+        edges = {
+            "src": src.tolist(),
+            "target": target.tolist(),
+            "src_usertype": src_usertype.tolist(),
+            "target_usertype": target_usertype.tolist(),
+            "src_company": src_company.tolist(),
+            "target_company": target_company.tolist(),
+            "src_company_category": src_category.tolist(),
+            "src_company_label": [
+                self.company_label.get(category, "NA") for category in src_category
+            ],
+            "target_company_category": target_category.tolist(),
+            "target_company_label": [
+                self.company_label.get(category, "NA") for category in target_category
+            ],
+            "d_intra_level": d_intra,
+            "d_inter_level": [1 - d for d in d_intra],
+            "edge_repo": [
+                f"{repo_name}/{src_user}" if repo_name and src_user else None
+                for repo_name, src_user in zip(repo_names, src)
+            ],
+            "action": action.tolist(),
+            "created_at": created_at.tolist(),
+        }
+        # Built from lists, so the dtypes are inferred as from the row-wise records
+        return pd.DataFrame(edges)
+
+    def _build_edges_from_table(self, edge_table: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the user-level edge list by joining the flat edge table written by the
+        scraper (see `edge_functions.read_edge_table`) onto the users of `self.df`.
+
+        Gives the same edges as `_build_edges_columnar` when the edge table holds
+        the relations of the users in `self.df`.
+
+        Args:
+            edge_table (pd.DataFrame): The edge table.
+
+        Returns:
+            pd.DataFrame: The user-level edges.
+        """
+        egos = pd.DataFrame(
+            {
+                "ego_login": self.df["user_login"].to_numpy(dtype=object),
+                "row": np.arange(len(self.df)),
+            }
+        )
+        egos = egos[egos["ego_login"].map(bool, na_action="ignore").fillna(False)]
+        edge_table = edge_table.assign(
+            action=edge_table["action"].astype(str),
+            direction=edge_table["direction"].astype(str),
+        )
+
+        frames = []
+        for direction in ["in", "out"]:
+            edge_types = (
+                self.edge_types_in if direction == "in" else self.edge_types_out
+            )
+            action_rank = {
+                col.split("_")[0]: rank for rank, col in enumerate(edge_types)
+            }
+            edges = egos.merge(
+                edge_table[edge_table["direction"] == direction], on="ego_login"
+            )
+            # Order as `_process_edges`: by user row, then by edge type
+            order = np.lexsort(
+                (edges["action"].map(action_rank).to_numpy(), edges["row"].to_numpy())
+            )
+            frames.append(edges.iloc[order])
+        edges = pd.concat(frames, ignore_index=True)
+
+        # Dates as the "YYYY-MM-DD" strings of the connection columns
+        edges["created_at"] = [
+            date.isoformat() if pd.notna(date) else None
+            for date in edges["created_at"]
+        ]
+        return self._edges_from_connections(edges)
+
+    def _edges_from_connections(self, connections: pd.DataFrame) -> pd.DataFrame:
+        """
+        Turn rows of a connection table (ego, direction, action, counterpart) into
+        user-level edges, joining the user and company attributes.
+
+        Args:
+            connections (pd.DataFrame): The connections, with the columns of the
+                edge table.
+
+        Returns:
+            pd.DataFrame: The user-level edges.
+        """
+        ego = connections["ego_login"].to_numpy(dtype=object)
+        counterpart = connections["counterpart_login"].to_numpy(dtype=object)
+        is_in = (connections["direction"] == "in").to_numpy()
+        # Missing values as None (not NaN), as in the connection columns
+        repo_names, created_at = (
+            connections[col].astype(object).where(connections[col].notna(), None)
+            for col in ["repo_name", "created_at"]
+        )
+        return self._join_edge_attributes(
+            np.where(is_in, counterpart, ego),
+            np.where(is_in, ego, counterpart),
+            connections["action"].to_numpy(dtype=object),
+            repo_names.to_numpy(dtype=object),
+            created_at.to_numpy(dtype=object),
+        )
+
+    def _connection_table(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Flatten the connection columns of user rows into a connection table, with
+        the columns of the edge table (see `edge_functions`), keeping only
+        connections with both users.
+
+        Args:
+            df (pd.DataFrame): The user rows.
+
+        Returns:
+            pd.DataFrame: One row per connection.
+        """
+        frames = []
+        for direction in ["in", "out"]:
+            exploded = self._explode_connections(direction, df)
+            connections = exploded["connection"].tolist()
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "ego_login": exploded["user_login"].to_numpy(dtype=object),
+                        "direction": direction,
+                        "action": exploded["action"].to_numpy(dtype=object),
+                        "counterpart_login": [
+                            item.get("owner_login") for item in connections
+                        ],
+                        "repo_name": [item.get("repo_name") for item in connections],
+                        "created_at": [item.get("created_at") for item in connections],
+                    },
+                    index=pd.RangeIndex(len(exploded)),
+                )
+            )
+        table = pd.concat(frames, ignore_index=True)
+        keep = [
+            bool(ego) and bool(counterpart)
+            for ego, counterpart in zip(table["ego_login"], table["counterpart_login"])
+        ]
+        return table[np.array(keep, dtype=bool)].reset_index(drop=True)
+
+    def update_edge_lists(
+        self, changed_rows: pd.DataFrame, edge_list: pd.DataFrame
+    ) -> "EdgeListDelta":
+        """
+        Update the edge list for new or re-scraped users, without rebuilding it.
+
+        The rows of `changed_rows` replace the rows of the same users in `self.df`
+        (or are added). Only the edges with a changed user at either end are
+        rebuilt: those from the changed users' own connections, and those from
+        other users' connections that point to them, which may gain or lose their
+        company (e.g. when a user's company resolution changed).
+
+        Args:
+            changed_rows (pd.DataFrame): The new or changed user rows.
+            edge_list (pd.DataFrame): The previous edge list of all actions (the
+                first DataFrame of `get_edge_lists()`).
+
+        Returns:
+            EdgeListDelta: The added and removed edges, and the updated edge lists.
+        """
+        changed_users = set(changed_rows["user_login"].dropna())
+        if self._connections is None:
+            self._connections = self._connection_table(self.df)
+
+        # Replace the user rows, and rebuild the company lookup from them
+        kept_rows = ~self.df["user_login"].isin(changed_users).to_numpy()
+        self.df = pd.concat([self.df[kept_rows], changed_rows], ignore_index=True)
+        self.lookup = Lookup(self.df, self.company_category_map)
+
+        connections = self._connections
+        self._connections = pd.concat(
+            [
+                connections[~connections["ego_login"].isin(changed_users)],
+                self._connection_table(changed_rows),
+            ],
+            ignore_index=True,
+        )
+
+        # Rebuild every edge with a changed user at either end
+        connections = self._connections
+        affected = connections["ego_login"].isin(changed_users) | connections[
+            "counterpart_login"
+        ].isin(changed_users)
+        rebuilt = self._edges_from_connections(connections[affected])
+        touched = edge_list["src"].isin(changed_users) | edge_list["target"].isin(
+            changed_users
+        )
+        previous = edge_list[touched]
+
+        user_edges_df = pd.concat([edge_list[~touched], rebuilt], ignore_index=True)
+        return EdgeListDelta(
+            added=_multiset_difference(rebuilt, previous),
+            removed=_multiset_difference(previous, rebuilt),
+            edge_lists=(
+                user_edges_df,
+                user_edges_df[user_edges_df["action"].isin(self.attention_actions)],
+                user_edges_df[
+                    user_edges_df["action"].isin(self.collaboration_actions)
+                ],
+            ),
+        )
+
     def _build_user_level_edgelist(
         self,
+        columnar: bool = False,
+        edge_table: Optional[pd.DataFrame] = None,
     ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """
         Build user-level edge list DataFrames for different action types.
 
         Args:
-            direction (Literal["in", "out"]): The direction of the edges to process.
+            columnar (bool): Whether to build the edges column-wise.
+            edge_table (Optional[pd.DataFrame]): The flat edge table to join instead.
 
         Returns:
-            List[dict]: A list of processed edge dictionaries.
+            Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: DataFrames for all actions, attention actions, and collaboration actions.
         """
-        edges_in = self._process_edges("in")
-        edges_out = self._process_edges("out")
-        user_edges_df = pd.DataFrame(edges_in + edges_out)
+        if edge_table is not None:
+            user_edges_df = self._build_edges_from_table(edge_table)
+        elif columnar:
+            user_edges_df = self._build_edges_columnar()
+        else:
+            edges_in = self._process_edges("in")
+            edges_out = self._process_edges("out")
+            user_edges_df = pd.DataFrame(edges_in + edges_out)
 
         # Subset for attention and collaboration actions
         attention_df = user_edges_df[
@@ -308,14 +767,27 @@ class NetworkEdgeListConstructor:
 
         return user_edges_df, attention_df, collaboration_df
 
-    def get_edge_lists(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    def get_edge_lists(
+        self, columnar: bool = False, edge_table: Optional[pd.DataFrame] = None
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """
         Get user-level edge lists for different action types.
 
+        Args:
+            columnar (bool): Whether to build the edges column-wise (exploding the
+                connection columns and joining through the Lookup index) instead of
+                row by row. Both give the same DataFrames.
+            edge_table (Optional[pd.DataFrame]): The flat edge table written by the
+                scraper (see `edge_functions.read_edge_table`). If given, the edges
+                are built by joining it onto the users instead of unpacking the
+                connection columns.
+
         Returns:
             Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: DataFrames for all actions, attention actions, and collaboration actions.
         """
-        return self._build_user_level_edgelist()
+        return self._build_user_level_edgelist(
+            columnar=columnar, edge_table=edge_table
+        )
 
 
 class GraphConstructor:
@@ -352,8 +824,13 @@ class GraphConstructor:
         else:
             self.df_subset = self.df[self.df["action"].isin(self.collaboration_actions)]
 
-        # Build company-category mapping once on init
+        # Build company-category and user-company mappings once on init
         self.company_category_map = self._build_company_info_map()
+        self.user_to_company = self._build_user_to_company_map()
+        self._user_index = pd.Index(list(self.user_to_company), dtype=object)
+        self._user_companies = np.array(
+            list(self.user_to_company.values()) + [None], dtype=object
+        )
 
     def _build_company_info_map(self) -> dict:
         """
@@ -393,6 +870,93 @@ class GraphConstructor:
 
         return company_info_map
 
+    def _build_user_to_company_map(self) -> dict:
+        """
+        Build a mapping from each user to their company, as last seen in the edge list
+        (rows in order, the source before the target).
+
+        Returns:
+            dict: A mapping of user logins to company names.
+        """
+        users = np.column_stack(
+            [
+                self.df_subset["src"].to_numpy(dtype=object),
+                self.df_subset["target"].to_numpy(dtype=object),
+            ]
+        ).ravel()
+        companies = np.column_stack(
+            [
+                self.df_subset["src_company"].to_numpy(dtype=object),
+                self.df_subset["target_company"].to_numpy(dtype=object),
+            ]
+        ).ravel()
+        # Users in order of first appearance, each with their last seen company
+        last_company = dict(zip(users, companies))
+        first = ~pd.Index(users).duplicated(keep="first")
+        return {user: last_company[user] for user in users[first]}
+
+    def _map_companies(self, users: pd.Series | np.ndarray) -> np.ndarray:
+        """
+        Map users to their companies, with None for users not in the edge list.
+
+        Args:
+            users (pd.Series | np.ndarray): The user logins.
+
+        Returns:
+            np.ndarray: An object array of companies, aligned with `users`.
+        """
+        positions = self._user_index.get_indexer(pd.Index(users, dtype=object))
+        return self._user_companies[positions]
+
+    def _intra_inter_levels(
+        self, src_companies: np.ndarray, tgt_companies: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the intra- and inter-level indicators of user-user edges.
+
+        Edges with a user without a company get 0 for both.
+
+        Args:
+            src_companies (np.ndarray): The companies of the source users.
+            tgt_companies (np.ndarray): The companies of the target users.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The d_intra_level and d_inter_level arrays.
+        """
+        known = np.array(
+            [s is not None and t is not None for s, t in zip(src_companies, tgt_companies)],
+            dtype=bool,
+        )
+        same = np.array(
+            [s == t for s, t in zip(src_companies, tgt_companies)], dtype=bool
+        )
+        return (known & same).astype(int), (known & ~same).astype(int)
+
+    def count_user_edge_actions(self) -> pd.DataFrame:
+        """
+        Count the actions between each pair of users in the edge list.
+
+        Returns:
+            pd.DataFrame: One row per (src, target) pair, in order of first appearance,
+                with a count column per action.
+        """
+        edges = self.df_subset[["src", "target"]].assign(
+            action=self.df_subset["action"].str.lower()
+        )
+        edges = edges[edges["action"].isin(self.all_actions)]
+
+        counts = (
+            edges.groupby(["src", "target", "action"], sort=False)
+            .size()
+            .unstack("action", fill_value=0)
+            .reindex(columns=self.all_actions, fill_value=0)
+        )
+        # Restore the order in which the user pairs first appear
+        pairs = pd.MultiIndex.from_frame(
+            edges[["src", "target"]].drop_duplicates()
+        )
+        return counts.reindex(pairs).reset_index()
+
     def build_user_graph(self) -> nx.DiGraph:
         """
         Build a user-user interaction graph from the edge list DataFrame.
@@ -401,24 +965,21 @@ class GraphConstructor:
             nx.DiGraph: A directed graph representing user-user interactions.
         """
         # Count all occurrences of actions between users (including repeats)
-        edge_action_counts = defaultdict(
-            lambda: {action: 0 for action in self.all_actions}
+        counts = self.count_user_edge_actions()
+        d_intra, d_inter = self._intra_inter_levels(
+            self._map_companies(counts["src"]), self._map_companies(counts["target"])
         )
 
-        for _, row in self.df_subset.iterrows():
-            src = row["src"]
-            tgt = row["target"]
-            action = row["action"].lower()
-            if action not in self.all_actions:
-                continue
-            edge_action_counts[(src, tgt)][action] += 1
+        # weight = 1 means user-user edge exists (unique edges)
+        attributes = counts[self.all_actions].assign(
+            d_intra_level=d_intra, d_inter_level=d_inter
+        )
+        attributes.insert(0, "weight", 1)
 
         G = nx.DiGraph()
-        for (src, tgt), counts in edge_action_counts.items():
-            # weight = 1 means user-user edge exists (unique edges)
-            G.add_edge(src, tgt, weight=1, **counts)
-
-        G = self.annotate_edges_with_intra_inter(G, level="user")
+        G.add_edges_from(
+            zip(counts["src"], counts["target"], attributes.to_dict(orient="records"))
+        )
         return G
 
     def aggregate_to_company_graph(
@@ -434,49 +995,55 @@ class GraphConstructor:
         Returns:
             nx.DiGraph: A directed graph representing company-company interactions.
         """
-        user_to_company = {}
-        for _, row in self.df_subset.iterrows():
-            user_to_company[row["src"]] = row["src_company"]
-            user_to_company[row["target"]] = row["target_company"]
-
-        company_edge_action_counts = defaultdict(
-            lambda: {action: 0 for action in self.all_actions}
+        user_edges = pd.DataFrame(
+            [
+                (u, v, *[data.get(action, 0) for action in actions_to_include])
+                for u, v, data in user_graph.edges(data=True)
+            ],
+            columns=["src", "target", *actions_to_include],
         )
-        company_edge_weights = defaultdict(int)  # counts unique user-user edges
-
-        for src_user, tgt_user, data in user_graph.edges(data=True):
-            src_c = user_to_company.get(src_user)
-            tgt_c = user_to_company.get(tgt_user)
-            if not src_c or not tgt_c:
-                continue
-
-            # Each unique user-user edge counts as 1 interaction (weight)
-            company_edge_weights[(src_c, tgt_c)] += 1
-
-            # Sum the total number of each action over all user-user edges
-            for action in actions_to_include:
-                company_edge_action_counts[(src_c, tgt_c)][action] += data.get(
-                    action, 0
-                )
+        user_edges["src_company"] = self._map_companies(user_edges["src"])
+        user_edges["target_company"] = self._map_companies(user_edges["target"])
+        has_companies = [
+            has_company(s) and has_company(t)
+            for s, t in zip(user_edges["src_company"], user_edges["target_company"])
+        ]
+        user_edges = user_edges[np.array(has_companies, dtype=bool)]
+
+        # Each unique user-user edge counts as 1 interaction (weight), and the
+        # actions are summed over all user-user edges
+        company_edges = (
+            user_edges.groupby(["src_company", "target_company"], sort=False)
+            .agg(
+                weight=("src", "size"),
+                **{action: (action, "sum") for action in actions_to_include},
+            )
+            .reset_index()
+        )
+        company_edges["d_intra_level"] = (
+            company_edges["src_company"] == company_edges["target_company"]
+        ).astype(int)
+        company_edges["d_inter_level"] = 1 - company_edges["d_intra_level"]
 
         G_company = nx.DiGraph()
 
-        # Add nodes first to ensure all companies appear, even isolated ones
-        all_companies = set(user_to_company.values())
+        # Add nodes first to ensure all companies appear, even isolated ones (users
+        # without a company are left out, as in `SparseNetwork.aggregate`)
+        all_companies = {
+            company for company in self.user_to_company.values() if has_company(company)
+        }
         G_company.add_nodes_from(all_companies)
 
         # Add edges with aggregated attributes
-        for (src_c, tgt_c), counts in company_edge_action_counts.items():
-            weight = company_edge_weights.get((src_c, tgt_c), 0)
-            if weight > 0:
-                G_company.add_edge(
-                    src_c,
-                    tgt_c,
-                    weight=weight,
-                    **{a: counts[a] for a in actions_to_include},
-                )
-
-        G_company = self.annotate_edges_with_intra_inter(G_company, level="company")
+        G_company.add_edges_from(
+            zip(
+                company_edges["src_company"],
+                company_edges["target_company"],
+                company_edges.drop(columns=["src_company", "target_company"]).to_dict(
+                    orient="records"
+                ),
+            )
+        )
 
         # Add company_category attribute to nodes
         for node in G_company.nodes:
@@ -502,20 +1069,14 @@ class GraphConstructor:
             nx.DiGraph: The annotated directed graph.
         """
         if level == "user":
-            user_to_company = {}
-            for _, row in self.df_subset.iterrows():
-                user_to_company[row["src"]] = row["src_company"]
-                user_to_company[row["target"]] = row["target_company"]
-
-            for u, v, d in G.edges(data=True):
-                src_c = user_to_company.get(u)
-                tgt_c = user_to_company.get(v)
-                if src_c is None or tgt_c is None:
-                    d["d_intra_level"] = 0
-                    d["d_inter_level"] = 0
-                    continue
-                d["d_intra_level"] = 1 if src_c == tgt_c else 0
-                d["d_inter_level"] = 1 if src_c != tgt_c else 0
+            edges = list(G.edges(data=True))
+            d_intra, d_inter = self._intra_inter_levels(
+                self._map_companies(np.array([u for u, _, _ in edges], dtype=object)),
+                self._map_companies(np.array([v for _, v, _ in edges], dtype=object)),
+            )
+            for (u, v, d), intra, inter in zip(edges, d_intra, d_inter):
+                d["d_intra_level"] = int(intra)
+                d["d_inter_level"] = int(inter)
 
         elif level == "company":
             for u, v, d in G.edges(data=True):
@@ -527,6 +1088,183 @@ class GraphConstructor:
 
         return G
 
+    def apply_edge_delta(
+        self,
+        delta: "EdgeListDelta",
+        user_graph: nx.DiGraph,
+        company_graph: nx.DiGraph,
+    ):
+        """
+        Update a user graph and its company graph (from `build_user_graph()` and
+        `get_graph()`) in place with the edges added and removed by
+        `NetworkEdgeListConstructor.update_edge_lists`.
+
+        Only the user pairs in the delta are touched: their action counts, their
+        intra/inter-level flags, and their contribution to the company edges, which
+        is moved when a user's company changed. The constructor's edge list and
+        user-company mapping are updated to match.
+
+        Args:
+            delta (EdgeListDelta): The edge list update.
+            user_graph (nx.DiGraph): The user graph, updated in place.
+            company_graph (nx.DiGraph): The company graph, updated in place.
+
+        Returns:
+            None
+        """
+        actions = (
+            self.attention_actions
+            if self.graph_type == "attention"
+            else self.collaboration_actions
+        )
+
+        def subset(edges: pd.DataFrame) -> pd.DataFrame:
+            edges = edges.assign(action=edges["action"].str.lower())
+            return edges[edges["action"].isin(actions)]
+
+        added, removed = subset(delta.added), subset(delta.removed)
+        pairs = list(
+            dict.fromkeys(
+                zip(
+                    [*removed["src"], *added["src"]],
+                    [*removed["target"], *added["target"]],
+                )
+            )
+        )
+        old_user_to_company = dict(self.user_to_company)
+
+        def move_company_edge(u, v, user_to_company: dict, sign: int):
+            src_c, tgt_c = user_to_company.get(u), user_to_company.get(v)
+            if not (has_company(src_c) and has_company(tgt_c)):
+                return
+            if not user_graph.has_edge(u, v):
+                return
+            if not company_graph.has_edge(src_c, tgt_c):
+                company_graph.add_edge(
+                    src_c,
+                    tgt_c,
+                    weight=0,
+                    **{action: 0 for action in actions},
+                    d_intra_level=int(src_c == tgt_c),
+                    d_inter_level=int(src_c != tgt_c),
+                )
+            data = company_graph.edges[src_c, tgt_c]
+            data["weight"] += sign
+            for action in actions:
+                data[action] += sign * user_graph.edges[u, v].get(action, 0)
+            if data["weight"] == 0:
+                company_graph.remove_edge(src_c, tgt_c)
+
+        # 1. Take the touched user edges out of the company graph
+        for u, v in pairs:
+            move_company_edge(u, v, old_user_to_company, -1)
+
+        # 2. Update the action counts of the user edges
+        for sign, edges in [(-1, removed), (1, added)]:
+            counts = edges.groupby(["src", "target", "action"], sort=False).size()
+            for (u, v, action), count in counts.items():
+                if not user_graph.has_edge(u, v):
+                    user_graph.add_edge(
+                        u, v, weight=1, **{a: 0 for a in self.all_actions}
+                    )
+                user_graph.edges[u, v][action] += sign * count
+        for u, v in pairs:
+            data = user_graph.edges[u, v]
+            if not any(data.get(action, 0) for action in self.all_actions):
+                user_graph.remove_edge(u, v)
+
+        # 3. Update the company of the touched users (and the company attributes)
+        for company, category, label in zip(
+            [*added["src_company"], *added["target_company"]],
+            [*added["src_company_category"], *added["target_company_category"]],
+            [*added["src_company_label"], *added["target_company_label"]],
+        ):
+            self.company_category_map.setdefault(
+                company, {"category": category, "label": label}
+            )
+        new_companies = dict(
+            zip(
+                [*added["src"], *added["target"]],
+                [*added["src_company"], *added["target_company"]],
+            )
+        )
+        for user in dict.fromkeys([u for pair in pairs for u in pair]):
+            if user in user_graph and user_graph.degree(user) == 0:
+                user_graph.remove_node(user)
+            if user not in user_graph:
+                self.user_to_company.pop(user, None)
+            elif user in new_companies:
+                self.user_to_company[user] = new_companies[user]
+        self._user_index = pd.Index(list(self.user_to_company), dtype=object)
+        self._user_companies = np.array(
+            list(self.user_to_company.values()) + [None], dtype=object
+        )
+
+        # 4. Re-flag the touched user edges and put them back into the company graph
+        remaining = [(u, v) for u, v in pairs if user_graph.has_edge(u, v)]
+        d_intra, d_inter = self._intra_inter_levels(
+            self._map_companies(np.array([u for u, _ in remaining], dtype=object)),
+            self._map_companies(np.array([v for _, v in remaining], dtype=object)),
+        )
+        for (u, v), intra, inter in zip(remaining, d_intra, d_inter):
+            user_graph.edges[u, v]["d_intra_level"] = int(intra)
+            user_graph.edges[u, v]["d_inter_level"] = int(inter)
+            move_company_edge(u, v, self.user_to_company, 1)
+
+        # 5. Company nodes follow the companies of the users in the graph; nodes
+        # new to the graph (also those created by step 4) get their attributes
+        companies = {
+            company
+            for company in self.user_to_company.values()
+            if has_company(company)
+        }
+        company_graph.remove_nodes_from(
+            [node for node in company_graph if node not in companies]
+        )
+        company_graph.add_nodes_from(companies)
+        for node, data in company_graph.nodes(data=True):
+            if "category" not in data:
+                info = self.company_category_map.get(
+                    node, {"category": "NA", "label": "NA"}
+                )
+                data["category"] = info.get("category", "NA")
+                data["label"] = info.get("label", "NA")
+
+        self.df = delta.edge_lists[0]
+        self.df_subset = self.df[self.df["action"].isin(actions)]
+
+    def get_sparse_network(
+        self, level: Literal["user", "company"] = "company"
+    ) -> SparseNetwork:
+        """
+        Build the network on the sparse-matrix backend instead of networkx.
+
+        Args:
+            level (Literal["user", "company"]): The user-level network, or the
+                company-level aggregation of it (as `get_graph()`).
+
+        Returns:
+            SparseNetwork: The network, with one CSR matrix per action.
+        """
+        user_network = SparseNetwork.from_edge_list(self.df_subset, self.all_actions)
+        if level == "user":
+            return user_network
+        elif level != "company":
+            raise ValueError("level must be 'user' or 'company'")
+
+        actions = (
+            self.attention_actions
+            if self.graph_type == "attention"
+            else self.collaboration_actions
+        )
+        return user_network.aggregate(
+            self.user_to_company,
+            actions=actions,
+            group_attributes=pd.DataFrame.from_dict(
+                self.company_category_map, orient="index"
+            ),
+        )
+
     def get_graph(self) -> nx.DiGraph:
         user_graph = self.build_user_graph()
 
@@ -0,0 +1,403 @@
+#######################
+### Import Packages ###
+#######################
+
+import atexit
+import threading
+from dataclasses import asdict, is_dataclass
+from datetime import date
+from pathlib import Path
+from typing import Optional, Dict, List, Iterable, Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+#################
+### Variables ###
+#################
+
+# The eight relation fields of a GithubUser
+RELATION_FIELDS = [
+    "follows_in",
+    "follows_out",
+    "watches_in",
+    "watches_out",
+    "stars_in",
+    "stars_out",
+    "forks_in",
+    "forks_out",
+]
+
+# One entry of a relation field: the repository (if any), the other user and the date
+RELATION_TYPE = pa.list_(
+    pa.struct(
+        [
+            ("repo_name", pa.string()),
+            ("owner_login", pa.string()),
+            ("created_at", pa.date32()),
+        ]
+    )
+)
+
+GITHUB_USER_SCHEMA = pa.schema(
+    [
+        ("user_login", pa.string()),
+        ("search_with_company", pa.string()),
+        ("listed_company", pa.string()),
+        ("inferred_company", pa.list_(pa.string())),
+        ("matched_company_strings", pa.map_(pa.string(), pa.list_(pa.string()))),
+        ("usertype", pa.string()),
+        ("email", pa.string()),
+        ("github_location", pa.string()),
+        ("matched_location", pa.list_(pa.string())),
+        ("bio", pa.string()),
+        ("blog", pa.string()),
+        ("repo_names", pa.list_(pa.string())),
+        *[(field, RELATION_TYPE) for field in RELATION_FIELDS],
+    ]
+)
+
+#################
+### Functions ###
+#################
+
+
+def _to_date(value: Any) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _to_string_list(value: Any) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [value]
+    return [str(item) for item in value]
+
+
+def user_to_row(user: Any) -> Dict[str, Any]:
+    """
+    Convert a GithubUser (or its dict) to a row of `GITHUB_USER_SCHEMA`.
+
+    Single strings in list fields become one-element lists, a list location is
+    joined, and the relation dates ("YYYY-MM-DD" strings) become dates.
+
+    Args:
+        user (Any): The GithubUser, or a dict such as a line of the JSONL output.
+
+    Returns:
+        Dict[str, Any]: The row.
+    """
+    row = dict(asdict(user) if is_dataclass(user) else user)
+    if isinstance(row.get("github_location"), list):
+        row["github_location"] = ", ".join(map(str, row["github_location"]))
+    for field in ["inferred_company", "matched_location", "repo_names"]:
+        row[field] = _to_string_list(row.get(field))
+    if row.get("matched_company_strings") is not None:
+        row["matched_company_strings"] = [
+            (company, _to_string_list(strings))
+            for company, strings in row["matched_company_strings"].items()
+        ]
+    for field in RELATION_FIELDS:
+        entries = row.get(field)
+        row[field] = (
+            None
+            if entries is None
+            else [
+                None
+                if entry is None
+                else {
+                    "repo_name": entry.get("repo_name"),
+                    "owner_login": entry.get("owner_login"),
+                    "created_at": _to_date(entry.get("created_at")),
+                }
+                for entry in entries
+            ]
+        )
+    return {field: row.get(field) for field in GITHUB_USER_SCHEMA.names}
+
+
+def users_to_table(users: Iterable[Any]) -> pa.Table:
+    """
+    Convert GithubUser records to an Arrow table with `GITHUB_USER_SCHEMA`.
+
+    Args:
+        users (Iterable[Any]): The GithubUser records or their dicts.
+
+    Returns:
+        pa.Table: The table.
+    """
+    return pa.Table.from_pylist(
+        [user_to_row(user) for user in users], schema=GITHUB_USER_SCHEMA
+    )
+
+
+def list_parquet_parts(directory: Path, name: str) -> List[Path]:
+    """
+    List the completed part files of a Parquet output, in order.
+
+    Args:
+        directory (Path): The output directory.
+        name (str): The output name, e.g. "first_tier_userinfo".
+
+    Returns:
+        List[Path]: The part files.
+    """
+    return sorted(Path(directory).glob(f"{name}.[0-9][0-9][0-9][0-9][0-9]*.parquet"))
+
+
+def read_users_table(
+    directory: Path, name: str, columns: Optional[List[str]] = None
+) -> pa.Table:
+    """
+    Read all part files of a Parquet output, memory-mapped, as one Arrow table.
+
+    Args:
+        directory (Path): The output directory.
+        name (str): The output name.
+        columns (Optional[List[str]]): The columns to read. Defaults to all.
+
+    Returns:
+        pa.Table: The users.
+    """
+    tables = [
+        pq.read_table(path, columns=columns, memory_map=True)
+        for path in list_parquet_parts(directory, name)
+    ]
+    if not tables:
+        schema = GITHUB_USER_SCHEMA
+        if columns is not None:
+            schema = pa.schema([schema.field(column) for column in columns])
+        return schema.empty_table()
+    return pa.concat_tables(tables)
+
+
+def read_users(
+    directory: Path, name: str, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Read a Parquet output as a DataFrame, shaped like the DataFrame of the JSONL
+    output (company matches as dicts, relations as lists of dicts).
+
+    Args:
+        directory (Path): The output directory.
+        name (str): The output name.
+        columns (Optional[List[str]]): The columns to read. Defaults to all.
+
+    Returns:
+        pd.DataFrame: The users.
+    """
+    return read_users_table(directory, name, columns).to_pandas(
+        maps_as_pydicts="strict"
+    )
+
+
+#######################
+### Parquet Writers ###
+#######################
+
+
+class ParquetUserWriter:
+    """
+    Incremental writer of GithubUser records to Parquet.
+
+    Records are buffered and written as one row group per `row_group_size`
+    records. After `row_groups_per_file` row groups the part file is closed and
+    the next one started, so a crash loses at most the open part. The open part
+    is written under a ".tmp" name and renamed when closed, so readers only see
+    complete files.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        name: str,
+        row_group_size: int = 1000,
+        row_groups_per_file: int = 10,
+        compression: str = "zstd",
+    ):
+        """
+        Initialize the ParquetUserWriter.
+
+        Args:
+            directory (Path): The output directory.
+            name (str): The output name, used as prefix of the part files.
+            row_group_size (int): The number of records per row group.
+            row_groups_per_file (int): The number of row groups per part file.
+            compression (str): The Parquet compression codec.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.row_group_size = row_group_size
+        self.row_groups_per_file = row_groups_per_file
+        self.compression = compression
+
+        existing = list_parquet_parts(self.directory, name)
+        self.part_index = (
+            int(existing[-1].name[len(name) + 1 :].split(".")[0]) + 1 if existing else 0
+        )
+        self.records_written = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._row_groups = 0
+        self._lock = threading.Lock()
+
+    @property
+    def current_part(self) -> Path:
+        return self.directory / f"{self.name}.{self.part_index:05d}.parquet"
+
+    def write(self, user: Any):
+        """
+        Buffer a record, writing a row group once the buffer is full.
+
+        Args:
+            user (Any): The GithubUser, or its dict.
+
+        Returns:
+            None
+        """
+        row = user_to_row(user)
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.row_group_size:
+                self._write_row_group()
+
+    def _write_row_group(self):
+        if not self._buffer:
+            return
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(
+                f"{self.current_part}.tmp",
+                GITHUB_USER_SCHEMA,
+                compression=self.compression,
+            )
+            self._row_groups = 0
+        table = pa.Table.from_pylist(self._buffer, schema=GITHUB_USER_SCHEMA)
+        self._writer.write_table(table, row_group_size=len(self._buffer))
+        self.records_written += len(self._buffer)
+        self._buffer.clear()
+        self._row_groups += 1
+        if self._row_groups >= self.row_groups_per_file:
+            self._close_part()
+
+    def _close_part(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        Path(f"{self.current_part}.tmp").replace(self.current_part)
+        self._writer = None
+        self.part_index += 1
+
+    def flush(self):
+        """
+        Write the buffered records and close the open part file, so every record
+        written so far can be read.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._write_row_group()
+            self._close_part()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetOutput:
+    """
+    The Parquet output of a GithubScraper: one ParquetUserWriter per output name
+    (e.g. "first_tier_userinfo"), created on first use with the same options.
+
+    Buffered records are written out when the interpreter exits, unless the
+    output was closed before.
+    """
+
+    def __init__(self, directory: Path, **writer_options):
+        """
+        Initialize the ParquetOutput.
+
+        Args:
+            directory (Path): The output directory.
+            **writer_options: Passed on to every ParquetUserWriter.
+        """
+        self.directory = Path(directory)
+        self.writer_options = writer_options
+        self.writers: Dict[str, ParquetUserWriter] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def write(self, name: str, user: Any):
+        """
+        Write a record to an output.
+
+        Args:
+            name (str): The output name.
+            user (Any): The GithubUser, or its dict.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if name not in self.writers:
+                self.writers[name] = ParquetUserWriter(
+                    self.directory, name, **self.writer_options
+                )
+        self.writers[name].write(user)
+
+    def close(self):
+        atexit.unregister(self.close)
+        for writer in list(self.writers.values()):
+            writer.close()
+
+    def read(self, name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read an output written so far (flushing it first).
+
+        Args:
+            name (str): The output name.
+            columns (Optional[List[str]]): The columns to read. Defaults to all.
+
+        Returns:
+            pd.DataFrame: The users.
+        """
+        if name in self.writers:
+            self.writers[name].flush()
+        return read_users(self.directory, name, columns)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert_records_to_parquet(
+    records: Iterable[Dict[str, Any]], directory: Path, name: str, **writer_options
+) -> int:
+    """
+    Convert scraped user records, e.g. from `writer_functions.iter_records` over an
+    existing JSONL output, to a Parquet output.
+
+    Args:
+        records (Iterable[Dict[str, Any]]): The user records.
+        directory (Path): The output directory.
+        name (str): The output name.
+        **writer_options: Passed on to the ParquetUserWriter.
+
+    Returns:
+        int: The number of converted records.
+    """
+    with ParquetUserWriter(directory, name, **writer_options) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.records_written
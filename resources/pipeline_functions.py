@@ -0,0 +1,237 @@
+#######################
+### Import Packages ###
+#######################
+
+import queue
+import threading
+import time as time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Marks the end of a stage's input
+_DONE = object()
+
+# How often blocked workers check whether the pipeline was stopped
+_POLL_SECONDS = 0.5
+
+#################
+### Pipelines ###
+#################
+
+
+@dataclass
+class StageStats:
+    """
+    Throughput counters of one pipeline stage.
+    """
+
+    name: str
+    workers: int
+    received: int = 0
+    emitted: int = 0
+    busy_seconds: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record(self, emitted: int, busy_seconds: float):
+        with self._lock:
+            self.received += 1
+            self.emitted += emitted
+            self.busy_seconds += busy_seconds
+
+    @property
+    def dropped(self) -> int:
+        return max(self.received - self.emitted, 0)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """
+        Items emitted per second since the stage started.
+        """
+        elapsed = self.elapsed_seconds
+        return self.emitted / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.name}: {self.received} in, {self.emitted} out, "
+            f"{self.throughput:.2f}/s, {self.busy_seconds:.1f}s busy "
+            f"({self.workers} worker(s))"
+        )
+
+
+class Pipeline:
+    """
+    A chain of concurrent stages connected by bounded queues.
+
+    Every stage maps one input item to any number of output items (its function
+    returns an iterable, e.g. a generator, or None to drop the item) and runs on
+    its own worker threads. The queues between stages hold at most `queue_size`
+    items, so a slow stage holds back the stages before it and memory stays flat.
+    Iterating over the pipeline starts it and yields the output of the last stage
+    as it arrives. An exception in a stage stops the pipeline and is raised to
+    the consumer.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[Any],
+        queue_size: int = 100,
+        on_finish: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initialize the Pipeline.
+
+        Args:
+            source (Iterable[Any]): The input items of the first stage.
+            queue_size (int): The capacity of every queue between stages.
+            on_finish (Optional[Callable[[], None]]): Called once every item has
+                passed through all stages (not if the pipeline failed or the
+                consumer stopped early).
+        """
+        self.source = source
+        self.queue_size = queue_size
+        self.on_finish = on_finish
+        self.stages: List[tuple] = []
+        self.stats: Dict[str, StageStats] = {}
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def stage(
+        self,
+        name: str,
+        func: Callable[[Any], Optional[Iterable[Any]]],
+        workers: int = 1,
+    ) -> "Pipeline":
+        """
+        Append a stage.
+
+        Args:
+            name (str): The stage name, used for its threads and stats.
+            func (Callable[[Any], Optional[Iterable[Any]]]): Maps an item to its
+                output items.
+            workers (int): The number of worker threads.
+
+        Returns:
+            Pipeline: The pipeline, for chaining.
+        """
+        self.stages.append((name, func, workers))
+        self.stats[name] = StageStats(name, workers)
+        return self
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue) -> Any:
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fail(self, err: BaseException):
+        if self._error is None:
+            self._error = err
+        self._stop.set()
+
+    def _feed(self, out_queue: queue.Queue):
+        try:
+            for item in self.source:
+                if not self._put(out_queue, item):
+                    return
+        except Exception as err:
+            self._fail(err)
+        self._put(out_queue, _DONE)
+
+    def _work(
+        self,
+        stats: StageStats,
+        func: Callable,
+        in_queue: queue.Queue,
+        out_queue: queue.Queue,
+        remaining: List[int],
+        lock: threading.Lock,
+    ):
+        while True:
+            item = self._get(in_queue)
+            if item is _DONE:
+                break
+            start = time.monotonic()
+            emitted = 0
+            try:
+                for output in func(item) or ():
+                    emitted += 1
+                    if not self._put(out_queue, output):
+                        break
+            except Exception as err:
+                self._fail(err)
+            stats.record(emitted, time.monotonic() - start)
+
+        # Pass the end marker on to the sibling workers; the last one to finish
+        # passes it on to the next stage
+        self._put(in_queue, _DONE)
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            stats.finished_at = time.monotonic()
+            self._put(out_queue, _DONE)
+
+    def __iter__(self) -> Iterator[Any]:
+        queues = [
+            queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)
+        ]
+        threads = [threading.Thread(target=self._feed, args=(queues[0],), daemon=True)]
+        for i, (name, func, workers) in enumerate(self.stages):
+            stats = self.stats[name]
+            stats.started_at = time.monotonic()
+            remaining, lock = [workers], threading.Lock()
+            threads.extend(
+                threading.Thread(
+                    target=self._work,
+                    args=(stats, func, queues[i], queues[i + 1], remaining, lock),
+                    name=f"pipeline-{name}-{n}",
+                    daemon=True,
+                )
+                for n in range(workers)
+            )
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            # Also stops the workers if the consumer leaves early
+            self._stop.set()
+        if self._error is not None:
+            raise self._error
+        if self.on_finish is not None:
+            self.on_finish()
+
+    def summary(self) -> str:
+        """
+        Get the throughput of every stage, one line per stage.
+
+        Returns:
+            str: The summary.
+        """
+        return "\n".join(stats.summary() for stats in self.stats.values())
@@ -0,0 +1,544 @@
+#######################
+### Import Packages ###
+#######################
+
+from github import Github, GithubRetry
+from github.GithubObject import GithubObject
+import random
+import threading
+import time as time
+from typing import List, Optional, Dict, Tuple, Any, Callable, Mapping
+
+# Request headroom kept back in every bucket, and the burst the pacing allows
+DEFAULT_RESERVES = {"core": 50, "search": 2, "graphql": 100}
+DEFAULT_BURSTS = {"core": 20, "search": 5, "graphql": 10}
+
+#####################
+### Rate Governor ###
+#####################
+
+
+class RateBucket:
+    """
+    The budget of one rate limit bucket ("core", "search" or "graphql") of a token,
+    as last seen in the X-RateLimit-* response headers, with a token bucket that
+    spreads the remaining budget evenly over the time until the reset.
+    """
+
+    def __init__(self, resource: str, reserve: int = 0, burst: int = 10):
+        """
+        Initialize the RateBucket.
+
+        Args:
+            resource (str): The rate limit resource.
+            reserve (int): The headroom that is never spent.
+            burst (int): The number of requests that may be sent back to back.
+        """
+        self.resource = resource
+        self.reserve = reserve
+        self.burst = burst
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset = 0.0
+        self.tokens = float(burst)
+        self.last_refill = time.time()
+
+    def rate(self, now: float) -> Optional[float]:
+        """
+        Get the paced request rate: the spendable budget over the time to the reset.
+
+        Args:
+            now (float): The current timestamp.
+
+        Returns:
+            Optional[float]: Requests per second, or None while the budget is unknown
+                (no headers seen yet, or the window has reset).
+        """
+        if self.remaining is None or self.reset <= now:
+            return None
+        return max(self.remaining - self.reserve, 0) / max(self.reset - now, 1.0)
+
+    def reserve_request(self, now: float) -> float:
+        """
+        Take a request from the bucket.
+
+        Args:
+            now (float): The current timestamp.
+
+        Returns:
+            float: The seconds to wait before sending the request.
+        """
+        rate = self.rate(now)
+        if rate is None:
+            self.tokens, self.last_refill = float(self.burst), now
+            return 0.0
+        if rate == 0:
+            # Budget spent: wait out the window
+            return self.reset - now + 1
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * rate)
+        self.last_refill = now
+        self.tokens -= 1
+        self.remaining -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / rate
+
+    def update(self, limit: int, remaining: int, reset: float):
+        """
+        Update the budget from response headers.
+
+        Responses of concurrent requests can arrive out of order, so within the
+        same window the lowest remaining count wins.
+
+        Args:
+            limit (int): X-RateLimit-Limit.
+            remaining (int): X-RateLimit-Remaining.
+            reset (float): X-RateLimit-Reset.
+
+        Returns:
+            None
+        """
+        if reset == self.reset and self.remaining is not None:
+            remaining = min(remaining, self.remaining)
+        self.limit, self.remaining, self.reset = limit, remaining, reset
+
+
+class RateGovernor:
+    """
+    Paces all GitHub requests from the rate limit headers of the responses.
+
+    Keeps a RateBucket per token and rate limit resource (core, search, GraphQL),
+    updated from the headers of every response at no extra request cost. Before a
+    request is sent, `acquire` waits for the token bucket of its resource, so the
+    budget is spread over the rate limit window instead of spent and then slept
+    off. Secondary rate limits (403/429) pause the token with a jittered,
+    exponential backoff, or for Retry-After seconds if given.
+
+    Used through the HTTP adapter, see `http_functions.install_http_adapter`.
+    """
+
+    def __init__(
+        self,
+        reserves: Optional[Dict[str, int]] = None,
+        bursts: Optional[Dict[str, int]] = None,
+        max_backoffs: int = 5,
+        base_backoff: float = 60.0,
+        max_backoff: float = 900.0,
+        jitter: float = 0.25,
+    ):
+        """
+        Initialize the RateGovernor.
+
+        Args:
+            reserves (Optional[Dict[str, int]]): The headroom kept back per resource.
+            bursts (Optional[Dict[str, int]]): The burst size per resource.
+            max_backoffs (int): The number of times a rate limited request is retried.
+            base_backoff (float): The first backoff after a secondary rate limit
+                without Retry-After, in seconds.
+            max_backoff (float): The longest backoff, in seconds.
+            jitter (float): The random share added to a backoff, so workers that hit
+                the limit together do not retry together.
+        """
+        self.reserves = {**DEFAULT_RESERVES, **(reserves or {})}
+        self.bursts = {**DEFAULT_BURSTS, **(bursts or {})}
+        self.max_backoffs = max_backoffs
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.buckets: Dict[Tuple[str, str], RateBucket] = {}
+        self.paused_until: Dict[str, float] = {}
+        self.wait_seconds: Dict[str, float] = {}
+        self.backoffs = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def token_of(authorization: Optional[str]) -> str:
+        """
+        Get the token from an Authorization header ("token <token>").
+
+        Args:
+            authorization (Optional[str]): The header value.
+
+        Returns:
+            str: The token, or "anonymous".
+        """
+        if not authorization:
+            return "anonymous"
+        return authorization.split()[-1]
+
+    @staticmethod
+    def resource_of(url: str) -> str:
+        """
+        Get the rate limit resource a request URL is counted against.
+
+        Args:
+            url (str): The request URL.
+
+        Returns:
+            str: "search", "graphql" or "core".
+        """
+        path = url.split("://", 1)[-1].split("/", 1)[-1].split("?", 1)[0]
+        if path.startswith("search/"):
+            return "search"
+        if path.startswith("graphql"):
+            return "graphql"
+        return "core"
+
+    def bucket(self, token: str, resource: str) -> RateBucket:
+        """
+        Get the bucket of a token and resource, creating it on first use.
+
+        Args:
+            token (str): The GitHub access token.
+            resource (str): The rate limit resource.
+
+        Returns:
+            RateBucket: The bucket.
+        """
+        key = (token, resource)
+        if key not in self.buckets:
+            self.buckets[key] = RateBucket(
+                resource,
+                reserve=self.reserves.get(resource, 0),
+                burst=self.bursts.get(resource, 10),
+            )
+        return self.buckets[key]
+
+    def budget(
+        self, token: str, resource: str = "core"
+    ) -> Optional[Tuple[int, int, float]]:
+        """
+        Get the last seen budget of a token.
+
+        Args:
+            token (str): The GitHub access token.
+            resource (str): The rate limit resource.
+
+        Returns:
+            Optional[Tuple[int, int, float]]: The remaining requests, limit and reset
+                timestamp, or None if no response of the bucket was seen yet.
+        """
+        with self._lock:
+            bucket = self.bucket(token, resource)
+            if bucket.remaining is None:
+                return None
+            return bucket.remaining, bucket.limit, bucket.reset
+
+    def acquire(self, token: str, resource: str):
+        """
+        Wait until a request of the token may be sent to the resource.
+
+        Args:
+            token (str): The GitHub access token.
+            resource (str): The rate limit resource.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            now = time.time()
+            pause = self.paused_until.get(token, 0.0) - now
+            wait = max(self.bucket(token, resource).reserve_request(now), pause, 0.0)
+            if wait > 0:
+                self.wait_seconds[resource] = (
+                    self.wait_seconds.get(resource, 0.0) + wait
+                )
+        if wait >= 30:
+            wake_up_time = time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.localtime(time.time() + wait)
+            )
+            print(
+                f"[WAIT] {resource} budget paced: sleeping for {wait:.1f}s until {wake_up_time}"
+            )
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(self, token: str, resource: str, headers: Mapping[str, str]):
+        """
+        Update the budget of a token from the rate limit headers of a response.
+
+        Args:
+            token (str): The GitHub access token.
+            resource (str): The resource of the request, used if the response does
+                not name one.
+            headers (Mapping[str, str]): The response headers.
+
+        Returns:
+            None
+        """
+        try:
+            limit = int(headers["X-RateLimit-Limit"])
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset = float(headers["X-RateLimit-Reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        resource = headers.get("X-RateLimit-Resource", resource)
+        with self._lock:
+            self.bucket(token, resource).update(limit, remaining, reset)
+
+    @staticmethod
+    def is_rate_limited(
+        status_code: int, headers: Mapping[str, str], body: bytes
+    ) -> bool:
+        """
+        Check whether a response is a (primary or secondary) rate limit error.
+
+        Args:
+            status_code (int): The response status.
+            headers (Mapping[str, str]): The response headers.
+            body (bytes): The response body.
+
+        Returns:
+            bool: Whether the request should be retried after a backoff.
+        """
+        if status_code == 429:
+            return True
+        if status_code != 403:
+            return False
+        return (
+            "Retry-After" in headers
+            or headers.get("X-RateLimit-Remaining") == "0"
+            or b"rate limit" in body[:2000].lower()
+        )
+
+    def backoff(self, token: str, headers: Mapping[str, str], attempt: int) -> float:
+        """
+        Pause a token after a rate limit error. Every request of the token, in any
+        thread, waits out the pause in `acquire`.
+
+        Args:
+            token (str): The GitHub access token.
+            headers (Mapping[str, str]): The headers of the rate limited response.
+            attempt (int): The number of backoffs of this request so far.
+
+        Returns:
+            float: The backoff, in seconds.
+        """
+        now = time.time()
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            wait = float(retry_after)
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            wait = float(headers.get("X-RateLimit-Reset", now)) - now + 1
+        else:
+            wait = min(self.base_backoff * 2**attempt, self.max_backoff)
+        wait = max(wait, 1.0) * (1 + random.uniform(0, self.jitter))
+        with self._lock:
+            self.backoffs += 1
+            self.paused_until[token] = max(
+                self.paused_until.get(token, 0.0), now + wait
+            )
+        print(f"[WAIT] Rate limited (attempt {attempt + 1}), backing off {wait:.1f}s")
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the pacing statistics.
+
+        Returns:
+            Dict[str, Any]: The seconds waited per resource and the number of backoffs.
+        """
+        with self._lock:
+            return {"wait_seconds": dict(self.wait_seconds), "backoffs": self.backoffs}
+
+
+class GovernedGithubRetry(GithubRetry):
+    """
+    PyGithub's retry policy without the retries of 403 and 429 responses, which are
+    left to the RateGovernor: GithubRetry sleeps on 403 rate limit responses (a
+    fixed 60s for secondary limits) and adds 403 back to `status_forcelist`
+    whenever it is built, and urllib3 retries 429 with a Retry-After header
+    whatever the forcelist. Server errors are retried as before.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False):
+        if status_code in (403, 429):
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+###################
+### Token Pools ###
+###################
+
+
+class TokenPool:
+    """
+    Pool of GitHub access tokens that dispatches on the token with the most headroom.
+
+    Keeps the remaining budget, max rate and reset time of every token, as last seen
+    in the response headers, and hands out one authenticated client per token and
+    thread (PyGithub clients must not be shared between threads).
+    """
+
+    def __init__(
+        self,
+        tokens: List[str],
+        pool_size: int = 10,
+        client_hook: Optional[Callable[[Github], None]] = None,
+        governor: Optional[RateGovernor] = None,
+    ):
+        """
+        Initialize the TokenPool.
+
+        Args:
+            tokens (List[str]): The GitHub access tokens. Empty and duplicate tokens are dropped.
+            pool_size (int): The HTTP connection pool size of each client.
+            client_hook (Optional[Callable[[Github], None]]): Called with every new
+                client, e.g. to install an HTTP adapter on it.
+            governor (Optional[RateGovernor]): The governor pacing the clients. Its
+                core buckets are used as the token budgets, and the clients leave
+                rate limited responses to it (see GovernedGithubRetry).
+        """
+        self.tokens = list(dict.fromkeys(token for token in tokens if token))
+        self.pool_size = pool_size
+        self.client_hook = client_hook
+        self.governor = governor
+        self.budgets: Dict[str, Tuple[int, int, float]] = {}
+        self._thread_local = threading.local()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def label(self, token: str) -> str:
+        """
+        Get a printable label for a token, without revealing the token itself.
+
+        Args:
+            token (str): The GitHub access token.
+
+        Returns:
+            str: A label such as "token 2/3".
+        """
+        return f"token {self.tokens.index(token) + 1}/{len(self.tokens)}"
+
+    @property
+    def active_token(self) -> str:
+        """
+        The token currently used by the calling thread.
+        """
+        return getattr(self._thread_local, "active_token", self.tokens[0])
+
+    @active_token.setter
+    def active_token(self, token: str):
+        self._thread_local.active_token = token
+
+    def client(self, token: Optional[str] = None) -> Github:
+        """
+        Get the calling thread's client for a token, creating it on first use.
+
+        Args:
+            token (Optional[str]): The GitHub access token. Defaults to the active token.
+
+        Returns:
+            Github: The authenticated GitHub instance.
+        """
+        token = token or self.active_token
+        if not hasattr(self._thread_local, "clients"):
+            self._thread_local.clients = {}
+        if token not in self._thread_local.clients:
+            if self.governor is not None:
+                # PyGithub's default retry, with the rate limits left to the governor
+                github = Github(
+                    token,
+                    retry=GovernedGithubRetry(total=10),
+                    pool_size=self.pool_size,
+                )
+            else:
+                github = Github(token, pool_size=self.pool_size)
+            if self.client_hook is not None:
+                self.client_hook(github)
+            self._thread_local.clients[token] = github
+        return self._thread_local.clients[token]
+
+    def record(self, token: Optional[str] = None) -> Tuple[int, int, float]:
+        """
+        Record the budget of a token from its client's latest rate limit headers.
+
+        With a governor, the core bucket is used: PyGithub keeps the headers of the
+        latest response of any bucket, so after a search it reports the search budget.
+
+        Args:
+            token (Optional[str]): The GitHub access token. Defaults to the active token.
+
+        Returns:
+            Tuple[int, int, float]: The remaining requests, max rate and reset timestamp.
+        """
+        token = token or self.active_token
+        budget = self.governor.budget(token) if self.governor is not None else None
+        if budget is not None:
+            with self._lock:
+                self.budgets[token] = budget
+            return budget
+        github = self.client(token)
+        remaining, max_rate = github.rate_limiting
+        budget = (remaining, max_rate, github.rate_limiting_resettime)
+        with self._lock:
+            self.budgets[token] = budget
+        return budget
+
+    def headroom(self, token: str, now: Optional[float] = None) -> int:
+        """
+        Get the number of requests a token can still make.
+
+        A token whose reset time has passed is counted with its full max rate.
+
+        Args:
+            token (str): The GitHub access token.
+            now (Optional[float]): The current timestamp. Defaults to time.time().
+
+        Returns:
+            int: The headroom of the token.
+        """
+        if token not in self.budgets:
+            self.record(token)
+        remaining, max_rate, reset_timestamp = self.budgets[token]
+        now = time.time() if now is None else now
+        return max_rate if reset_timestamp <= now else remaining
+
+    def best_token(self) -> str:
+        """
+        Get the token with the most headroom, preferring the active token on ties.
+
+        Returns:
+            str: The GitHub access token.
+        """
+        now = time.time()
+        active = self.active_token
+        return max(
+            self.tokens,
+            key=lambda token: (self.headroom(token, now), token == active),
+        )
+
+    def earliest_reset(self) -> float:
+        """
+        Get the earliest reset timestamp across all tokens.
+
+        Returns:
+            float: The Unix timestamp of the first token to reset.
+        """
+        for token in self.tokens:
+            if token not in self.budgets:
+                self.record(token)
+        return min(self.budgets[token][2] for token in self.tokens)
+
+
+def rebind_github_objects(values: Any, github: Github) -> None:
+    """
+    Point PyGithub objects (or lists of them) at another client.
+
+    Objects fetched with one token keep making their lazy and paginated calls with
+    that token. Rebinding makes subsequent calls on them use the given client.
+
+    Args:
+        values (Any): An iterable of arguments, possibly PyGithub objects or lists of them.
+        github (Github): The client to bind the objects to.
+
+    Returns:
+        None
+    """
+    for value in values:
+        if isinstance(value, GithubObject):
+            value._requester = github.requester
+        elif isinstance(value, list) and value and isinstance(value[0], GithubObject):
+            for item in value:
+                item._requester = github.requester
@@ -0,0 +1,116 @@
+#######################
+### Import Packages ###
+#######################
+
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+#################
+### Variables ###
+#################
+
+# GitHub search returns at most 1,000 results per query
+SEARCH_RESULT_CAP = 1000
+
+# Retries of a shard search after a transient error, with a doubling backoff (seconds)
+SEARCH_RETRIES = 3
+SEARCH_RETRY_BACKOFF = 10.0
+
+# No GitHub account is older than this
+GITHUB_START = date(2008, 1, 1)
+
+#####################
+### Search Shards ###
+#####################
+
+
+@dataclass(frozen=True)
+class SearchShard:
+    """
+    A user search query, split into the part that is kept (the company terms and
+    other qualifiers) and the parts that can be narrowed to get under the result
+    cap: the location qualifiers, the account creation dates and the followers.
+    """
+
+    terms: str
+    locations: Tuple[str, ...] = ()
+    created: Optional[Tuple[date, date]] = None
+    followers: Optional[Tuple[int, Optional[int]]] = None
+
+    @classmethod
+    def from_query(cls, query: str) -> "SearchShard":
+        """
+        Parse a search query such as `f"{company_query} {filter_string}"`.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            SearchShard: The unsplit shard.
+        """
+        terms, locations = [], []
+        for term in query.split(" "):
+            if term.startswith("location:"):
+                locations.append(term[len("location:") :])
+            elif term:
+                terms.append(term)
+        return cls(" ".join(terms), tuple(locations))
+
+    @property
+    def query(self) -> str:
+        """
+        The search query of the shard.
+        """
+        parts = [self.terms, *(f"location:{location}" for location in self.locations)]
+        if self.created is not None:
+            start, end = self.created
+            parts.append(f"created:{start.isoformat()}..{end.isoformat()}")
+        if self.followers is not None:
+            low, high = self.followers
+            parts.append(
+                f"followers:>={low}" if high is None else f"followers:{low}..{high}"
+            )
+        return " ".join(part for part in parts if part)
+
+    def split(self, today: Optional[date] = None) -> List["SearchShard"]:
+        """
+        Split the shard into narrower shards that together cover its results.
+
+        Several location qualifiers are split into one shard each (a user matching
+        several appears in several shards). Then the creation date range is halved,
+        down to single days, and then the followers range.
+
+        Args:
+            today (Optional[date]): The end of the creation date range. Defaults to
+                today.
+
+        Returns:
+            List[SearchShard]: The narrower shards, or an empty list if the shard
+                cannot be split any further.
+        """
+        if len(self.locations) > 1:
+            return [replace(self, locations=(location,)) for location in self.locations]
+
+        start, end = self.created or (GITHUB_START, today or date.today())
+        if start < end:
+            middle = start + timedelta(days=(end - start).days // 2)
+            return [
+                replace(self, created=(start, middle)),
+                replace(self, created=(middle + timedelta(days=1), end)),
+            ]
+
+        low, high = self.followers or (0, None)
+        if high is None:
+            middle = 2 * low + 10
+            return [
+                replace(self, followers=(low, middle)),
+                replace(self, followers=(middle + 1, None)),
+            ]
+        if low < high:
+            middle = (low + high) // 2
+            return [
+                replace(self, followers=(low, middle)),
+                replace(self, followers=(middle + 1, high)),
+            ]
+        return []
@@ -0,0 +1,323 @@
+#######################
+### Import Packages ###
+#######################
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from typing import Literal, Optional, List, Dict
+
+# Actions of the user-level edge lists
+ATTENTION_ACTIONS = ["follows", "stars", "watches"]
+COLLABORATION_ACTIONS = ["forks"]
+
+######################
+### Sparse Network ###
+######################
+
+
+class SparseNetwork:
+    """
+    A directed network stored as one scipy CSR matrix per action.
+
+    Nodes have integer ids (the row/column positions) and a label table mapping
+    the ids to node labels (user logins or company names) and node attributes.
+    The `weights` matrix holds the edge weights: 1 per user pair with any action
+    at user level, and the number of such user pairs at company level.
+    """
+
+    def __init__(
+        self,
+        labels: pd.Index,
+        matrices: Dict[str, sp.csr_matrix],
+        weights: Optional[sp.csr_matrix] = None,
+        node_attributes: Optional[pd.DataFrame] = None,
+    ):
+        """
+        Initialize the SparseNetwork.
+
+        Args:
+            labels (pd.Index): The node label of each node id.
+            matrices (Dict[str, sp.csr_matrix]): The action count matrix of each action.
+            weights (Optional[sp.csr_matrix]): The edge weights. Defaults to 1 for every
+                node pair with at least one action.
+            node_attributes (Optional[pd.DataFrame]): Node attributes, indexed by node id.
+        """
+        self.labels = pd.Index(labels)
+        self.matrices = {action: sp.csr_matrix(m) for action, m in matrices.items()}
+        if weights is None:
+            weights = self.binary(self.total())
+        self.weights = sp.csr_matrix(weights)
+        self.node_attributes = (
+            node_attributes
+            if node_attributes is not None
+            else pd.DataFrame(index=pd.RangeIndex(len(self.labels)))
+        )
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.labels)
+
+    @property
+    def label_table(self) -> pd.DataFrame:
+        """
+        The node ids with their labels and attributes.
+        """
+        table = self.node_attributes.copy()
+        table.insert(0, "node", self.labels.to_numpy())
+        return table.rename_axis("node_id")
+
+    @staticmethod
+    def binary(matrix: sp.csr_matrix) -> sp.csr_matrix:
+        """
+        Get the 0/1 pattern of a matrix.
+
+        Args:
+            matrix (sp.csr_matrix): The matrix.
+
+        Returns:
+            sp.csr_matrix: 1 wherever the matrix is non-zero.
+        """
+        matrix = sp.csr_matrix(matrix, copy=True)
+        matrix.eliminate_zeros()
+        matrix.data = np.ones_like(matrix.data, dtype=np.int64)
+        return matrix
+
+    def total(self, actions: Optional[List[str]] = None) -> sp.csr_matrix:
+        """
+        Sum the action count matrices.
+
+        Args:
+            actions (Optional[List[str]]): The actions to sum. Defaults to all.
+
+        Returns:
+            sp.csr_matrix: The summed action counts.
+        """
+        actions = list(self.matrices) if actions is None else actions
+        n = self.number_of_nodes
+        total = sp.csr_matrix((n, n), dtype=np.int64)
+        for action in actions:
+            total = total + self.matrices[action]
+        return total
+
+    @classmethod
+    def from_edge_list(
+        cls,
+        edge_list_df: pd.DataFrame,
+        actions: Optional[List[str]] = None,
+    ) -> "SparseNetwork":
+        """
+        Build the user-level network from an edge list (see `get_edge_lists()`).
+
+        Args:
+            edge_list_df (pd.DataFrame): The edge list, with "src", "target" and "action".
+            actions (Optional[List[str]]): The actions to keep. Defaults to all four.
+
+        Returns:
+            SparseNetwork: The user-level network.
+        """
+        actions = actions or ATTENTION_ACTIONS + COLLABORATION_ACTIONS
+        edges = edge_list_df[edge_list_df["action"].str.lower().isin(actions)]
+
+        # Integer node ids, in order of first appearance
+        codes, labels = pd.factorize(
+            np.column_stack(
+                [
+                    edges["src"].to_numpy(dtype=object),
+                    edges["target"].to_numpy(dtype=object),
+                ]
+            ).ravel()
+        )
+        src_ids, target_ids = codes[0::2], codes[1::2]
+        n = len(labels)
+
+        action_values = edges["action"].str.lower().to_numpy()
+        matrices = {}
+        for action in actions:
+            mask = action_values == action
+            matrices[action] = sp.coo_matrix(
+                (np.ones(mask.sum(), dtype=np.int64), (src_ids[mask], target_ids[mask])),
+                shape=(n, n),
+            ).tocsr()  # Duplicate entries are summed
+
+        return cls(pd.Index(labels), matrices)
+
+    @classmethod
+    def from_networkx(
+        cls, graph: nx.DiGraph, actions: Optional[List[str]] = None
+    ) -> "SparseNetwork":
+        """
+        Convert a networkx graph (e.g. from `GraphConstructor`) to a SparseNetwork.
+
+        Args:
+            graph (nx.DiGraph): The graph, with an attribute per action and a weight.
+            actions (Optional[List[str]]): The action attributes. Defaults to all four.
+
+        Returns:
+            SparseNetwork: The network, with the node attributes as label table.
+        """
+        actions = actions or ATTENTION_ACTIONS + COLLABORATION_ACTIONS
+        labels = pd.Index(list(graph.nodes), dtype=object)
+        n = len(labels)
+
+        edges = list(graph.edges(data=True))
+        rows = labels.get_indexer([u for u, _, _ in edges])
+        cols = labels.get_indexer([v for _, v, _ in edges])
+
+        def matrix(attribute: str, default: int) -> sp.csr_matrix:
+            values = np.array(
+                [data.get(attribute, default) for _, _, data in edges], dtype=np.int64
+            )
+            return sp.coo_matrix((values, (rows, cols)), shape=(n, n)).tocsr()
+
+        node_attributes = pd.DataFrame(
+            [data for _, data in graph.nodes(data=True)], index=pd.RangeIndex(n)
+        )
+        return cls(
+            labels,
+            {action: matrix(action, 0) for action in actions},
+            weights=matrix("weight", 1),
+            node_attributes=node_attributes,
+        )
+
+    def to_networkx(self, actions: Optional[List[str]] = None) -> nx.DiGraph:
+        """
+        Convert to a networkx graph, e.g. for plotting with NetworkVisualizer.
+
+        Edges get the weight, the count of each action, and the intra/inter-level
+        indicators (self-loops are intra-level); nodes get the label table attributes.
+
+        Args:
+            actions (Optional[List[str]]): The actions to include. Defaults to all.
+
+        Returns:
+            nx.DiGraph: The graph, with the node labels as nodes.
+        """
+        actions = list(self.matrices) if actions is None else actions
+        weights = self.weights.tocoo()
+        action_counts = {
+            action: np.asarray(self.matrices[action][weights.row, weights.col]).ravel()
+            for action in actions
+        }
+
+        G = nx.DiGraph()
+        labels = self.labels.to_numpy()
+        G.add_nodes_from(
+            zip(labels, self.node_attributes.to_dict(orient="records"))
+        )
+        G.add_edges_from(
+            (
+                labels[u],
+                labels[v],
+                {
+                    "weight": int(weight),
+                    **{action: int(action_counts[action][i]) for action in actions},
+                    "d_intra_level": int(u == v),
+                    "d_inter_level": int(u != v),
+                },
+            )
+            for i, (u, v, weight) in enumerate(
+                zip(weights.row, weights.col, weights.data)
+            )
+        )
+        return G
+
+    def aggregate(
+        self,
+        node_groups: Dict[str, str] | pd.Series,
+        actions: Optional[List[str]] = None,
+        group_attributes: Optional[pd.DataFrame] = None,
+    ) -> "SparseNetwork":
+        """
+        Aggregate the network to groups of nodes, e.g. users to companies.
+
+        With the node x group indicator matrix M, the group-level matrices are
+        M^T A M: the action counts are summed, and the weights count the node
+        pairs (unique user-user edges) between two groups. Nodes without a group
+        are left out.
+
+        Args:
+            node_groups (Dict[str, str] | pd.Series): The group of each node label.
+            actions (Optional[List[str]]): The actions to aggregate. Defaults to all.
+            group_attributes (Optional[pd.DataFrame]): Attributes of the groups, indexed
+                by group label (e.g. company category and label).
+
+        Returns:
+            SparseNetwork: The group-level network.
+        """
+        actions = list(self.matrices) if actions is None else actions
+        groups = pd.Series(node_groups, dtype=object).reindex(self.labels)
+        has_group = np.array([pd.notna(g) and bool(g) for g in groups], dtype=bool)
+        group_codes, group_labels = pd.factorize(groups[has_group])
+        indicator = sp.csr_matrix(
+            (
+                np.ones(len(group_codes), dtype=np.int64),
+                (np.flatnonzero(has_group), group_codes),
+            ),
+            shape=(self.number_of_nodes, len(group_labels)),
+        )
+
+        def aggregate_matrix(matrix: sp.csr_matrix) -> sp.csr_matrix:
+            return (indicator.T @ matrix @ indicator).tocsr()
+
+        # Only user pairs with one of the included actions count towards the weight
+        weights = self.weights.multiply(self.binary(self.total(actions)))
+
+        node_attributes = None
+        if group_attributes is not None:
+            node_attributes = group_attributes.reindex(group_labels).reset_index(
+                drop=True
+            )
+        return SparseNetwork(
+            pd.Index(group_labels),
+            {action: aggregate_matrix(self.matrices[action]) for action in actions},
+            weights=aggregate_matrix(sp.csr_matrix(weights)),
+            node_attributes=node_attributes,
+        )
+
+    def weighted_density(self) -> float:
+        """
+        Calculate the weighted density, as `calculate_weighted_density` on the
+        networkx graph (both leave out nodes without a group).
+
+        Weighted density = sum of edge weights / number of possible directed edges (n*(n-1)),
+        with self-loops excluded.
+
+        Returns:
+            float: Weighted density of the network.
+        """
+        n = self.number_of_nodes
+        possible_edges = n * (n - 1)
+        if possible_edges == 0:
+            return 0
+        sum_of_weights = self.weights.sum() - self.weights.diagonal().sum()
+        return sum_of_weights / possible_edges
+
+    def degree(
+        self,
+        direction: Literal["in", "out", "all"] = "all",
+        weighted: bool = False,
+    ) -> pd.Series:
+        """
+        Get the degree of every node.
+
+        Args:
+            direction (Literal["in", "out", "all"]): In-, out- or total degree.
+            weighted (bool): Whether to sum the edge weights instead of counting edges.
+
+        Returns:
+            pd.Series: The degree, indexed by node label.
+        """
+        matrix = self.weights if weighted else self.binary(self.weights)
+        out_degree = np.asarray(matrix.sum(axis=1)).ravel()
+        in_degree = np.asarray(matrix.sum(axis=0)).ravel()
+        if direction == "out":
+            degree = out_degree
+        elif direction == "in":
+            degree = in_degree
+        elif direction == "all":
+            degree = out_degree + in_degree
+        else:
+            raise ValueError("Invalid direction specified. Use 'in', 'out', or 'all'.")
+        return pd.Series(degree, index=self.labels, name="degree")
@@ -0,0 +1,740 @@
+#######################
+### Import Packages ###
+#######################
+
+import json
+import sqlite3
+import threading
+import time as time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Literal, Optional, Dict, List, Iterable, Iterator, Tuple
+
+UserStatus = Literal["queued", "attempted", "scraped", "rejected", "failed"]
+CompanyStatus = Literal["queued", "scraped", "failed"]
+RelationStatus = Literal["done", "failed"]
+
+USER_STATUSES = ("queued", "attempted", "scraped", "rejected", "failed")
+
+# Statuses of users the scraper has already dealt with (not to be scraped again)
+PROCESSED_STATUSES = ("attempted", "scraped", "rejected", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    login TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    tier INTEGER,
+    company TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    queued_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_status ON users (status, queued_at);
+CREATE TABLE IF NOT EXISTS companies (
+    name TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS relations (
+    login TEXT NOT NULL,
+    relation TEXT NOT NULL,
+    status TEXT NOT NULL,
+    items INTEGER,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (login, relation)
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    login TEXT PRIMARY KEY,
+    tier INTEGER NOT NULL,
+    company TEXT,
+    ties INTEGER NOT NULL DEFAULT 0,
+    dk_hint INTEGER NOT NULL DEFAULT 0,
+    score REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS frontier_score ON frontier (score DESC);
+"""
+
+# Score weights of the frontier: per tie, per DK hint (+1 / -1) and per tier
+DEFAULT_FRONTIER_WEIGHTS = (1.0, 5.0, 0.5)
+
+###################
+### State Store ###
+###################
+
+
+class CrawlState:
+    """
+    Transactional store (SQLite, WAL mode) of the crawl progress: the status of
+    every user and company, and the relations fetched per user.
+
+    Every change is committed straight away, so a crashed crawl resumes from the
+    database as it is. Several scraper processes can share the database: each
+    process opens its own connection, and writes take the database lock up front
+    (BEGIN IMMEDIATE), waiting up to `timeout` seconds for other writers. Within a
+    process, threads share the connection behind a lock.
+    """
+
+    def __init__(self, path: Path, timeout: float = 30.0, synchronous: str = "NORMAL"):
+        """
+        Initialize the CrawlState.
+
+        Args:
+            path (Path): The SQLite database file. Created if missing.
+            timeout (float): Seconds to wait for another process holding the write lock.
+            synchronous (str): The SQLite synchronous setting. "NORMAL" survives a
+                crash of the process; "FULL" also survives a power loss.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={synchronous}")
+        with self._transaction() as connection:
+            # One statement at a time, as executescript() would commit the transaction
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    connection.execute(statement)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def _query(self, sql: str, parameters: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    #############
+    ### Users ###
+    #############
+
+    def queue_users(self, logins: Iterable[str], tier: Optional[int] = None) -> int:
+        """
+        Add users to the queue, leaving users the store already knows untouched.
+
+        Args:
+            logins (Iterable[str]): The logins of the users.
+            tier (Optional[int]): The tier the users belong to.
+
+        Returns:
+            int: The number of newly queued users.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO users (login, status, tier, queued_at, updated_at) "
+                "VALUES (?, 'queued', ?, ?, ?)",
+                ((login, tier, now, now) for login in logins),
+            )
+            return connection.total_changes - before
+
+    def set_user_status(
+        self,
+        login: str,
+        status: UserStatus,
+        error: Optional[str] = None,
+        company: Optional[str] = None,
+        tier: Optional[int] = None,
+    ):
+        """
+        Set the status of a user, adding the user if needed.
+
+        Args:
+            login (str): The login of the user.
+            status (UserStatus): The new status.
+            error (Optional[str]): The error, for failed users.
+            company (Optional[str]): The inferred company, kept if not given.
+            tier (Optional[int]): The tier of the user, kept if not given.
+
+        Returns:
+            None
+        """
+        if status not in USER_STATUSES:
+            raise ValueError(f"Invalid user status: {status}")
+        now = time.time()
+        attempts = int(status == "attempted")
+        with self._transaction() as connection:
+            connection.execute(
+                """
+                INSERT INTO users
+                    (login, status, tier, company, error, attempts, queued_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (login) DO UPDATE SET
+                    status = excluded.status,
+                    tier = COALESCE(excluded.tier, tier),
+                    company = COALESCE(excluded.company, company),
+                    error = excluded.error,
+                    attempts = attempts + excluded.attempts,
+                    updated_at = excluded.updated_at
+                """,
+                (login, status, tier, company, error, attempts, now, now),
+            )
+
+    def mark_attempted(self, login: str):
+        """
+        Mark a user as attempted, unless the user already has a final status.
+
+        Args:
+            login (str): The login of the user.
+
+        Returns:
+            None
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                """
+                INSERT INTO users (login, status, attempts, queued_at, updated_at)
+                VALUES (?, 'attempted', 1, ?, ?)
+                ON CONFLICT (login) DO UPDATE SET
+                    status = 'attempted',
+                    attempts = attempts + 1,
+                    updated_at = excluded.updated_at
+                WHERE status = 'queued'
+                """,
+                (login, now, now),
+            )
+
+    def user_status(self, login: str) -> Optional[str]:
+        """
+        Get the status of a user (a primary key lookup).
+
+        Args:
+            login (str): The login of the user.
+
+        Returns:
+            Optional[str]: The status, or None if the user is unknown.
+        """
+        rows = self._query("SELECT status FROM users WHERE login = ?", (login,))
+        return rows[0][0] if rows else None
+
+    def user(self, login: str) -> Optional[Dict]:
+        """
+        Get the full record of a user.
+
+        Args:
+            login (str): The login of the user.
+
+        Returns:
+            Optional[Dict]: The user's status, tier, company, error, attempts and
+                timestamps, or None if the user is unknown.
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "SELECT * FROM users WHERE login = ?", (login,)
+            )
+            row = cursor.fetchone()
+            columns = [column[0] for column in cursor.description]
+        return dict(zip(columns, row)) if row else None
+
+    def users_with_status(self, *statuses: str) -> List[str]:
+        """
+        Get the logins of the users with any of the given statuses.
+
+        Args:
+            *statuses (str): The statuses.
+
+        Returns:
+            List[str]: The logins, in queue order.
+        """
+        placeholders = ", ".join("?" for _ in statuses)
+        rows = self._query(
+            f"SELECT login FROM users WHERE status IN ({placeholders}) ORDER BY queued_at",
+            statuses,
+        )
+        return [login for (login,) in rows]
+
+    def claim_users(self, n: int = 1, tier: Optional[int] = None) -> List[str]:
+        """
+        Take queued users off the queue and mark them as attempted, atomically, so
+        concurrent scraper processes never claim the same user.
+
+        Args:
+            n (int): The maximum number of users to claim.
+            tier (Optional[int]): Only claim users of this tier.
+
+        Returns:
+            List[str]: The claimed logins, in queue order.
+        """
+        now = time.time()
+        tier_clause = "" if tier is None else "AND tier = ?"
+        parameters = (n,) if tier is None else (tier, n)
+        with self._transaction() as connection:
+            logins = [
+                login
+                for (login,) in connection.execute(
+                    f"SELECT login FROM users WHERE status = 'queued' {tier_clause} "
+                    "ORDER BY queued_at LIMIT ?",
+                    parameters,
+                )
+            ]
+            connection.executemany(
+                "UPDATE users SET status = 'attempted', attempts = attempts + 1, "
+                "updated_at = ? WHERE login = ?",
+                ((now, login) for login in logins),
+            )
+        return logins
+
+    def requeue_users(
+        self, status: UserStatus = "attempted", older_than: float = 0
+    ) -> int:
+        """
+        Put users back on the queue, e.g. those left attempted by a crashed process.
+
+        Args:
+            status (UserStatus): The status of the users to requeue.
+            older_than (float): Only requeue users not updated for this many seconds.
+
+        Returns:
+            int: The number of requeued users.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            return connection.execute(
+                "UPDATE users SET status = 'queued', updated_at = ? "
+                "WHERE status = ? AND updated_at <= ?",
+                (now, status, now - older_than),
+            ).rowcount
+
+    def count_users(self, *statuses: str) -> int:
+        """
+        Count the users with any of the given statuses (all users if none are given).
+
+        Args:
+            *statuses (str): The statuses.
+
+        Returns:
+            int: The number of users.
+        """
+        if not statuses:
+            return self._query("SELECT COUNT(*) FROM users")[0][0]
+        placeholders = ", ".join("?" for _ in statuses)
+        return self._query(
+            f"SELECT COUNT(*) FROM users WHERE status IN ({placeholders})", statuses
+        )[0][0]
+
+    def user_counts(self) -> Dict[str, int]:
+        """
+        Count the users per status.
+
+        Returns:
+            Dict[str, int]: The number of users by status.
+        """
+        rows = self._query("SELECT status, COUNT(*) FROM users GROUP BY status")
+        return dict(rows)
+
+    #################
+    ### Companies ###
+    #################
+
+    def set_company_status(
+        self, name: str, status: CompanyStatus, error: Optional[str] = None
+    ):
+        """
+        Set the status of a company, adding the company if needed.
+
+        Args:
+            name (str): The company label.
+            status (CompanyStatus): The new status.
+            error (Optional[str]): The error, for failed companies.
+
+        Returns:
+            None
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO companies (name, status, error, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET status = excluded.status, "
+                "error = excluded.error, updated_at = excluded.updated_at",
+                (name, status, error, time.time()),
+            )
+
+    def company_status(self, name: str) -> Optional[str]:
+        """
+        Get the status of a company.
+
+        Args:
+            name (str): The company label.
+
+        Returns:
+            Optional[str]: The status, or None if the company is unknown.
+        """
+        rows = self._query("SELECT status FROM companies WHERE name = ?", (name,))
+        return rows[0][0] if rows else None
+
+    def companies_with_status(self, *statuses: str) -> List[str]:
+        placeholders = ", ".join("?" for _ in statuses)
+        rows = self._query(
+            f"SELECT name FROM companies WHERE status IN ({placeholders})", statuses
+        )
+        return [name for (name,) in rows]
+
+    def count_companies(self, *statuses: str) -> int:
+        placeholders = ", ".join("?" for _ in statuses)
+        return self._query(
+            f"SELECT COUNT(*) FROM companies WHERE status IN ({placeholders})", statuses
+        )[0][0]
+
+    #################
+    ### Relations ###
+    #################
+
+    def set_relation_progress(
+        self,
+        login: str,
+        relation: str,
+        status: RelationStatus = "done",
+        items: Optional[int] = None,
+        error: Optional[str] = None,
+    ):
+        """
+        Record that a relation (e.g. "follows_in") of a user was fetched.
+
+        Args:
+            login (str): The login of the user.
+            relation (str): The relation.
+            status (RelationStatus): "done" or "failed".
+            items (Optional[int]): The number of items fetched.
+            error (Optional[str]): The error, for failed relations.
+
+        Returns:
+            None
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO relations "
+                "(login, relation, status, items, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (login, relation, status, items, error, time.time()),
+            )
+
+    def relation_progress(self, login: str) -> Dict[str, Dict]:
+        """
+        Get the fetched relations of a user.
+
+        Args:
+            login (str): The login of the user.
+
+        Returns:
+            Dict[str, Dict]: The status, item count and error by relation.
+        """
+        rows = self._query(
+            "SELECT relation, status, items, error FROM relations WHERE login = ?",
+            (login,),
+        )
+        return {
+            relation: {"status": status, "items": items, "error": error}
+            for relation, status, items, error in rows
+        }
+
+    ################
+    ### Frontier ###
+    ################
+
+    def push_frontier(
+        self,
+        candidates: Iterable[Tuple[str, int, Optional[str], int, int]],
+        weights: Tuple[float, float, float] = DEFAULT_FRONTIER_WEIGHTS,
+    ) -> int:
+        """
+        Add crawl candidates to the frontier, or strengthen those already on it.
+
+        A candidate pushed again adds its ties, keeps its lowest tier and first
+        company, and takes the latest non-zero DK hint. Its score is
+        `ties * w_ties + dk_hint * w_dk - tier * w_tier`. Users the store already
+        has with a status other than queued are not added.
+
+        Args:
+            candidates (Iterable[Tuple[str, int, Optional[str], int, int]]): (login,
+                tier, company label, ties, DK hint) per candidate. The DK hint is 1
+                for a known DK profile, -1 for a known non-DK profile, else 0.
+            weights (Tuple[float, float, float]): The score weights per tie, DK hint
+                and tier.
+
+        Returns:
+            int: The number of candidates added or updated.
+        """
+        w_ties, w_dk, w_tier = weights
+        now = time.time()
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                """
+                INSERT INTO frontier
+                    (login, tier, company, ties, dk_hint, score, updated_at)
+                SELECT :login, :tier, :company, :ties, :dk_hint,
+                    :ties * :w_ties + :dk_hint * :w_dk - :tier * :w_tier, :now
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM users WHERE login = :login AND status != 'queued'
+                )
+                ON CONFLICT (login) DO UPDATE SET
+                    tier = MIN(tier, excluded.tier),
+                    company = COALESCE(company, excluded.company),
+                    ties = ties + excluded.ties,
+                    dk_hint = CASE WHEN excluded.dk_hint != 0
+                        THEN excluded.dk_hint ELSE dk_hint END,
+                    score = (ties + excluded.ties) * :w_ties
+                        + (CASE WHEN excluded.dk_hint != 0
+                            THEN excluded.dk_hint ELSE dk_hint END) * :w_dk
+                        - MIN(tier, excluded.tier) * :w_tier,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    {
+                        "login": login,
+                        "tier": tier,
+                        "company": company,
+                        "ties": ties,
+                        "dk_hint": dk_hint,
+                        "w_ties": w_ties,
+                        "w_dk": w_dk,
+                        "w_tier": w_tier,
+                        "now": now,
+                    }
+                    for login, tier, company, ties, dk_hint in candidates
+                ),
+            )
+            return connection.total_changes - before
+
+    def claim_frontier(self, n: int = 1) -> List[Dict]:
+        """
+        Take the highest scoring candidates off the frontier and mark them as
+        attempted, atomically, so concurrent crawler processes never claim the
+        same user. Candidates that were processed since they were pushed are
+        dropped.
+
+        Args:
+            n (int): The maximum number of candidates to claim.
+
+        Returns:
+            List[Dict]: The login, tier, company, ties, DK hint and score of the
+                claimed candidates, highest score first.
+        """
+        now = time.time()
+        columns = ["login", "tier", "company", "ties", "dk_hint", "score"]
+        claimed = []
+        with self._transaction() as connection:
+            # Stale candidates at the top are dropped: look further down until some
+            # are claimed or the frontier is empty
+            while not claimed:
+                rows = connection.execute(
+                    """
+                    SELECT f.login, f.tier, f.company, f.ties, f.dk_hint, f.score,
+                        u.status IS NULL OR u.status = 'queued'
+                    FROM frontier f LEFT JOIN users u ON u.login = f.login
+                    ORDER BY f.score DESC, f.updated_at
+                    LIMIT ?
+                    """,
+                    (n,),
+                ).fetchall()
+                if not rows:
+                    break
+                connection.executemany(
+                    "DELETE FROM frontier WHERE login = ?", ((row[0],) for row in rows)
+                )
+                claimed = [dict(zip(columns, row[:-1])) for row in rows if row[-1]]
+            connection.executemany(
+                """
+                INSERT INTO users (login, status, tier, attempts, queued_at, updated_at)
+                VALUES (?, 'attempted', ?, 1, ?, ?)
+                ON CONFLICT (login) DO UPDATE SET
+                    status = 'attempted',
+                    tier = excluded.tier,
+                    attempts = attempts + 1,
+                    updated_at = excluded.updated_at
+                """,
+                ((row["login"], row["tier"], now, now) for row in claimed),
+            )
+        return claimed
+
+    def frontier_size(self) -> int:
+        return self._query("SELECT COUNT(*) FROM frontier")[0][0]
+
+    #################
+    ### Migration ###
+    #################
+
+    def import_log(
+        self,
+        log_file_path: Path,
+        status: str,
+        key: str = "user_login",
+        kind: Literal["user", "company"] = "user",
+    ) -> int:
+        """
+        Import a JSONL log of the scraper (user match log, attempt log or company log).
+
+        Records the store already has with another status are overwritten, except
+        that importing an attempt log never downgrades a final user status.
+
+        Args:
+            log_file_path (Path): The log file.
+            status (str): The status to give the logged users or companies.
+            key (str): The field holding the login or company name.
+            kind (Literal["user", "company"]): Whether the log lists users or companies.
+
+        Returns:
+            int: The number of imported records.
+        """
+        names = []
+        with open(log_file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    names.append(json.loads(line)[key])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+
+        if kind == "company":
+            return self.import_companies(names, status)
+        return self.import_users(names, status)
+
+    def import_users(self, logins: Iterable[str], status: str) -> int:
+        """
+        Import users with a given status in one transaction, e.g. the sets of logins
+        a scraper was given.
+
+        Users the store already has with another status are overwritten, except that
+        importing users as attempted never downgrades a final status.
+
+        Args:
+            logins (Iterable[str]): The logins of the users.
+            status (str): The status to give the users.
+
+        Returns:
+            int: The number of imported users.
+        """
+        if status not in USER_STATUSES:
+            raise ValueError(f"Invalid user status: {status}")
+        logins = list(logins)
+        now = time.time()
+        keep_final = "WHERE status = 'queued'" if status == "attempted" else ""
+        with self._transaction() as connection:
+            connection.executemany(
+                "INSERT INTO users (login, status, queued_at, updated_at) "
+                "VALUES (?, ?, ?, ?) "
+                f"ON CONFLICT (login) DO UPDATE SET status = excluded.status {keep_final}",
+                ((login, status, now, now) for login in logins),
+            )
+        return len(logins)
+
+    def import_companies(self, names: Iterable[str], status: str) -> int:
+        """
+        Import companies with a given status in one transaction.
+
+        Args:
+            names (Iterable[str]): The company labels.
+            status (str): The status to give the companies.
+
+        Returns:
+            int: The number of imported companies.
+        """
+        names = list(names)
+        now = time.time()
+        with self._transaction() as connection:
+            connection.executemany(
+                "INSERT INTO companies (name, status, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET status = excluded.status",
+                ((name, status, now) for name in names),
+            )
+        return len(names)
+
+    #############
+    ### Views ###
+    #############
+
+    def user_set(self, statuses: Iterable[str] = PROCESSED_STATUSES) -> "StatusSet":
+        """
+        Get a set-like view of the users with the given statuses, usable in place of
+        `GithubScraper.users_already_scraped` (statuses `("scraped",)`) or
+        `users_already_attempted` (the default).
+
+        Args:
+            statuses (Iterable[str]): The statuses that count as members.
+
+        Returns:
+            StatusSet: The view. Adding a login gives the user the view's status if
+                it has a single one, and marks the user as attempted otherwise.
+        """
+        statuses = tuple(statuses)
+        status = statuses[0] if len(statuses) == 1 else "attempted"
+        return StatusSet(self, "user", statuses, status)
+
+    def company_set(self) -> "StatusSet":
+        """
+        Get a set-like view of the scraped companies, usable in place of
+        `GithubScraper.companies_already_scraped`.
+
+        Returns:
+            StatusSet: The view. Adding a company marks it as scraped.
+        """
+        return StatusSet(self, "company", ("scraped",), "scraped")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class StatusSet:
+    """
+    Set-like view of the users or companies in a CrawlState with given statuses.
+
+    Membership tests are primary key lookups in the database, so the view is always
+    up to date with other processes sharing the store. Added names get `status`.
+    """
+
+    def __init__(
+        self,
+        state: CrawlState,
+        kind: Literal["user", "company"],
+        statuses: tuple,
+        status: str,
+    ):
+        self.state = state
+        self.kind = kind
+        self.statuses = statuses
+        self.status = status
+
+    def __contains__(self, name: str) -> bool:
+        if self.kind == "company":
+            status = self.state.company_status(name)
+        else:
+            status = self.state.user_status(name)
+        return status in self.statuses
+
+    def __len__(self) -> int:
+        if self.kind == "company":
+            return self.state.count_companies(*self.statuses)
+        return self.state.count_users(*self.statuses)
+
+    def __iter__(self) -> Iterator[str]:
+        if self.kind == "company":
+            return iter(self.state.companies_with_status(*self.statuses))
+        return iter(self.state.users_with_status(*self.statuses))
+
+    def add(self, name: str):
+        if self.kind == "company":
+            self.state.set_company_status(name, self.status)
+        elif self.status == "attempted":
+            self.state.mark_attempted(name)
+        else:
+            self.state.set_user_status(name, self.status)
+
+    def update(self, names: Iterable[str]):
+        if self.kind == "company":
+            self.state.import_companies(names, self.status)
+        else:
+            self.state.import_users(names, self.status)
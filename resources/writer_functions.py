@@ -0,0 +1,354 @@
+#######################
+### Import Packages ###
+#######################
+
+import atexit
+import gzip
+import io
+import json
+import os
+import re
+import threading
+import time as time
+from pathlib import Path
+from typing import Literal, Optional, Dict, Iterator, IO
+
+# zstd is optional; gzip is always available
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+Compression = Literal["gzip", "zstd"] | None
+FsyncPolicy = Literal["always", "roll", "never"]
+
+SEGMENT_SUFFIXES = {None: ".jsonl", "gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+#######################
+### Segment Writers ###
+#######################
+
+
+def segment_path(directory: Path, name: str, index: int, compression: Compression) -> Path:
+    """
+    Get the path of a numbered segment, e.g. "first_tier_userinfo.00003.jsonl.gz".
+
+    Args:
+        directory (Path): The output directory.
+        name (str): The stream name.
+        index (int): The segment number.
+        compression (Compression): The compression of the segment.
+
+    Returns:
+        Path: The segment path.
+    """
+    return directory / f"{name}.{index:05d}{SEGMENT_SUFFIXES[compression]}"
+
+
+def list_segments(directory: Path, name: str) -> list[Path]:
+    """
+    List the segments of a stream, in order.
+
+    Args:
+        directory (Path): The output directory.
+        name (str): The stream name.
+
+    Returns:
+        list[Path]: The segment paths, sorted by segment number.
+    """
+    pattern = re.compile(rf"^{re.escape(name)}\.(\d{{5,}})\.jsonl(\.gz|\.zst)?$")
+    segments = []
+    for path in Path(directory).glob(f"{name}.*"):
+        match = pattern.match(path.name)
+        if match:
+            segments.append((int(match.group(1)), path))
+    return [path for _, path in sorted(segments)]
+
+
+def _open_segment(path: Path) -> IO[bytes]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise ImportError("Reading .zst segments requires the zstandard package.")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def iter_records(directory: Path, name: str, include_legacy: bool = True) -> Iterator[dict]:
+    """
+    Iterate over all records of a stream, across its segments, as one stream.
+
+    A truncated last line (e.g. after a crash) is skipped.
+
+    Args:
+        directory (Path): The output directory.
+        name (str): The stream name.
+        include_legacy (bool): Whether to start with the unsegmented "<name>.jsonl"
+            file written by `GithubScraper.save_file`, if it exists.
+
+    Yields:
+        dict: The records, in the order they were written.
+    """
+    paths = list_segments(directory, name)
+    legacy_path = Path(directory) / f"{name}.jsonl"
+    if include_legacy and legacy_path.exists():
+        paths.insert(0, legacy_path)
+
+    for path in paths:
+        try:
+            with _open_segment(path) as f:
+                for line in io.TextIOWrapper(f, encoding="utf-8"):
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except EOFError:
+            # Compressed segment cut off mid-stream
+            continue
+
+
+class SegmentWriter:
+    """
+    Buffered writer of JSON lines into rolling, numbered segments.
+
+    Records are kept in memory and written when `max_records` are buffered or
+    `max_seconds` have passed since the last flush. A segment is closed and the
+    next one started once it holds `max_segment_bytes` (uncompressed). Every
+    writer starts a new segment, so existing files are never appended to or
+    removed.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        name: str,
+        max_records: int = 1000,
+        max_seconds: float = 30.0,
+        max_segment_bytes: int = 256 * 1024**2,
+        compression: Compression = None,
+        fsync: FsyncPolicy = "roll",
+    ):
+        """
+        Initialize the SegmentWriter.
+
+        Args:
+            directory (Path): The output directory.
+            name (str): The stream name, used as prefix of the segment files.
+            max_records (int): The number of buffered records that triggers a flush.
+            max_seconds (float): The time since the last flush that triggers a flush.
+            max_segment_bytes (int): The uncompressed segment size that triggers a roll.
+            compression (Compression): None, "gzip" or "zstd".
+            fsync (FsyncPolicy): Whether to fsync after "always" every flush, on
+                closing a segment ("roll"), or "never".
+        """
+        if compression not in SEGMENT_SUFFIXES:
+            raise ValueError("compression must be None, 'gzip' or 'zstd'")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstd compression requires the zstandard package.")
+        if fsync not in ("always", "roll", "never"):
+            raise ValueError("fsync must be 'always', 'roll' or 'never'")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.max_records = max_records
+        self.max_seconds = max_seconds
+        self.max_segment_bytes = max_segment_bytes
+        self.compression = compression
+        self.fsync = fsync
+
+        existing = list_segments(self.directory, name)
+        self.segment_index = (
+            int(existing[-1].name[len(name) + 1 :].split(".")[0]) + 1 if existing else 0
+        )
+        self.records_written = 0
+        self._buffer: list[str] = []
+        self._segment_bytes = 0
+        self._raw: Optional[IO[bytes]] = None
+        self._stream: Optional[IO[bytes]] = None
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def current_segment(self) -> Path:
+        return segment_path(self.directory, self.name, self.segment_index, self.compression)
+
+    def _open(self):
+        self._raw = open(self.current_segment, "xb")
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        elif self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._raw)
+        else:
+            self._stream = self._raw
+        self._segment_bytes = 0
+
+    def _sync(self):
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+
+    def _close_segment(self):
+        if self._stream is None:
+            return
+        if self.compression == "gzip":
+            self._stream.close()  # Writes the gzip trailer, leaves the file open
+        elif self.compression == "zstd":
+            self._stream.flush(zstandard.FLUSH_FRAME)
+        if self.fsync in ("always", "roll"):
+            self._sync()
+        self._raw.close()
+        self._stream = self._raw = None
+        self.segment_index += 1
+
+    def write(self, record: dict):
+        """
+        Buffer a record, flushing if a threshold is reached.
+
+        Args:
+            record (dict): The JSON-serialisable record.
+
+        Returns:
+            None
+        """
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+            if (
+                len(self._buffer) >= self.max_records
+                or time.monotonic() - self._last_flush >= self.max_seconds
+            ):
+                self._flush()
+
+    def flush(self):
+        """
+        Write the buffered records to the current segment.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        if self._stream is None:
+            self._open()
+        data = "".join(self._buffer).encode("utf-8")
+        self._stream.write(data)
+        if self.compression == "gzip":
+            self._stream.flush()  # Sync flush, so written records are readable
+        elif self.compression == "zstd":
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+        self._raw.flush()
+        if self.fsync == "always":
+            self._sync()
+        self.records_written += len(self._buffer)
+        self._segment_bytes += len(data)
+        self._buffer.clear()
+        if self._segment_bytes >= self.max_segment_bytes:
+            self._close_segment()
+
+    def close(self):
+        """
+        Flush the buffered records and close the current segment.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._flush()
+            self._close_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class OutputWriter:
+    """
+    The writer of all scrape outputs of a GithubScraper: one SegmentWriter per
+    stream (user records, company log, user match log, attempt log), created on
+    first use with the same options.
+
+    Buffered records are written out when the interpreter exits, unless the
+    writer was closed before.
+    """
+
+    def __init__(self, directory: Path, **segment_options):
+        """
+        Initialize the OutputWriter.
+
+        Args:
+            directory (Path): The output directory.
+            **segment_options: Passed on to every SegmentWriter (thresholds,
+                compression, fsync policy).
+        """
+        self.directory = Path(directory)
+        self.segment_options = segment_options
+        self.streams: Dict[str, SegmentWriter] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def stream(self, name: str) -> SegmentWriter:
+        """
+        Get the writer of a stream, creating it on first use.
+
+        Args:
+            name (str): The stream name.
+
+        Returns:
+            SegmentWriter: The stream's writer.
+        """
+        with self._lock:
+            if name not in self.streams:
+                self.streams[name] = SegmentWriter(
+                    self.directory, name, **self.segment_options
+                )
+            return self.streams[name]
+
+    def write(self, name: str, record: dict):
+        """
+        Write a record to a stream.
+
+        Args:
+            name (str): The stream name.
+            record (dict): The JSON-serialisable record.
+
+        Returns:
+            None
+        """
+        self.stream(name).write(record)
+
+    def flush(self):
+        for writer in list(self.streams.values()):
+            writer.flush()
+
+    def close(self):
+        atexit.unregister(self.close)
+        for writer in list(self.streams.values()):
+            writer.close()
+
+    def records(self, name: str) -> Iterator[dict]:
+        """
+        Iterate over all records of a stream written so far (flushing first).
+
+        Args:
+            name (str): The stream name.
+
+        Yields:
+            dict: The records.
+        """
+        if name in self.streams:
+            self.streams[name].flush()
+        yield from iter_records(self.directory, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()